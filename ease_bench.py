@@ -0,0 +1,431 @@
+"""Ease-DB benchmarks: synthetic databases and timings of the editor's hot paths.
+
+Runs headless through the core in ease_db.py, the same calls the GUI makes
+from its worker thread (Tk rendering itself is not timed)::
+
+    python ease_bench.py --sizes 10k,100k --json results.json
+    python ease_bench.py --sizes 10k,100k --baseline results.json
+
+Generated databases are kept in ``--data-dir`` and reused, keyed on shape,
+row count and seed, so runs on the same machine compare like with like.
+With ``--baseline`` every timing is compared to a saved run and the exit
+status is 1 when one got slower than ``--threshold`` times the baseline.
+"""
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from ease_db import (
+    ConnectionProfile, EditSession, SchemaCatalog, apply_changes, apply_statements, export_database, is_query,
+    make_pager
+)
+
+# =========================================================================
+# 1. Synthetic Databases
+# =========================================================================
+TABLE = "bench"
+SHAPES = ("narrow", "wide", "text", "blob")
+WIDE_COLUMNS = 40
+TEXT_BYTES = 2048
+BLOB_BYTES = 4096
+GENERATE_BATCH = 10000
+WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet",
+         "kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo", "sierra", "tango")
+
+def table_columns(shape):
+    """Returns the column definitions of the benchmark table for a shape."""
+    if shape == "narrow":
+        return ["id INTEGER PRIMARY KEY", "name TEXT", "qty INTEGER", "price REAL", "created TEXT"]
+    if shape == "wide":
+        kinds = ("INTEGER", "REAL", "TEXT")
+        return ["id INTEGER PRIMARY KEY", "name TEXT"] + [
+            f"c{i:02d} {kinds[i % 3]}" for i in range(WIDE_COLUMNS - 2)
+        ]
+    if shape == "text":
+        return ["id INTEGER PRIMARY KEY", "name TEXT", "title TEXT", "body TEXT"]
+    if shape == "blob":
+        return ["id INTEGER PRIMARY KEY", "name TEXT", "size INTEGER", "data BLOB"]
+    raise ValueError(f"Unknown shape: {shape}")
+
+def _row_maker(shape, rng):
+    def words(count):
+        return " ".join(rng.choice(WORDS) for _ in range(count))
+
+    def date():
+        return f"20{rng.randint(10, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    if shape == "narrow":
+        return lambda: (words(2), rng.randint(0, 10000), round(rng.uniform(0, 1000), 2), date())
+    if shape == "wide":
+        makers = [lambda: rng.randint(0, 10 ** 6), lambda: round(rng.random() * 1000, 3), lambda: words(2)]
+        kinds = [makers[i % 3] for i in range(WIDE_COLUMNS - 2)]
+        return lambda: (words(2), *(make() for make in kinds))
+    if shape == "text":
+        paragraph = words(TEXT_BYTES // 6)
+        return lambda: (words(2), words(6), paragraph[rng.randrange(64):][:TEXT_BYTES])
+    if shape == "blob":
+        block = rng.randbytes(BLOB_BYTES * 2)
+        return lambda: (words(2), BLOB_BYTES, block[rng.randrange(BLOB_BYTES):][:BLOB_BYTES])
+    raise ValueError(f"Unknown shape: {shape}")
+
+def generate_database(path, rows, shape="narrow", seed=0, progress=None):
+    """Writes a database with one ``bench`` table of ``rows`` synthetic rows (and an index on ``name``).
+
+    The same shape, row count and seed always produce the same data.
+    """
+    columns = table_columns(shape)
+    make_row = _row_maker(shape, random.Random(seed))
+    partial = path + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    conn = sqlite3.connect(partial)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"CREATE TABLE {TABLE} ({', '.join(columns)})")
+        insert = f"INSERT INTO {TABLE} VALUES (NULL, {', '.join('?' * (len(columns) - 1))})"
+        done = 0
+        while done < rows:
+            batch = min(GENERATE_BATCH, rows - done)
+            conn.executemany(insert, (make_row() for _ in range(batch)))
+            done += batch
+            if progress: progress(done, rows)
+        conn.execute(f"CREATE INDEX {TABLE}_name ON {TABLE}(name)")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(partial, path)
+    return path
+
+def cached_database(data_dir, rows, shape, seed=0, progress=None):
+    """Returns the path of a generated database, generating it on first use."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"{shape}-{rows}-{seed}.db")
+    if not os.path.exists(path):
+        generate_database(path, rows, shape, seed, progress)
+    return path
+
+def parse_size(text):
+    """Parses row counts like ``10k``, ``1m`` or ``2500``."""
+    text = text.strip().lower()
+    scale = {"k": 10 ** 3, "m": 10 ** 6}.get(text[-1:], 1)
+    try:
+        value = float(text[:-1] if scale > 1 else text)
+    except ValueError:
+        raise ValueError(f"Invalid size: {text!r}") from None
+    return int(value * scale)
+
+def format_size(rows):
+    for suffix, scale in (("m", 10 ** 6), ("k", 10 ** 3)):
+        if rows >= scale and rows % scale == 0:
+            return f"{rows // scale}{suffix}"
+    return str(rows)
+
+# =========================================================================
+# 2. Benchmarks
+# =========================================================================
+FIRST_SCREEN = 50           # rows the grid shows on the first screen
+EDITS = 20                  # cell edits timed per repeat
+DELETE_FRACTION = 0.01
+MAX_DELETE = 10000
+
+class BenchContext:
+    """What every benchmark of one database gets: paths, a connection opened like the GUI's, and a RNG."""
+    def __init__(self, path, work_path, shape, rows, seed):
+        self.path = path
+        self.work_path = work_path
+        self.shape = shape
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.profile = ConnectionProfile("Default")
+        self.conn = self.profile.connect(work_path)
+
+    def close(self):
+        self.conn.close()
+
+    def random_keys(self, count):
+        return [row[0] for row in self.conn.execute(
+            f"SELECT id FROM {TABLE} ORDER BY random() LIMIT ?", (count,)
+        )]
+
+
+def _open_table(ctx, order=None, filters=None):
+    """Fresh connection, schema load, pager and first screen: what opening a file and selecting a table costs."""
+    conn = ctx.profile.connect(ctx.path)
+    try:
+        start = time.perf_counter()
+        catalog = SchemaCatalog().refresh(conn)
+        pager = make_pager(conn, f'SELECT * FROM "{TABLE}"', catalog.table_names(), order, filters)
+        pager.fetch_window(conn, 0, FIRST_SCREEN)
+        return time.perf_counter() - start
+    finally:
+        conn.close()
+
+def bench_open(ctx):
+    return _open_table(ctx)
+
+def bench_open_sorted(ctx):
+    return _open_table(ctx, order=("name", True))
+
+def bench_open_filtered(ctx):
+    return _open_table(ctx, filters={"name": "echo"})
+
+def bench_query(ctx):
+    """``run_query`` with a statement that is not a plain table browse."""
+    conn = ctx.conn
+    query = f"SELECT id, name FROM {TABLE} WHERE id % 7 = 0"
+    start = time.perf_counter()
+    if is_query(conn, query):
+        pager = make_pager(conn, query, [TABLE])
+        pager.fetch_window(conn, 0, FIRST_SCREEN)
+        pager.close()
+    return time.perf_counter() - start
+
+def bench_scroll(ctx):
+    """Jump to the middle of the table, then page forward one screen at a time."""
+    conn = ctx.conn
+    pager = make_pager(conn, f'SELECT * FROM "{TABLE}"', [TABLE])
+    start = time.perf_counter()
+    middle = pager.known_rows() // 2
+    for screen in range(10):
+        pager.fetch_window(conn, middle + screen * FIRST_SCREEN, FIRST_SCREEN)
+    return time.perf_counter() - start
+
+def bench_cell_edit(ctx):
+    """The double-click edit path with unbuffered editing: record, save in one transaction, patch the grid."""
+    conn = ctx.conn
+    pager = make_pager(conn, f'SELECT * FROM "{TABLE}"', [TABLE])
+    rows = pager.fetch_window(conn, 0, FIRST_SCREEN)
+    timings = []
+    for _ in range(EDITS):
+        key, values = ctx.rng.choice(rows)
+        new = f"edited {ctx.rng.random():.6f}"
+        start = time.perf_counter()
+        edits = EditSession()
+        edits.update(TABLE, "id", key, "name", values[1], new)
+        apply_changes(conn, edits.statements())
+        edits.mark_saved(len(edits))
+        pager.patch(key, (values[0], new) + tuple(values[2:]))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def bench_bulk_delete(ctx):
+    """Deletes a multi-row selection (1% of the table) in one transaction and drops the rows from the pager."""
+    conn = ctx.conn
+    pager = make_pager(conn, f'SELECT * FROM "{TABLE}"', [TABLE])
+    pager.fetch_window(conn, 0, FIRST_SCREEN)
+    keys = ctx.random_keys(max(1, min(MAX_DELETE, int(ctx.rows * DELETE_FRACTION))))
+    start = time.perf_counter()
+    edits = EditSession()
+    edits.delete_many(TABLE, [("id", key, None) for key in keys])
+    apply_statements(conn, edits.statements())
+    edits.mark_saved(len(edits))
+    pager.forget(keys)
+    return time.perf_counter() - start
+
+def bench_sql_dump(ctx):
+    """``save_file`` to a ``.sql`` target."""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "dump.sql")
+        start = time.perf_counter()
+        export_database(ctx.conn, target, "sql")
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(target)
+    return elapsed, {"bytes": size, "mb_per_sec": round(size / elapsed / 2 ** 20, 1)}
+
+def bench_schema_load(ctx):
+    """Full schema catalog load, as after opening a file or a DDL statement."""
+    start = time.perf_counter()
+    SchemaCatalog().refresh(ctx.conn)
+    return time.perf_counter() - start
+
+def bench_schema_lookup(ctx):
+    """Catalog refresh with an unchanged schema (runs after every job) and a column lookup."""
+    catalog = SchemaCatalog().refresh(ctx.conn)
+    start = time.perf_counter()
+    for _ in range(100):
+        catalog.refresh(ctx.conn).table(TABLE).rowid_alias
+    return (time.perf_counter() - start) / 100
+
+# Read-only benchmarks first; the ones that write run last, on the working copy.
+BENCHMARKS = {
+    "open": bench_open,
+    "open_sorted": bench_open_sorted,
+    "open_filtered": bench_open_filtered,
+    "query": bench_query,
+    "scroll": bench_scroll,
+    "schema_load": bench_schema_load,
+    "schema_lookup": bench_schema_lookup,
+    "sql_dump": bench_sql_dump,
+    "cell_edit": bench_cell_edit,
+    "bulk_delete": bench_bulk_delete,
+}
+
+def run_benchmark(func, ctx, repeat):
+    """Runs ``func`` once to warm up, then ``repeat`` times; returns a summary of the timings in seconds."""
+    func(ctx)
+    timings, extra = [], {}
+    for _ in range(repeat):
+        result = func(ctx)
+        if isinstance(result, tuple):
+            result, extra = result
+        timings.append(result)
+    return {"median": statistics.median(timings), "min": min(timings), "max": max(timings),
+            "runs": repeat, **extra}
+
+def run_suite(data_dir, sizes, shapes=SHAPES, benchmarks=None, repeat=5, seed=0, progress=None):
+    """Times every benchmark on every generated database. Returns the JSON-ready report.
+
+    Results are keyed ``<shape>/<size>/<benchmark>``. Writing benchmarks run on a
+    scratch copy, so the cached databases are never modified.
+    """
+    names = list(benchmarks or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+    results = {}
+    for shape in shapes:
+        for rows in sizes:
+            label = f"{shape}/{format_size(rows)}"
+            if progress: progress(f"{label}: preparing")
+            path = cached_database(data_dir, rows, shape, seed,
+                                   lambda done, total: progress and progress(f"{label}: generating {done:,}/{total:,}"))
+            with tempfile.TemporaryDirectory(dir=data_dir) as tmp:
+                work_path = os.path.join(tmp, "work.db")
+                shutil.copyfile(path, work_path)
+                ctx = BenchContext(path, work_path, shape, rows, seed)
+                try:
+                    for name in BENCHMARKS:
+                        if name not in names:
+                            continue
+                        if progress: progress(f"{label}: {name}")
+                        results[f"{label}/{name}"] = run_benchmark(BENCHMARKS[name], ctx, repeat)
+                finally:
+                    ctx.close()
+    return {"meta": environment(seed, repeat), "results": results}
+
+def environment(seed=0, repeat=None):
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "seed": seed,
+        "repeat": repeat,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+# =========================================================================
+# 3. Baseline Comparison
+# =========================================================================
+THRESHOLD = 1.25            # slower than this ratio of the baseline counts as a regression
+NOISE_FLOOR = 0.001         # differences below a millisecond are never regressions
+
+def compare(report, baseline, threshold=THRESHOLD):
+    """Returns (name, baseline median, current median, ratio, regressed) for the timings both runs have."""
+    rows = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        regressed = ratio > threshold and result["median"] - base["median"] > NOISE_FLOOR
+        rows.append((name, base["median"], result["median"], ratio, regressed))
+    return rows
+
+def _ms(seconds):
+    return f"{seconds * 1000:.2f}"
+
+def print_report(report, out=sys.stdout):
+    width = max((len(name) for name in report["results"]), default=10)
+    out.write(f"{'benchmark':<{width}}  {'median ms':>10}  {'min ms':>10}\n")
+    for name, result in report["results"].items():
+        note = f"  {result['mb_per_sec']} MB/s" if "mb_per_sec" in result else ""
+        out.write(f"{name:<{width}}  {_ms(result['median']):>10}  {_ms(result['min']):>10}{note}\n")
+
+def print_comparison(rows, out=sys.stdout):
+    width = max((len(row[0]) for row in rows), default=10)
+    out.write(f"{'benchmark':<{width}}  {'base ms':>10}  {'now ms':>10}  {'ratio':>6}\n")
+    for name, base, current, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        out.write(f"{name:<{width}}  {_ms(base):>10}  {_ms(current):>10}  {ratio:>6.2f}{flag}\n")
+
+# =========================================================================
+# 4. Command-Line Interface
+# =========================================================================
+def _parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="python ease_bench.py",
+        description="Generate synthetic databases and time Ease-DB's hot paths without the GUI."
+    )
+    parser.add_argument("--sizes", default="10k,100k", help="comma-separated row counts, e.g. 10k,1m,10m")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help=f"comma-separated table shapes ({', '.join(SHAPES)})")
+    parser.add_argument("--bench", help=f"comma-separated benchmarks to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (after one warm-up run)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "ease_bench"),
+                        help="where generated databases are kept between runs")
+    parser.add_argument("--json", help="write the results to this file (use it as a later --baseline)")
+    parser.add_argument("--baseline", help="compare against results saved with --json")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="median/baseline ratio above which a timing counts as a regression")
+    parser.add_argument("--generate-only", action="store_true", help="only generate the databases")
+    parser.add_argument("--quiet", action="store_true", help="no progress messages")
+    return parser
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    progress = None if args.quiet else (lambda message: sys.stderr.write(f"\r{message:<60}") or sys.stderr.flush())
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+        shapes = [shape.strip() for shape in args.shapes.split(",") if shape.strip()]
+        for shape in shapes:
+            table_columns(shape)
+        benchmarks = [name.strip() for name in args.bench.split(",")] if args.bench else None
+
+        if args.generate_only:
+            for shape in shapes:
+                for rows in sizes:
+                    path = cached_database(args.data_dir, rows, shape, args.seed,
+                                           progress and (lambda done, total: progress(f"{shape}: {done:,}/{total:,}")))
+                    if progress: progress(path)
+            if progress: sys.stderr.write("\n")
+            return 0
+
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        report = run_suite(args.data_dir, sizes, shapes, benchmarks, args.repeat, args.seed, progress)
+    except (sqlite3.Error, ValueError, OSError) as e:
+        sys.stderr.write(f"\nerror: {e}\n")
+        return 1
+    if progress: sys.stderr.write("\n")
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if baseline is None:
+        return 0
+    rows = compare(report, baseline, args.threshold)
+    sys.stdout.write("\n")
+    print_comparison(rows)
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        sys.stdout.write(f"\n{regressions} regression(s) above {args.threshold:.2f}x the baseline\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,624 +1,4032 @@
+"""Ease-DB core: paging, background worker, schema, editing and export for SQLite.
+
+Nothing here imports tkinter, so the module can be used from scripts and from
+the command line (``python -m ease_db --help``). The GUI lives in ease_gui.py
+and is started when ease_db is run without arguments.
+"""
+import csv
+import gzip
+import io
+import itertools
+import json
+import math
+import os
+import queue
+import random
+import re
+import shutil
 import sqlite3
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
-import webbrowser
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
 
 # =========================================================================
-# 1. Custom Dialog Classes
+# 1. Result Paging
 # =========================================================================
-class AlterColumnDialog(simpledialog.Dialog):
-    """Custom dialog to get new column name and type preference."""
-    def __init__(self, parent, column_name):
-        self.column_name = column_name
-        self.new_name = None
-        self.new_type = None
-        self.type_var = tk.StringVar(parent)
-        super().__init__(parent, title=f"Modify Column: {column_name}")
-
-    def body(self, master):
-        main_frame = ttk.Frame(master)
-        main_frame.pack(padx=10, pady=10)
-        
-        ttk.Label(main_frame, text=f"Modifying column: **{self.column_name}**", font=('TkDefaultFont', 10, 'bold')).grid(row=0, columnspan=2, pady=5)
-        
-        ttk.Label(main_frame, text="New Name:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
-        self.name_entry = ttk.Entry(main_frame, width=30)
-        self.name_entry.insert(0, self.column_name)
-        self.name_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
-
-        ttk.Label(main_frame, text="New Type (Affinity):").grid(row=2, column=0, sticky="w", padx=5, pady=5)
-        
-        type_frame = ttk.Frame(main_frame)
-        type_frame.grid(row=2, column=1, sticky="w", padx=5, pady=5)
-        
-        self.type_var.set('TEXT') 
-
-        ttk.Radiobutton(type_frame, text="TEXT", variable=self.type_var, value="TEXT").pack(side=tk.LEFT, padx=5)
-        ttk.Radiobutton(type_frame, text="NUMBER", variable=self.type_var, value="NUMERIC").pack(side=tk.LEFT, padx=5)
-        
-        ttk.Label(main_frame, text="(Note: SQLite type enforcement is flexible)", foreground='gray').grid(row=3, columnspan=2)
-
-        return self.name_entry
-
-    def apply(self):
-        self.new_name = self.name_entry.get().strip()
-        self.new_type = self.type_var.get()
-
-class RenameTableDialog(simpledialog.Dialog):
-    def __init__(self, parent, table_list):
-        self.table_list = table_list
-        self.old_name = None
-        self.new_name = None
-        self.selected_table_var = tk.StringVar(parent)
-        super().__init__(parent, title="Rename Table")
-
-    def body(self, master):
-        main_frame = ttk.Frame(master)
-        main_frame.pack(padx=10, pady=10)
-
-        ttk.Label(main_frame, text="Select Table to Rename:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
-        self.table_selector = ttk.Combobox(
-            main_frame, 
-            textvariable=self.selected_table_var,
-            values=self.table_list,
-            state="readonly",
-            width=30
-        )
-        if self.table_list:
-             self.table_selector.set(self.table_list[0])
-        self.table_selector.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
-
-        ttk.Label(main_frame, text="New Table Name:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
-        self.name_entry = ttk.Entry(main_frame, width=30)
-        self.name_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
-
-        return self.table_selector
-
-    def apply(self):
-        self.old_name = self.selected_table_var.get()
-        self.new_name = self.name_entry.get().strip()
-
-# =========================================================================
-# 2. Main Viewer/Editor Class
-# =========================================================================
-class SQLViewer:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Ease-DB")
-
-        # --- Variables ---
-        self.conn = None
-        self.filepath = None
-        self.selected_table = tk.StringVar()
-
-        # --- Menu Bar Setup ---
-        menubar = tk.Menu(root)
-        root.config(menu=menubar)
-        
-        # File Menu
-        file_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="File", menu=file_menu)
-        file_menu.add_command(label="Open Database", command=self.open_file)
-        file_menu.add_command(label="Create New Database", command=self.create_db)
-        file_menu.add_command(label="Add New Table", command=self.add_table)
-        file_menu.add_separator()
-        file_menu.add_command(label="Save", command=lambda: self.save_file(False))
-        file_menu.add_command(label="Save As...", command=lambda: self.save_file(True))
-        file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=root.quit)
-        
-        # Edit Menu (Main Menu)
-        edit_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Edit", menu=edit_menu)
-        self._populate_edit_menu(edit_menu)
-
-        # Help Menu
-        help_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Help", menu=help_menu)
-        help_menu.add_command(label="About Ease-DB", command=self.show_about) # Updated method
-        help_menu.add_command(label="Documentation", command=self.open_docs)
-
-        # --- Control Frame ---
-        control_frame = ttk.Frame(root)
-        control_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        # Table Selector
-        ttk.Label(control_frame, text="Select Table:").pack(side=tk.LEFT, padx=(0, 5))
-        self.table_selector = ttk.Combobox(
-            control_frame, 
-            textvariable=self.selected_table,
-            state="readonly",
-            width=25
-        )
-        self.table_selector.pack(side=tk.LEFT, padx=(0, 10))
-        self.table_selector.bind("<<ComboboxSelected>>", self.select_table)
-
-        # Query Entry
-        self.query_text = tk.Text(root, height=4)
-        self.query_text.pack(fill=tk.X, padx=5, pady=5)
-
-        run_button = tk.Button(root, text="Run Query", command=self.run_query)
-        run_button.pack(pady=5)
-
-        # --- Treeview Setup ---
-        self.tree = ttk.Treeview(root, show="headings")
-        self.tree.bind("<Double-1>", self.on_cell_double_click)
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # --- Right-Click Context Menu Setup ---
-        self.context_menu = tk.Menu(root, tearoff=0)
-        self._populate_edit_menu(self.context_menu)
-        self.tree.bind("<Button-3>", self.show_context_menu)
-
-    def _populate_edit_menu(self, menu):
-        """Helper function to populate both the main Edit menu and the context menu."""
-        menu.add_command(label="Add Column", command=lambda: self.add_structural_element('column'))
-        menu.add_command(label="Modify Selected Column", command=self.show_alter_column_dialog)
-        menu.add_command(label="Modify Table Name", command=self.show_rename_table_dialog)
-        menu.add_separator()
-        menu.add_command(label="Add Row", command=self.add_row)
-        menu.add_command(label="Delete Row", command=self.delete_row)
-        menu.add_command(label="Delete Column (Warning)", command=lambda: self.delete_structural_element('column'))
-        menu.add_separator()
-        
-        menu.add_command(label="Copy Selected Cell", command=lambda: self.copy_data('cell'))
-        menu.add_command(label="Copy Selected Row", command=lambda: self.copy_data('row'))
-        menu.add_command(label="Copy Selected Column", command=lambda: self.copy_data('column'))
-
-    def show_context_menu(self, event):
-        """Displays the right-click menu at the cursor position."""
-        try:
-            self.context_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            self.context_menu.grab_release()
-
-    # =====================================================================
-    # HELP OPERATIONS
-    # =====================================================================
-    def show_about(self):
-        """Displays the 'About' message box with project and author info."""
-        messagebox.showinfo(
-            "About Ease-DB",
-            "Ease-DB is an **open-source**, lightweight SQLite database editor built using Python's Tkinter.\n\n"
-            "It provides essential CRUD (Create, Read, Update, Delete) functionality through a user-friendly "
-            "graphical interface, making SQLite management accessible and efficient.\n\n"
-            "Creator: Zrng\n"
-            "GitHub: https://github.com/zrnge"
-        )
-
-    def open_docs(self):
-        """Opens the documentation URL in the default web browser."""
-        documentation_url = "https://github.com/zrnge/ease-db"
-        webbrowser.open_new(documentation_url)
-
-    # =====================================================================
-    # FILE OPERATIONS
-    # =====================================================================
-    def open_file(self):
-        filepath = filedialog.askopenfilename(
-            filetypes=[("SQLite DB", "*.db *.sqlite"), ("All Files", "*.*")]
-        )
-        
-        if filepath:
-            if self.conn: 
-                try: self.conn.close() 
-                except Exception: pass
-
-            try:
-                self.conn = sqlite3.connect(filepath)
-                self.filepath = filepath
-                messagebox.showinfo("Success", f"Opened database: {filepath}")
-                self.populate_table_selector()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-                self.conn = None
-                self.filepath = None
-    
-    def create_db(self):
-        filepath = filedialog.asksaveasfilename(
-            defaultextension=".db",
-            filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")]
-        )
-        if filepath:
-            if self.conn: self.conn.close()
+PAGE_SIZE = 200
+MAX_CACHED_PAGES = 64
+RESULT_CACHE_MB = 64        # default memory budget of the ResultCache
+COPY_COLUMN_ROWS = 100000   # most values "Copy Selected Column" puts on the clipboard
+PREVIEW_CHARS = 256         # characters (bytes for BLOBs) of a longer TEXT or BLOB value kept for the grid
+
+def parse_filter(column, text):
+    """Turns what was typed in a column's filter box into (SQL predicate, params).
+
+    ``>5``, ``<=2024-01-01``, ``=abc``, ``!=abc`` compare; ``NULL`` and ``!NULL``
+    test for NULL; anything else is a case-insensitive substring match. Values
+    are always bound as parameters.
+    """
+    text = text.strip()
+    col = quote_identifier(column)
+    if text.upper() in ("NULL", "=NULL"):
+        return f"{col} IS NULL", ()
+    if text.upper() in ("!NULL", "!=NULL", "NOT NULL"):
+        return f"{col} IS NOT NULL", ()
+    match = re.fullmatch(r'(>=|<=|!=|<>|=|>|<)\s*(.*)', text, re.DOTALL)
+    if match:
+        op = "!=" if match.group(1) == "<>" else match.group(1)
+        return f"{col} {op} ?", (_filter_value(match.group(2)),)
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{col} LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+
+
+def _filter_value(text):
+    """Binds numbers as numbers, so comparisons also work on result columns without affinity."""
+    if not re.match(r'-?0\d', text):  # leading zeros: an identifier, not a number
+        for kind in (int, float):
             try:
-                self.conn = sqlite3.connect(filepath)
-                self.filepath = filepath
-                messagebox.showinfo("Success", f"New database created: {filepath}")
-                self.populate_table_selector()
-                if messagebox.askyesno("Table Creation", "Do you want to create a default 'NewTable'?"):
-                    self.conn.execute("CREATE TABLE NewTable (id INTEGER PRIMARY KEY, name TEXT, value TEXT)")
-                    self.conn.commit()
-                    self.populate_table_selector()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-                self.conn = None
-                self.filepath = None
-                
-    def add_table(self):
-        if not self.conn:
-            messagebox.showwarning("No DB", "Open or create a database file first.")
+                return kind(text)
+            except ValueError:
+                pass
+    return text
+
+
+def filter_clause(filters):
+    """ANDs the predicates of ``{column: filter text}``; returns ("" or "WHERE ...", params)."""
+    parts, params = [], []
+    for column, text in filters.items():
+        if text.strip():
+            sql, values = parse_filter(column, text)
+            parts.append(sql)
+            params.extend(values)
+    return ("WHERE " + " AND ".join(parts), tuple(params)) if parts else ("", ())
+
+
+class LargeValue:
+    """Stands in for a TEXT or BLOB value too long for the grid: its first ``PREVIEW_CHARS`` and full length.
+
+    The grid shows ``str()`` of it; the whole value is read from the database
+    only when asked for (see ``read_value`` and ``export_value``).
+    """
+    __slots__ = ("preview", "size")
+
+    def __init__(self, preview, size):
+        self.preview = preview
+        self.size = size
+
+    @property
+    def is_blob(self):
+        return isinstance(self.preview, bytes)
+
+    def __str__(self):
+        if self.is_blob:
+            return f"<BLOB {self.size:,} bytes> {self.preview[:16].hex(' ')} ..."
+        return f"{self.preview}... <{self.size:,} chars>"
+
+    def __repr__(self):
+        return f"LargeValue({self.preview[:20]!r}, {self.size})"
+
+    def __eq__(self, other):
+        return isinstance(other, LargeValue) and (self.preview, self.size) == (other.preview, other.size)
+
+    def __hash__(self):
+        return hash((self.preview, self.size))
+
+def preview_value(value, limit=PREVIEW_CHARS):
+    """Shortens a long str or bytes value to a LargeValue; anything else is returned as is."""
+    if isinstance(value, (str, bytes)) and len(value) > limit:
+        return LargeValue(value[:limit], len(value))
+    return value
+
+def may_hold_large_values(declared_type):
+    """True for columns with TEXT or BLOB affinity (or no declared type)."""
+    kind = (declared_type or "").upper()
+    return not kind or ("INT" not in kind and any(t in kind for t in ("CHAR", "CLOB", "TEXT", "BLOB")))
+
+
+class TablePager:
+    """Keyset-paginated window over one table, optionally sorted on a column and filtered.
+
+    Only the pages that are actually requested are fetched. Page N is read with
+    ``WHERE rowid > <last rowid of page N-1>`` (or ``(col, rowid) > (?, ?)`` when
+    sorted) when that boundary is known, so scrolling forward never re-reads the
+    rows before it and an index on the sort column serves any page directly;
+    jumps into unknown territory fall back to a single OFFSET query and record
+    the boundary.
+
+    ``order`` is ``(column, descending)``; a column of None sorts by rowid.
+    ``filters`` maps column names to filter texts (see ``parse_filter``).
+
+    TEXT and BLOB columns (other than the sort column) are read as
+    ``substr()`` and ``length()``, so values longer than ``PREVIEW_CHARS``
+    arrive as LargeValue previews and never leave SQLite in full.
+    """
+    def __init__(self, table_name, page_size=PAGE_SIZE, order=None, filters=None):
+        self.table_name = table_name
+        self.page_size = page_size
+        self.order = order if order and order[0] is not None else None
+        self.descending = bool(order and order[1])
+        self.filters = {column: text for column, text in (filters or {}).items() if text.strip()}
+        self.columns = []
+        self.total = None
+        self.estimate = 0
+        self._pages = {}
+        self._boundaries = {}
+        self._where, self._params = filter_clause(self.filters)
+        self._sort_index = None
+        self._previews = []
+        self._what = "rowid, *"
+
+    @property
+    def source(self):
+        return f'SELECT * FROM "{self.table_name}"'
+
+    @property
+    def sorted_or_filtered(self):
+        return bool(self.order or self.descending or self.filters)
+
+    def open(self, conn):
+        """Reads the column list and a cheap row estimate (max rowid)."""
+        cursor = conn.execute(f'SELECT rowid, * FROM {quote_identifier(self.table_name)} LIMIT 0')
+        self.columns = [desc[0] for desc in cursor.description][1:]
+        if self.order:
+            self._sort_index = self.columns.index(self.order[0])
+        types = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({quote_identifier(self.table_name)})")}
+        self._previews = [i for i, col in enumerate(self.columns)
+                          if i != self._sort_index and col in types and may_hold_large_values(types[col])]
+        if self._previews:
+            columns = [quote_identifier(col) for col in self.columns]
+            for i in self._previews:
+                columns[i] = f"CASE WHEN length({columns[i]}) > {PREVIEW_CHARS} " \
+                             f"THEN substr({columns[i]}, 1, {PREVIEW_CHARS}) ELSE {columns[i]} END"
+            lengths = [f"CASE WHEN length({quote_identifier(self.columns[i])}) > {PREVIEW_CHARS} "
+                       f"THEN length({quote_identifier(self.columns[i])}) END" for i in self._previews]
+            self._what = ", ".join(["rowid"] + columns + lengths)
+        if not self.filters:
+            self.estimate = conn.execute(f'SELECT max(rowid) FROM {quote_identifier(self.table_name)}').fetchone()[0] or 0
+
+    def known_rows(self):
+        if self.total is not None:
+            return self.total
+        return max(self.estimate, self._loaded_upper_bound())
+
+    def _loaded_upper_bound(self):
+        if not self._pages:
+            return 0
+        last = max(self._pages)
+        return last * self.page_size + len(self._pages[last])
+
+    def count(self, conn):
+        """Computes the exact row count. Meant to run after the first screen is shown."""
+        if self.total is None:
+            self.total = conn.execute(
+                f'SELECT count(*) FROM {quote_identifier(self.table_name)} {self._where}', self._params
+            ).fetchone()[0]
+        return self.total
+
+    def _order_by(self, prefix=""):
+        direction = " DESC" if self.descending else ""
+        if not self.order:
+            return f"{prefix}rowid{direction}"
+        return f"{prefix}{quote_identifier(self.order[0])}{direction}, {prefix}rowid{direction}"
+
+    def _boundary(self, row):
+        """The keyset position of a (key, values) row: its rowid, or (sort value, rowid)."""
+        if not self.order:
+            return row[0]
+        return (row[1][self._sort_index], row[0])
+
+    def _segments(self):
+        """The sorted walk as a list of (predicate, ORDER BY, resume predicate after a boundary).
+
+        SQLite sorts NULLs first; row-value comparisons never match NULL, so the
+        NULL and non-NULL runs of the sort column are read as separate segments.
+        """
+        op = "<" if self.descending else ">"
+        direction = " DESC" if self.descending else ""
+        if not self.order:
+            return [("", f"rowid{direction}", f"rowid {op} ?")]
+        col = quote_identifier(self.order[0])
+        nulls = (f"{col} IS NULL", f"rowid{direction}", f"rowid {op} ?")
+        values = (f"{col} IS NOT NULL", f"{col}{direction}, rowid{direction}", f"({col}, rowid) {op} (?, ?)")
+        return [values, nulls] if self.descending else [nulls, values]
+
+    def _select(self, conditions, order_by, params, limit, offset=None, what="rowid, *"):
+        where = [self._where[len("WHERE "):]] if self._where else []
+        where += [c for c in conditions if c]
+        sql = f'SELECT {what} FROM {quote_identifier(self.table_name)}'
+        if where:
+            sql += " WHERE " + " AND ".join(f"({c})" for c in where)
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        params = self._params + tuple(params) + (limit,)
+        if offset is not None:
+            sql += " OFFSET ?"
+            params += (offset,)
+        return sql, params
+
+    def _fetch_after(self, conn, boundary):
+        """Reads one page that starts right after ``boundary`` (None: at the very start)."""
+        segments = self._segments()
+        first = 0
+        if boundary is not None and self.order:
+            first = segments.index(next(s for s in segments if ("IS NULL" in s[0]) == (boundary[0] is None)))
+        rows = []
+        for number, (predicate, order_by, after) in enumerate(segments[first:]):
+            conditions, params = [predicate], []
+            if number == 0 and boundary is not None:
+                conditions.append(after)
+                params = [boundary[1]] if self.order and boundary[0] is None else \
+                    list(boundary) if self.order else [boundary]
+            sql, params = self._select(conditions, order_by, params, self.page_size - len(rows), what=self._what)
+            rows.extend(conn.execute(sql, params).fetchall())
+            if len(rows) >= self.page_size:
+                break
+        return rows
+
+    def _fetch_page(self, conn, page_no):
+        if page_no == 0:
+            rows = self._fetch_after(conn, None)
+        elif page_no - 1 in self._boundaries:
+            rows = self._fetch_after(conn, self._boundaries[page_no - 1])
+        else:
+            sql, params = self._select([], self._order_by(), (), self.page_size, page_no * self.page_size,
+                                       what=self._what)
+            rows = conn.execute(sql, params).fetchall()
+        page = [self._row(row) for row in rows]
+        if page:
+            self._boundaries[page_no] = self._boundary(page[-1])
+        if len(page) < self.page_size and (page or page_no == 0 or len(self._pages.get(page_no - 1, ())) == self.page_size):
+            # An empty page past a partial (or unknown) one only says the table ends somewhere before it.
+            self.total = page_no * self.page_size + len(page)
+        return page
+
+    def _row(self, row):
+        """Turns a fetched (rowid, *values, *lengths) row into (key, values) with LargeValue previews."""
+        if not self._previews:
+            return row[0], row[1:]
+        width = len(self.columns) + 1
+        values = list(row[1:width])
+        for i, size in zip(self._previews, row[width:]):
+            if size is not None:
+                values[i] = LargeValue(values[i], size)
+        return row[0], tuple(values)
+
+    def _page(self, conn, page_no):
+        page = self._pages.pop(page_no, None)
+        if page is None:
+            page = self._fetch_page(conn, page_no)
+        self._pages[page_no] = page
+        while len(self._pages) > MAX_CACHED_PAGES:
+            del self._pages[next(iter(self._pages))]
+        return page
+
+    def cached_window(self, start, count):
+        """Returns the rows in [start, start + count) if every page is already cached, else None."""
+        return self._window(None, start, count)
+
+    def fetch_window(self, conn, start, count):
+        """Returns a list of (key, values) for rows [start, start + count)."""
+        return self._window(conn, start, count)
+
+    def _window(self, conn, start, count):
+        if count <= 0:
+            return []
+        rows = []
+        first_page = start // self.page_size
+        last_page = (start + count - 1) // self.page_size
+        for page_no in range(first_page, last_page + 1):
+            if conn is None:
+                if page_no not in self._pages:
+                    if self.total is not None and page_no * self.page_size >= self.total:
+                        break
+                    return None
+                page = self._pages[page_no]
+            else:
+                if self.total is not None and page_no * self.page_size >= self.total:
+                    break
+                page = self._page(conn, page_no)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                break
+        offset = start - first_page * self.page_size
+        return rows[offset:offset + count]
+
+    def cached_rows(self):
+        for page in list(self._pages.values()):
+            yield from page
+
+    def invalidate(self):
+        """Forgets every cached page; the visible window is re-read on the next refresh."""
+        self._pages.clear()
+        self._boundaries.clear()
+        self.total = None
+
+    def refresh_window(self, conn, start, count):
+        """Re-reads only the pages under [start, start + count) after another connection wrote to the table.
+
+        Keyset boundaries before the window are kept, so the window is read with
+        the same seek as before rather than an OFFSET scan; every other page is
+        dropped and ``total`` is left for ``count()``. Returns (rows, keys of the
+        rows that changed, appeared or disappeared in the window).
+        """
+        first = start // self.page_size
+        old = dict(self.cached_window(start, count) or ())
+        self._pages.clear()
+        self._boundaries = {page_no: key for page_no, key in self._boundaries.items() if page_no < first}
+        self.total = None
+        rows = self._window(conn, start, count)
+        self.total = None
+        changed = {key for key, values in rows if old.get(key) != values}
+        return rows, changed | (old.keys() - {key for key, _ in rows})
+
+    def patch(self, key, values):
+        """Replaces the cached values of one row after it was edited in place."""
+        for page in self._pages.values():
+            for i, (row_key, _) in enumerate(page):
+                if row_key == key:
+                    page[i] = (key, tuple(values))
+                    return
+
+    def forget(self, keys):
+        """Removes deleted rows (by rowid) from the cache without re-reading anything.
+
+        Pages wholly before the first deleted row are untouched. The contiguous
+        run of cached pages holding that row is re-split in place; anything
+        after it would be shifted by an unknown amount and is dropped.
+        """
+        keys = set(keys)
+        if not keys:
             return
-
-        table_name = simpledialog.askstring("Add Table", "Enter the name for the new table:")
-        
-        if table_name:
-            if not table_name.isidentifier():
-                messagebox.showerror("Error", "Invalid table name. Use alphanumeric characters and underscores.")
+        if self.sorted_or_filtered:
+            # Rows are not in rowid order: locate the first cached page that holds a deleted row.
+            holding = [p for p in sorted(self._pages) if any(row[0] in keys for row in self._pages[p])]
+            if not holding:
+                self.invalidate()
                 return
-
-            try:
-                query = f"CREATE TABLE {table_name} (id INTEGER PRIMARY KEY, name TEXT);"
-                self.conn.execute(query)
-                self.conn.commit()
-                messagebox.showinfo("Success", f"Table '{table_name}' created successfully.")
-                self.populate_table_selector()
-                self.selected_table.set(table_name)
-                self.select_table(None)
-            except Exception as e:
-                messagebox.showerror("Creation Error", f"Failed to create table: {e}")
-
-    def save_file(self, save_as=False):
-        if not self.conn:
-            messagebox.showwarning("No DB", "Open or create a database file first.")
-            return
-
-        target_path = self.filepath
-        
-        if save_as or not target_path:
-            target_path = filedialog.asksaveasfilename(
-                defaultextension=".db",
-                filetypes=[
-                    ("SQLite Database", "*.db"), 
-                    ("SQL Dump", "*.sql"),
-                    ("All Files", "*.*")
-                ]
-            )
-        
-        if target_path:
-            if target_path.lower().endswith('.sql'):
-                try:
-                    with open(target_path, 'w') as f:
-                        for line in self.conn.iterdump():
-                            f.write('%s\n' % line)
-                    messagebox.showinfo("Success", f"Database saved to SQL file: {target_path}")
-                except Exception as e:
-                    messagebox.showerror("Save Error", f"Failed to save SQL dump: {e}")
+            page_no, in_run = holding[0], True
+        else:
+            first_key = min(keys)
+            for page_no in sorted(self._pages):
+                page = self._pages[page_no]
+                if page and page[-1][0] >= first_key:
+                    break
             else:
-                try:
-                    self.conn.commit() 
-                    self.filepath = target_path 
-                    messagebox.showinfo("Success", f"Database saved to: {target_path}")
-                except Exception as e:
-                    messagebox.showerror("Save Error", f"Failed to save DB file: {e}")
-
-    # =====================================================================
-    # EDIT/STRUCTURE OPERATIONS
-    # =====================================================================
-
-    def get_table_list(self):
-        if not self.conn:
-            return []
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-            return [row[0] for row in cursor.fetchall()]
-        except Exception:
-            return []
-
-    def show_rename_table_dialog(self):
-        if not self.conn:
-            messagebox.showwarning("No DB", "Open a database file first.")
+                page_no = None
+            in_run = page_no is not None and self._pages[page_no][0][0] <= first_key
+
+        if page_no is not None:
+            rebuild = []
+            if in_run:
+                run_end = page_no
+                while run_end in self._pages:
+                    rebuild.extend(self._pages[run_end])
+                    run_end += 1
+                reached_end = len(self._pages[run_end - 1]) < self.page_size
+            for stale in [p for p in self._pages if p >= page_no]:
+                del self._pages[stale]
+            for stale in [p for p in self._boundaries if p >= page_no]:
+                del self._boundaries[stale]
+            rows = [row for row in rebuild if row[0] not in keys]
+            for i in range(0, len(rows), self.page_size):
+                chunk = rows[i:i + self.page_size]
+                if len(chunk) < self.page_size and not reached_end:
+                    break
+                self._pages[page_no] = chunk
+                self._boundaries[page_no] = self._boundary(chunk[-1])
+                page_no += 1
+            if rebuild and not rows and reached_end and page_no == 0:
+                self._pages[0] = []
+
+        if self.total is not None:
+            self.total = max(0, self.total - len(keys))
+        self.estimate = max(0, self.estimate - len(keys))
+
+    def append(self, rows):
+        """Adds freshly inserted ``(rowid, *values)`` rows, which sort after every cached row.
+
+        In a sorted or filtered view their position is unknown, so the cache is dropped instead.
+        """
+        if not rows:
             return
-
-        table_list = self.get_table_list()
-        if not table_list:
-            messagebox.showwarning("No Tables", "The current database contains no tables to rename.")
+        if self.sorted_or_filtered:
+            self.invalidate()
             return
-
-        dialog = RenameTableDialog(self.root, table_list)
-
-        if dialog.old_name and dialog.new_name:
-            if dialog.old_name == dialog.new_name:
-                messagebox.showinfo("No Change", "The new name is the same as the old name. No modification performed.")
-                return
-
-            if not dialog.new_name.isidentifier():
-                messagebox.showerror("Error", "Invalid new table name. Use alphanumeric characters and underscores.")
-                return
-                
-            self.rename_table(dialog.old_name, dialog.new_name)
-
-    def rename_table(self, old_name, new_name):
-        try:
-            query = f"ALTER TABLE {old_name} RENAME TO {new_name};"
-            self.conn.execute(query)
-            self.conn.commit()
-            
-            messagebox.showinfo("Success", f"Table '{old_name}' successfully renamed to '{new_name}'.")
-            
-            self.populate_table_selector() 
-            self.selected_table.set(new_name)
-            self.select_table(None)
-            
-        except Exception as e:
-            messagebox.showerror("Rename Error", f"Failed to rename table: {e}")
-
-
-    def show_alter_column_dialog(self):
-        if not self.conn or not self.selected_table.get():
-            messagebox.showwarning("Warning", "Please select a table first.")
+        if self.total is None:
+            self.estimate += len(rows)
             return
-
-        current_cols = self.tree["columns"]
-        if not current_cols:
-            messagebox.showwarning("Warning", "The current table has no columns to modify.")
+        last_page = max(0, (self.total - 1) // self.page_size) if self.total else 0
+        if self.total and last_page not in self._pages:
+            self.total += len(rows)
             return
+        page = self._pages.get(last_page, [])
+        self._pages[last_page] = page
+        for row in rows:
+            if len(page) == self.page_size:
+                last_page += 1
+                page = self._pages[last_page] = []
+            values = list(row[1:])
+            for i in self._previews:
+                values[i] = preview_value(values[i])
+            page.append((row[0], tuple(values)))
+            self._boundaries[last_page] = row[0]
+        self.total += len(rows)
+
+    def keys(self, conn, start, count):
+        """Returns the rowids of rows [start, start + count) without reading the rows themselves."""
+        sql, params = self._select([], self._order_by(), (), count, start, what="rowid")
+        return [row[0] for row in conn.execute(sql, params)]
+
+    def column_values(self, conn, index):
+        """Iterates the full values of one column in view order, reading no other column."""
+        sql, params = self._select([], self._order_by(), (), -1, what=quote_identifier(self.columns[index]))
+        return (row[0] for row in conn.execute(sql, params))
+
+
+class QueryPager:
+    """Streams an arbitrary SELECT through one open cursor, fetching only as far as the user scrolls.
+
+    A sort (``order`` as in TablePager) or ``filters`` wrap the query in an outer
+    SELECT, so SQLite does the work instead of the grid. Long TEXT and BLOB
+    values are cut down to LargeValue previews as each batch arrives.
+    """
+    def __init__(self, query, page_size=PAGE_SIZE, order=None, filters=None):
+        self.base_query = query
+        self.order = order if order and order[0] is not None else None
+        self.descending = bool(self.order and order[1])
+        self.filters = {column: text for column, text in (filters or {}).items() if text.strip()}
+        self.params = ()
+        if self.order or self.filters:
+            where, self.params = filter_clause(self.filters)
+            query = f"SELECT * FROM ({normalize_sql(query)}) {where}"
+            if self.order:
+                query += f" ORDER BY {quote_identifier(self.order[0])}{' DESC' if self.descending else ''}"
+        self.query = query
+        self.page_size = page_size
+        self.columns = []
+        self.total = None
+        self.estimate = 0
+        self._cursor = None
+        self._rows = []
+
+    @property
+    def source(self):
+        return self.query
+
+    @classmethod
+    def from_rows(cls, query, columns, rows):
+        """A pager over rows that were already fetched (e.g. one result set of a script)."""
+        pager = cls(query)
+        pager.columns = list(columns)
+        pager._rows = [(i, tuple(map(preview_value, row))) for i, row in enumerate(rows)]
+        pager.total = len(pager._rows)
+        return pager
+
+    @property
+    def sorted_or_filtered(self):
+        return bool(self.order or self.filters)
+
+    def open(self, conn):
+        self._cursor = conn.execute(self.query, self.params)
+        self.columns = [desc[0] for desc in self._cursor.description] if self._cursor.description else []
+        self._fill(self.page_size)
+
+    def close(self):
+        """Releases the cursor (and its read lock); a later fetch past the rows read re-runs the query."""
+        if self._cursor is not None:
+            try: self._cursor.close()
+            except Exception: pass
+            self._cursor = None
+
+    def _reopen(self, conn):
+        """Re-runs a query whose cursor was closed half-way and skips the rows already read.
+
+        A statement that writes is never run twice: its result ends where it was closed.
+        """
+        if not is_query(conn, self.base_query):
+            self.total = len(self._rows)
+            return
+        self._cursor = conn.execute(self.query, self.params)
+        skip = len(self._rows)
+        while skip > 0:
+            batch = self._cursor.fetchmany(min(skip, self.page_size))
+            if not batch:
+                break
+            skip -= len(batch)
+
+    def known_rows(self):
+        if self.total is not None:
+            return self.total
+        return max(self.estimate, len(self._rows))
+
+    def count(self, conn):
+        """Counts the full result without materialising it."""
+        if self.total is None:
+            self.estimate = conn.execute(f"SELECT count(*) FROM ({normalize_sql(self.query)})",
+                                         self.params).fetchone()[0]
+        return self.known_rows()
+
+    def _fill(self, upto, conn=None):
+        if self._cursor is None and self.total is None and conn is not None and len(self._rows) < upto:
+            self._reopen(conn)
+        while self._cursor is not None and len(self._rows) < upto:
+            batch = self._cursor.fetchmany(max(self.page_size, upto - len(self._rows)))
+            base = len(self._rows)
+            self._rows.extend((base + i, tuple(map(preview_value, row))) for i, row in enumerate(batch))
+            if not batch:
+                self.total = len(self._rows)
+                self.close()
+
+    def cached_window(self, start, count):
+        if start + count <= len(self._rows) or self.total is not None:
+            return self._rows[start:start + count]
+        return None
+
+    def fetch_window(self, conn, start, count):
+        self._fill(start + count + self.page_size, conn)
+        return self._rows[start:start + count]
+
+    def cached_rows(self):
+        return list(self._rows)
+
+    def patch(self, key, values):
+        for i, (row_key, _) in enumerate(self._rows):
+            if row_key == key:
+                self._rows[i] = (key, tuple(values))
+                return
 
-        col_to_modify = simpledialog.askstring(
-            "Select Column", 
-            f"Enter the exact name of the column to modify (e.g., {current_cols[0]}):"
-        )
+    def refresh_window(self, conn, start, count):
+        """Re-runs the query after another connection wrote and reads it as far as [start, start + count).
+
+        A streamed result has no keys to seek on, so the rows before the window
+        are read again, but nothing past it is. Returns (rows, positions whose
+        values changed) like ``TablePager.refresh_window``.
+        """
+        old = dict(self._rows[start:start + count])
+        self.close()
+        self._rows = []
+        self.total = None
+        self._cursor = conn.execute(self.query, self.params)
+        rows = self.fetch_window(conn, start, count)
+        changed = {key for key, values in rows if old.get(key) != values}
+        return rows, changed | (old.keys() - {key for key, _ in rows})
+
+    def forget(self, keys):
+        keys = set(keys)
+        self._rows = [(k, row) for k, row in self._rows if k not in keys]
+        if self.total is not None:
+            self.total = len(self._rows)
+        else:
+            self.estimate = max(0, self.estimate - len(keys))
+
+    def keys(self, conn, start, count):
+        return [key for key, _ in self.fetch_window(conn, start, count)]
+
+    def column_values(self, conn, index):
+        """Re-runs the query and iterates the full values of one column; refuses statements that write."""
+        if not is_query(conn, self.base_query):
+            raise ValueError("The statement that produced this result writes to the database; "
+                             "run it again as a SELECT to copy its columns")
+        return (row[index] for row in conn.execute(self.query, self.params))
+
+def make_pager(conn, query, tables, order=None, filters=None, cache=None):
+    """Uses keyset paging for a plain table browse, and a streaming cursor for anything else.
+
+    ``order`` and ``filters`` are pushed down into the SQL (see TablePager).
+    With a ResultCache, an unchanged result viewed recently is reused as is.
+    """
+    if cache is not None:
+        return cache.fetch(conn, ResultCache.key(query, (), order, filters),
+                           lambda: make_pager(conn, query, tables, order, filters))
+    match = re.fullmatch(r'\s*SELECT\s+\*\s+FROM\s+"?(\w+)"?\s*;?\s*', query, re.IGNORECASE)
+    if match and match.group(1) in tables:
+        pager = TablePager(match.group(1), order=order, filters=filters)
+        try:
+            pager.open(conn)
+            return pager
+        except sqlite3.OperationalError:
+            pass  # WITHOUT ROWID table: no rowid to page on
+    pager = QueryPager(query, order=order, filters=filters)
+    pager.open(conn)
+    return pager
+
+
+def read_column(conn, pager, index, limit=COPY_COLUMN_ROWS, progress=None):
+    """Reads the full values of column ``index`` of a pager's result, at most ``limit`` of them.
+
+    Only that column is selected, so long TEXT and BLOB values arrive whole
+    rather than as previews. Returns (values, complete).
+    """
+    total = pager.known_rows() or None
+    values = []
+    for value in pager.column_values(conn, index):
+        if len(values) == limit:
+            return values, False
+        values.append(value)
+        if progress and len(values) % PAGE_SIZE == 0:
+            progress(len(values), total, f"{len(values):,} rows read")
+    return values, True
+
+
+_SQL_TOKENS = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])|(?:\s|--[^\n]*|/\*.*?(?:\*/|$))+""",
+                         re.DOTALL)
+
+def normalize_sql(query):
+    """Canonical text of a statement: comments dropped, whitespace collapsed outside quotes, no trailing ';'."""
+    text = _SQL_TOKENS.sub(lambda m: m.group(1) or " ", query)
+    return text.strip().rstrip(";").strip()
+
+
+def _rows_size(rows):
+    """Rough memory footprint of cached (key, values) rows, in bytes."""
+    size = 0
+    for _, values in rows:
+        size += 72 + 8 * len(values)
+        for value in values:
+            if isinstance(value, LargeValue):
+                value = value.preview
+            size += len(value) + 49 if isinstance(value, (str, bytes)) else 24
+    return size
+
+
+class ResultCache:
+    """LRU cache of recently viewed pagers (and the pages they hold) within a memory budget.
+
+    Entries are keyed on the normalized SQL, parameters, sort and filters, and
+    are only reused while ``PRAGMA data_version`` (commits by other connections),
+    the connection's own change counter and ``PRAGMA schema_version`` are what
+    they were when the pager was made, so stale rows are never shown. A pager
+    grows while it is on screen, so it is measured when the next one is fetched;
+    the least recently used entries are then dropped to fit ``budget`` bytes.
+    Streaming results that are put aside hold no open cursor: scrolling past
+    their cached rows re-runs the query. Only used from the worker thread.
+    """
+    def __init__(self, budget=RESULT_CACHE_MB << 20):
+        self.budget = budget
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()   # key -> [version, pager, size]
+        self._current = None
+
+    @staticmethod
+    def key(query, params=(), order=None, filters=None):
+        return (normalize_sql(query), tuple(params), order, tuple(sorted((filters or {}).items())))
+
+    @staticmethod
+    def version(conn):
+        return (conn.total_changes, conn.execute("PRAGMA data_version").fetchone()[0],
+                conn.execute("PRAGMA schema_version").fetchone()[0])
+
+    @property
+    def size(self):
+        return sum(entry[2] for entry in self._entries.values())
+
+    def fetch(self, conn, key, make):
+        """Returns the still-valid pager cached under ``key``, or a new one from ``make()``."""
+        if self.budget <= 0:
+            return make()
+        if self._current in self._entries:
+            entry = self._entries[self._current]
+            entry[2] = _rows_size(entry[1].cached_rows())
+            if self._current != key:
+                self._release(entry[1])
+        version = self.version(conn)
+        for stale in [k for k, entry in self._entries.items() if entry[0] != version]:
+            self._release(self._entries.pop(stale)[1])
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.hits += 1
+            pager = entry[1]
+        else:
+            self.misses += 1
+            pager = make()
+        self._entries[key] = [version, pager, 0]
+        self._current = key
+        while len(self._entries) > 1 and self.size > self.budget:
+            self._release(self._entries.popitem(last=False)[1][1])
+        return pager
+
+    @staticmethod
+    def _release(pager):
+        # A cached streaming result must not hold a statement (and, without WAL, a
+        # SHARED lock) open; reading past its rows later re-runs the query.
+        if isinstance(pager, QueryPager):
+            pager.close()
+
+    def clear(self):
+        for entry in self._entries.values():
+            self._release(entry[1])
+        self._entries.clear()
+        self._current = None
+
+
+class ChangeWatcher:
+    """Notices commits made to the database by other connections and processes.
+
+    ``check()`` reads ``PRAGMA data_version``, which changes only when another
+    connection commits (this connection's own writes leave it alone), and
+    ``PRAGMA schema_version``; both come from the file header and the WAL index,
+    so a check costs microseconds and no table I/O. It is meant to be polled.
+    """
+    def __init__(self):
+        self.data_version = None
+        self.schema_version = None
+
+    def check(self, conn):
+        """Returns (data changed, schema changed) by another connection since the previous check."""
+        if conn.in_transaction:
+            return False, False     # our own transaction hides other commits until it ends
+        data = conn.execute("PRAGMA data_version").fetchone()[0]
+        schema = conn.execute("PRAGMA schema_version").fetchone()[0]
+        changed = self.data_version is not None and data != self.data_version
+        schema_changed = changed and schema != self.schema_version
+        self.data_version, self.schema_version = data, schema
+        return changed, schema_changed
 
-        if not col_to_modify or col_to_modify not in current_cols:
-            messagebox.showwarning("Warning", "Invalid column name selected or cancelled.")
-            return
-            
-        dialog = AlterColumnDialog(self.root, col_to_modify)
-
-        if dialog.new_name and dialog.new_type:
-            self.alter_column(col_to_modify, dialog.new_name, dialog.new_type)
-            
-    def alter_column(self, old_name, new_name, new_type):
-        table_name = self.selected_table.get()
-        
-        if old_name != new_name:
+# =========================================================================
+# 2. Background Database Worker
+# =========================================================================
+PROGRESS_STEPS = 20000      # SQLite VM instructions between progress-handler calls
+REPORT_INTERVAL = 0.1       # seconds between progress events posted to the UI
+BACKUP_PAGES = 256          # pages copied per backup step; locks are released between steps
+SCRIPT_RESULT_ROWS = 10000  # rows kept per result set of a script
+
+class JobCancelled(Exception):
+    """Raised inside a job once the user has asked for it to be cancelled."""
+
+
+class Job:
+    """One unit of work queued on a DatabaseWorker."""
+    def __init__(self, worker, func, args, on_done, on_error, label, progress, sync=False, on_result=None, sql=None):
+        self.worker = worker
+        self.sql = sql
+        self.on_result = on_result
+        self.sync = sync
+        self.func = func
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.label = label
+        self.progress = progress
+        self.cancelled = False
+        self.vm_steps = 0
+        self.started = None
+        self.elapsed = None     # seconds spent on the worker thread
+        self.rows = None
+        self.render = None      # seconds the UI spent drawing this job's results
+        self._last_report = 0.0
+
+    def report(self, done, total=None, message=None):
+        """Posts progress for the UI (rate limited). Raises JobCancelled once the job is cancelled."""
+        if self.cancelled:
+            raise JobCancelled()
+        now = time.monotonic()
+        if now - self._last_report >= REPORT_INTERVAL or (total and done >= total):
+            self._last_report = now
+            self.worker._events.put(("progress", self, (done, total, message)))
+
+    def post_result(self, value):
+        """Hands an intermediate result to ``on_result`` on the UI thread (e.g. one result set of a script)."""
+        self.worker._events.put(("result", self, value))
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class DatabaseWorker:
+    """Owns one SQLite connection on a dedicated thread and runs queued jobs against it in order.
+
+    Jobs are plain callables invoked as ``func(conn, *args)``; jobs submitted with
+    ``progress=True`` also receive ``progress=job.report``, and jobs submitted
+    with ``on_result`` receive ``on_result=job.post_result`` to hand over
+    intermediate results while they run. Results and progress
+    are delivered back to the submitting thread by calling ``poll()``, which the
+    Tk UI does from a ``root.after`` loop. ``cancel()`` interrupts the running
+    statement via ``Connection.interrupt()``. ``after_job(conn)`` runs on the
+    worker thread after every job, before its result is posted.
+
+    With ``metrics`` (an OperationMetrics) every job is recorded with its SQL
+    (``sql=`` or guessed by ``job_sql``), duration, rows returned and the time
+    the UI spent rendering while its result was delivered; ``slow_ms``
+    overrides the metrics' slow-query threshold for this connection.
+    """
+    def __init__(self, connect, on_event=None, after_job=None, metrics=None, slow_ms=None):
+        self.on_event = on_event
+        self.after_job = after_job
+        self.metrics = metrics
+        self.slow_ms = slow_ms
+        self.conn = None
+        self.current = None
+        self._jobs = queue.Queue()
+        self._events = queue.Queue()
+        self._ready = threading.Event()
+        self._open_error = None
+        self._thread = threading.Thread(target=self._run, args=(connect,), name="ease-db-worker", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._open_error is not None:
+            raise self._open_error
+
+    @property
+    def busy(self):
+        return self.current is not None or not self._jobs.empty()
+
+    def submit(self, func, *args, on_done=None, on_error=None, label="", progress=False, on_result=None, sql=None):
+        job = Job(self, func, args, on_done, on_error, label, progress, on_result=on_result, sql=sql)
+        self._jobs.put(job)
+        return job
+
+    def call(self, func, *args):
+        """Runs a short job and waits for its result. Only meant for quick metadata reads."""
+        if threading.current_thread() is self._thread:
+            return func(self.conn, *args)
+        finished = threading.Event()
+        outcome = {}
+        def run(conn):
             try:
-                rename_query = f"ALTER TABLE {table_name} RENAME COLUMN {old_name} TO {new_name};"
-                self.conn.execute(rename_query)
-                self.conn.commit()
-                messagebox.showinfo("Success", f"Column renamed from '{old_name}' to '{new_name}'.")
-            except Exception as e:
-                messagebox.showerror("Rename Error", f"Failed to rename column: {e}")
+                outcome["result"] = func(conn, *args)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                finished.set()
+        job = Job(self, run, (), None, None, "", False, sync=True)
+        self._jobs.put(job)
+        finished.wait()
+        if self.metrics is not None and job.elapsed is not None:
+            self.metrics.record(operation_name(func), job_sql(func, args), job.elapsed,
+                                result_rows(outcome.get("result")), failed="error" in outcome, slow_ms=self.slow_ms)
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
+
+    def cancel(self):
+        """Cancels the running job and everything still queued behind it."""
+        keep = []
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None or job.sync:
+                keep.append(job)  # callers are blocked waiting on these
+                continue
+            job.cancel()
+            self._events.put(("cancelled", job, None))
+        for job in keep:
+            self._jobs.put(job)
+        job = self.current
+        if job is not None:
+            job.cancel()
+            self.conn.interrupt()
+
+    def close(self):
+        self.cancel()
+        self._jobs.put(None)
+        self._thread.join(timeout=5)
+
+    def poll(self):
+        """Delivers finished results and progress events. Call this from the UI thread."""
+        while True:
+            try:
+                kind, job, payload = self._events.get_nowait()
+            except queue.Empty:
                 return
-        
-        if new_type in ["NUMERIC", "TEXT"]:
-            messagebox.showwarning(
-                "Type Change Note", 
-                f"Column **'{new_name}'** has been conceptually noted as **'{new_type}'**.\n\n"
-                "SQLite is dynamically typed; it does not strictly enforce type changes via simple ALTER TABLE. "
-                "For actual type definition, manual table recreation is needed."
-            )
-            
-        self.select_table(None)
-        
-    def add_structural_element(self, element_type='column'):
-        table_name = self.selected_table.get()
-        if not self.conn or not table_name:
-            messagebox.showwarning("Warning", "Please select a table first.")
+            if kind == "result":
+                if job.on_result and not job.cancelled:
+                    self._deliver(job, job.on_result, payload)
+                continue
+            if kind == "done" and job.on_done:
+                self._deliver(job, job.on_done, payload)
+            elif kind == "error" and job.on_error:
+                job.on_error(payload)
+            elif kind == "cancelled" and job.on_error:
+                job.on_error(JobCancelled())
+            if self.metrics is not None and kind in ("done", "error", "cancelled") and job.elapsed is not None:
+                self.metrics.record(operation_name(job.func), job.sql or job_sql(job.func, job.args), job.elapsed,
+                                    job.rows, job.render, failed=kind != "done", slow_ms=self.slow_ms)
+            if self.on_event:
+                self.on_event(kind, job, payload)
+
+    def _deliver(self, job, callback, payload):
+        if self.metrics is None:
+            callback(payload)
             return
+        self.metrics.delivering()
+        try:
+            callback(payload)
+        finally:
+            render = self.metrics.delivered()
+            if render is not None:
+                job.render = (job.render or 0.0) + render
 
-        if element_type == 'column':
-            new_col_name = simpledialog.askstring("Add Column", "Enter new column name (e.g., new_col):")
-            new_col_type = simpledialog.askstring("Add Column", "Enter column data type (e.g., TEXT, INTEGER):")
-            
-            if new_col_name and new_col_type:
-                new_col_name = new_col_name.strip()
-                new_col_type = new_col_type.strip().upper()
-                try:
-                    query = f"ALTER TABLE {table_name} ADD COLUMN {new_col_name} {new_col_type};"
-                    self.conn.execute(query)
-                    self.conn.commit()
-                    messagebox.showinfo("Success", f"Column '{new_col_name}' added to {table_name}.")
-                    self.select_table(None)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to add column: {e}")
-
-    def delete_structural_element(self, element_type='column'):
-        if element_type == 'column':
-            messagebox.showerror("Error", "SQLite does not easily support dropping columns. You must use the SQL Query box to perform this complex operation manually (CREATE TEMP TABLE, INSERT data, DROP old table, RENAME new table).")
-        
-    def add_row(self):
-        table_name = self.selected_table.get()
-        if not self.conn or not table_name:
-            messagebox.showwarning("Warning", "Please select a table first.")
-            return
-            
+    def _run(self, connect):
         try:
-            cursor = self.conn.execute(f"PRAGMA table_info({table_name});")
-            columns = [info[1] for info in cursor.fetchall()]
-            
-            placeholders = ', '.join(['NULL'] * len(columns))
-            query = f"INSERT INTO {table_name} VALUES ({placeholders});"
-
-            self.conn.execute(query)
-            self.conn.commit()
-            self.run_query()
+            self.conn = connect()
+            self.conn.set_progress_handler(self._progress_handler, PROGRESS_STEPS)
         except Exception as e:
-            messagebox.showerror("Row Add Error", f"Failed to add row: {e}")
-
-    def delete_row(self):
-        table_name = self.selected_table.get()
-        selected_item = self.tree.selection()
-        
-        if not self.conn or not table_name or not selected_item:
-            messagebox.showwarning("Warning", "Select a row and a table first.")
+            self._open_error = e
+            self._ready.set()
             return
-            
-        row_values = self.tree.item(selected_item[0], 'values')
-        if not row_values: return
-        
-        cursor = self.conn.execute(f"PRAGMA table_info({table_name});")
-        pk_info = [info for info in cursor.fetchall() if info[5] == 1]
-        
-        if not pk_info:
-            messagebox.showerror("Error", "Table must have a Primary Key column to delete rows safely.")
-            return
-            
-        pk_name = pk_info[0][1]
-        pk_index = pk_info[0][0]
-        pk_value = row_values[pk_index]
-        
-        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete row with {pk_name} = {pk_value}?"):
+        self._ready.set()
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if job.cancelled:
+                continue
+            self.current = job
+            job.started = time.monotonic()
+            # Jobs may install their own handler (the profiler does); always start from ours.
+            self.conn.set_progress_handler(self._progress_handler, PROGRESS_STEPS)
+            if job.label:
+                self._events.put(("started", job, None))
             try:
-                query = f"DELETE FROM {table_name} WHERE {pk_name} = ?;"
-                self.conn.execute(query, (pk_value,))
-                self.conn.commit()
-                self.tree.delete(selected_item[0])
-                self.run_query()
+                kwargs = {}
+                if job.progress:
+                    kwargs["progress"] = job.report
+                if job.on_result:
+                    kwargs["on_result"] = job.post_result
+                result = job.func(self.conn, *job.args, **kwargs)
             except Exception as e:
-                messagebox.showerror("Delete Error", f"Failed to delete row: {e}")
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                event = ("cancelled" if job.cancelled else "error", job, e)
+            else:
+                event = ("done", job, result)
+                if self.metrics is not None and not job.sync:
+                    job.rows = result_rows(result)
+            job.elapsed = time.monotonic() - job.started
+            self.current = None
+            if self.after_job is not None:
+                started = time.monotonic()
+                try: self.after_job(self.conn)
+                except Exception: pass
+                if self.metrics is not None:
+                    self.metrics.record(operation_name(self.after_job), elapsed=time.monotonic() - started,
+                                        slow_ms=self.slow_ms)
+            if not job.sync:
+                self._events.put(event)
+
+        try: self.conn.close()
+        except Exception: pass
+
+    def _progress_handler(self):
+        job = self.current
+        if job is None:
+            return 0
+        if job.cancelled:
+            return 1
+        job.vm_steps += PROGRESS_STEPS
+        now = time.monotonic()
+        if job.label and now - job._last_report >= REPORT_INTERVAL:
+            job._last_report = now
+            self._events.put(("progress", job, (None, None, None)))
+        return 0
+
+
+def _backup(source, target, pages, progress):
+    def on_step(status, remaining, total):
+        if progress:
+            progress(total - remaining, total, f"{total - remaining:,} of {total:,} pages")
+    source.backup(target, pages=pages, progress=on_step)
+
+
+def backup_to_file(conn, target_path, pages=BACKUP_PAGES, progress=None):
+    """Copies the whole database into ``target_path`` with the online backup API.
+
+    The copy is made ``pages`` at a time, so other connections can keep writing
+    between steps. It is written to a temporary file next to the target and
+    moved over it only once complete, so an existing file is left untouched
+    when the copy fails or is cancelled.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(target_path)}.",
+                                     suffix=".tmp", dir=os.path.dirname(os.path.abspath(target_path)))
+    os.close(fd)
+    try:
+        target = sqlite3.connect(temp_path)
+        try:
+            _backup(conn, target, pages, progress)
+        finally:
+            target.close()
+        os.replace(temp_path, target_path)
+    except BaseException:
+        try: os.remove(temp_path)
+        except OSError: pass
+        raise
+    return target_path
+
+
+def restore_from_file(conn, source_path, pages=BACKUP_PAGES, progress=None):
+    """Overwrites the database behind ``conn`` with the contents of ``source_path``."""
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(source_path)
+    source = sqlite3.connect(source_path)
+    try:
+        _backup(source, conn, pages, progress)
+    finally:
+        source.close()
+    return source_path
+
+
+def open_memory_snapshot(source_path, pages=BACKUP_PAGES):
+    """Returns an in-memory connection holding a copy of ``source_path``."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    source = sqlite3.connect(source_path)
+    try:
+        _backup(source, conn, pages, None)
+    finally:
+        source.close()
+    return conn
+
+
+def execute_and_commit(conn, query, params=()):
+    cursor = conn.execute(query, params)
+    conn.commit()
+    return cursor.rowcount
+
+
+def split_statements(script):
+    """Splits an SQL script into statements, using sqlite3.complete_statement to find their ends."""
+    statements, current = [], ""
+    pieces = script.split(";")
+    for number, piece in enumerate(pieces):
+        current += piece
+        if number < len(pieces) - 1:
+            current += ";"
+            if not sqlite3.complete_statement(current):
+                continue  # the ";" was inside a string, comment or trigger body
+        statement = current.strip()
+        if normalize_sql(statement):  # skip fragments that are only comments or whitespace
+            statements.append(statement)
+        current = ""
+    return statements
+
+
+def is_query(conn, statement):
+    """True if ``statement`` returns rows and writes nothing, judged from its compiled program without running it."""
+    if re.match(r'\s*EXPLAIN\b', statement, re.IGNORECASE):
+        return True
+    program = [(row[1], row[3]) for row in conn.execute(f"EXPLAIN {statement}")]
+    return (any(opcode == "ResultRow" for opcode, _ in program)
+            and all(opcode != "Transaction" or write == 0 for opcode, write in program))
+
+
+StatementResult = namedtuple("StatementResult", "number sql columns rows rowcount elapsed truncated")
+
+
+class ScriptFailed(Exception):
+    """A statement of a script failed. ``number`` is its 1-based position in the script."""
+    def __init__(self, message, number, rolled_back):
+        super().__init__(message)
+        self.number = number
+        self.rolled_back = rolled_back
+
+
+def run_script(conn, script, rollback_on_error=True, on_result=None, progress=None):
+    """Runs every statement of ``script`` in one transaction and commits it; returns the StatementResults.
+
+    Each result carries the rows affected (None for statements that do not
+    report it), the elapsed time and, for statements that return rows, up to
+    SCRIPT_RESULT_ROWS of them. ``on_result`` receives each result as soon
+    as its statement finishes. On an error the work is rolled back, or with
+    ``rollback_on_error=False`` the statements before the failing one are
+    committed; either way ScriptFailed is raised. A script that manages its
+    own transactions (BEGIN/COMMIT/ROLLBACK) is run as written.
+    """
+    statements = split_statements(script)
+    own_transactions = any(re.match(r'\s*(BEGIN|COMMIT|END|ROLLBACK(?!\s+TO\b))\b', sql, re.IGNORECASE)
+                           for sql in statements)
+    if conn.in_transaction:
+        conn.commit()
+    if not own_transactions:
+        conn.execute("BEGIN")
+    results = []
+    for number, sql in enumerate(statements, 1):
+        if progress:
+            progress(number - 1, len(statements), f"statement {number} of {len(statements)}")
+        started = time.perf_counter()
+        changes = conn.total_changes
+        try:
+            cursor = conn.execute(sql)
+            columns = rows = None
+            truncated = False
+            if cursor.description:
+                columns = [d[0] for d in cursor.description]
+                rows = cursor.fetchmany(SCRIPT_RESULT_ROWS + 1)
+                truncated = len(rows) > SCRIPT_RESULT_ROWS
+                del rows[SCRIPT_RESULT_ROWS:]
+                cursor.close()
+        except sqlite3.Error as e:
+            if rollback_on_error and conn.in_transaction:
+                conn.rollback()
+            elif conn.in_transaction:
+                conn.commit()
+            raise ScriptFailed(f"Statement {number} failed: {e}", number, rollback_on_error) from e
+        rowcount = cursor.rowcount if columns is None and cursor.rowcount >= 0 else None
+        if rowcount is None and columns is None and conn.total_changes != changes:
+            rowcount = conn.total_changes - changes
+        result = StatementResult(number, sql, columns, rows, rowcount, time.perf_counter() - started, truncated)
+        results.append(result)
+        if on_result:
+            on_result(result)
+    if conn.in_transaction:
+        conn.commit()
+    return results
 
-    # =====================================================================
-    # UI/UTILITY OPERATIONS
-    # =====================================================================
+# =========================================================================
+# 3. Connection Profiles
+# =========================================================================
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".ease_db")
+PROFILES_FILE = os.path.join(CONFIG_DIR, "profiles.json")
+
+class ConnectionProfile:
+    """Named set of connection options applied whenever a database is opened.
+
+    ``None`` leaves SQLite's default in place. ``read_only`` opens the file with
+    ``mode=ro`` and ``immutable`` additionally tells SQLite the file can never
+    change, which skips locking and change detection entirely (archives only).
+    """
+    PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+    FIELDS = PRAGMAS + ("busy_timeout", "read_only", "immutable", "result_cache", "slow_query")
+
+    def __init__(self, name, journal_mode=None, synchronous=None, cache_size=None, mmap_size=None,
+                 temp_store=None, busy_timeout=None, read_only=False, immutable=False, result_cache=None,
+                 slow_query=None):
+        self.name = name
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.temp_store = temp_store
+        self.busy_timeout = busy_timeout
+        self.read_only = read_only
+        self.immutable = immutable
+        self.result_cache = result_cache    # MiB of recently viewed result pages kept (None: RESULT_CACHE_MB)
+        self.slow_query = slow_query        # ms from which operations go to the slow-query log (None: SLOW_QUERY_MS)
+
+    @property
+    def result_cache_bytes(self):
+        return (RESULT_CACHE_MB if self.result_cache is None else int(self.result_cache)) << 20
+
+    @property
+    def slow_query_ms(self):
+        return SLOW_QUERY_MS if self.slow_query is None else int(self.slow_query)
+
+    def to_dict(self):
+        return {"name": self.name, **{field: getattr(self, field) for field in self.FIELDS}}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], **{field: data.get(field) for field in cls.FIELDS})
+
+    def connect(self, path, create=False):
+        """Opens ``path`` with these options. ``create=True`` ignores the read-only flags."""
+        timeout = (self.busy_timeout or 5000) / 1000.0
+        if (self.read_only or self.immutable) and not create:
+            params = {"mode": "ro"}
+            if self.immutable:
+                params["immutable"] = 1
+            conn = sqlite3.connect(sqlite_uri(path, **params), uri=True, timeout=timeout, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.apply(conn, writable=create or not (self.read_only or self.immutable))
+        return conn
+
+    def apply(self, conn, writable=True):
+        if self.busy_timeout is not None:
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        for pragma in self.PRAGMAS:
+            value = getattr(self, pragma)
+            if value is None or value == "":
+                continue
+            if not writable and pragma in ("journal_mode", "synchronous"):
+                continue
+            if pragma in ("cache_size", "mmap_size"):
+                value = int(value)
+            elif not re.fullmatch(r"\w+", str(value)):
+                raise ValueError(f"Invalid value for {pragma}: {value!r}")
+            conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+
+    @staticmethod
+    def effective(conn):
+        """Reads back the settings SQLite actually uses, for display."""
+        return {pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+                for pragma in ConnectionProfile.PRAGMAS + ("busy_timeout",)}
+
+    def describe(self, conn):
+        values = self.effective(conn)
+        sync = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}.get(values["synchronous"], values["synchronous"])
+        temp = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}.get(values["temp_store"], values["temp_store"])
+        cache = values["cache_size"]
+        cache = f"{-cache // 1024} MiB" if cache < 0 else f"{cache} pages"
+        text = (f"{self.name}: journal={values['journal_mode']} sync={sync} cache={cache} "
+                f"mmap={values['mmap_size'] // (1 << 20)} MiB temp={temp} busy={values['busy_timeout']} ms")
+        if self.immutable:
+            return text + " [immutable]"
+        return text + (" [read-only]" if self.read_only else "")
+
+
+DEFAULT_PROFILES = [
+    ConnectionProfile("SQLite defaults"),
+    ConnectionProfile("Fast local editing", journal_mode="WAL", synchronous="NORMAL", cache_size=-65536,
+                      mmap_size=268435456, temp_store="MEMORY", busy_timeout=5000),
+    ConnectionProfile("Read-only archive", cache_size=-65536, mmap_size=1073741824, temp_store="MEMORY",
+                      busy_timeout=0, read_only=True, immutable=True),
+]
+
+
+def load_profiles(path=PROFILES_FILE):
+    """Returns (profiles, active profile name). Falls back to the built-in profiles."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        profiles = [ConnectionProfile.from_dict(item) for item in data.get("profiles", [])]
+        return (profiles or list(DEFAULT_PROFILES)), data.get("active")
+    except (OSError, ValueError, KeyError, TypeError):
+        return list(DEFAULT_PROFILES), DEFAULT_PROFILES[0].name
+
+
+def save_profiles(profiles, active, path=PROFILES_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"active": active, "profiles": [p.to_dict() for p in profiles]}, f, indent=2)
+
+
+def attached_databases(conn):
+    """Returns (schema name, file) of every database ATTACHed by the user (main, temp and the search index excluded)."""
+    return [(name, path) for _, name, path in conn.execute("PRAGMA database_list")
+            if name not in ("main", "temp", SEARCH_SCHEMA)]
+
+def schema_name_for(path):
+    """A schema name derived from a file name: ``sales-2024.db`` becomes ``sales_2024``."""
+    name = re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0]) or "db"
+    return "_" + name if name[0].isdigit() else name
+
+def attach_database(conn, path, name=None, read_only=False):
+    """ATTACHes ``path`` as schema ``name`` so one statement can join its tables (``name.table``) with main's.
+
+    ``read_only`` attaches it with ``mode=ro``, which needs an SQLite build that
+    accepts URI filenames. Returns the schema name used.
+    """
+    name = name or schema_name_for(path)
+    if not re.fullmatch(r"[A-Za-z_]\w*", name):
+        raise ValueError(f"Invalid schema name: {name!r}")
+    if name.lower() in [n.lower() for _, n, _ in conn.execute("PRAGMA database_list")]:
+        raise ValueError(f"A database is already attached as {name}")
+    if not os.path.exists(path):
+        raise ValueError(f"No such file: {path}")
+    if conn.in_transaction:
+        raise ValueError("Cannot attach a database while changes are being written")
+    target = path
+    if read_only:
+        if not any(row[0] == "USE_URI" for row in conn.execute("PRAGMA compile_options")):
+            raise ValueError("This SQLite build cannot attach files read-only")
+        target = sqlite_uri(path, mode="ro")
+    conn.execute(f"ATTACH DATABASE ? AS {quote_identifier(name)}", (target,))
+    return name
+
+def detach_database(conn, name):
+    if conn.in_transaction:
+        raise ValueError("Cannot detach a database while changes are being written")
+    conn.execute(f"DETACH DATABASE {quote_identifier(name)}")
 
-    def on_cell_double_click(self, event):
-        if not self.conn or not self.selected_table.get(): return
+# =========================================================================
+# 4. Query Profiler
+# =========================================================================
+PROFILE_STEPS = 1000
+
+class QueryProfile:
+    """Measurements of one profiled run of a statement. Times are in seconds."""
+    def __init__(self, query, number=0):
+        self.query = query
+        self.number = number
+        self.plan = []        # EXPLAIN QUERY PLAN rows: (id, parent, detail)
+        self.trace = []       # statements reported by the trace callback
+        self.columns = None
+        self.rows = 0
+        self.vm_steps = 0
+        self.first_row = None
+        self.fetch = None
+        self.render = None
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.fetch if self.fetch else None
+
+    def plan_lines(self):
+        """Renders the plan as a tree, the way the sqlite3 shell does."""
+        children = {}
+        for node_id, parent, detail in self.plan:
+            children.setdefault(parent, []).append((node_id, detail))
+        lines = ["QUERY PLAN"]
+        def walk(parent, prefix):
+            nodes = children.get(parent, [])
+            for index, (node_id, detail) in enumerate(nodes):
+                last = index == len(nodes) - 1
+                lines.append(f"{prefix}{'`--' if last else '|--'}{detail}")
+                walk(node_id, prefix + ("   " if last else "|  "))
+        walk(0, "")
+        return lines
+
+    def metrics(self):
+        """(label, value, formatted) for each measurement; value is None when not measured."""
+        def ms(value):
+            return f"{value * 1000:.2f} ms"
+        rate = self.rows_per_second
+        return [
+            ("First row", self.first_row, ms(self.first_row) if self.first_row is not None else ""),
+            ("Fetch (all rows)", self.fetch, ms(self.fetch) if self.fetch is not None else ""),
+            ("Render (first page)", self.render, ms(self.render) if self.render is not None else ""),
+            ("Rows", self.rows, f"{self.rows:,}"),
+            ("Rows/sec", rate, f"{rate:,.0f}" if rate is not None else ""),
+            ("VM steps", self.vm_steps, f"~{self.vm_steps:,}"),
+        ]
+
+
+def profile_query(conn, query, params=(), progress=None):
+    """Runs ``query`` to completion and returns a QueryProfile.
+
+    The statement runs inside a savepoint that is rolled back, so profiling an
+    UPDATE or a CREATE leaves the database untouched. VM steps are counted with
+    a progress handler (to the nearest PROFILE_STEPS), statements with a trace
+    callback.
+    """
+    profile = QueryProfile(query)
+    profile.plan = [(row[0], row[1], row[-1]) for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    cancelled = []
+    def count_steps():
+        profile.vm_steps += PROFILE_STEPS
+        if progress is not None:
+            try:
+                progress(None, None, f"{profile.vm_steps:,} VM steps")
+            except JobCancelled:
+                cancelled.append(True)
+                return 1
+        return 0
+
+    outer = conn.in_transaction
+    conn.execute("SAVEPOINT ease_profile")
+    conn.set_trace_callback(profile.trace.append)
+    conn.set_progress_handler(count_steps, PROFILE_STEPS)
+    try:
+        start = time.perf_counter()
+        cursor = conn.execute(query, params)
+        profile.first_row = time.perf_counter() - start
+        if cursor.description:
+            profile.columns = [d[0] for d in cursor.description]
+            while True:
+                batch = cursor.fetchmany(EXPORT_BATCH)
+                if not batch:
+                    break
+                profile.rows += len(batch)
+        else:
+            profile.rows = max(cursor.rowcount, 0)
+        profile.fetch = time.perf_counter() - start
+        cursor.close()
+    finally:
+        conn.set_progress_handler(None, 0)
+        conn.set_trace_callback(None)
+        conn.execute("ROLLBACK TO ease_profile")
+        conn.execute("RELEASE ease_profile")
+        if not outer and conn.in_transaction:
+            conn.rollback()
+    if cancelled:
+        raise JobCancelled()
+    return profile
 
-        item_id = self.tree.identify_row(event.y)
-        column_id = self.tree.identify_column(event.x)
-        if not item_id or not column_id: return
+# =========================================================================
+# 5. Schema Catalog
+# =========================================================================
+Column = namedtuple("Column", "cid name type notnull default pk")
+Index = namedtuple("Index", "name table columns unique origin partial")
+ForeignKey = namedtuple("ForeignKey", "id table from_columns to_table to_columns")
+
+class TableInfo:
+    """Columns, primary key, indexes and foreign keys of one table."""
+    def __init__(self, name, sql, columns, indexes, foreign_keys):
+        self.name = name
+        self.sql = sql or ""
+        self.columns = columns
+        self.indexes = indexes
+        self.foreign_keys = foreign_keys
+        self.without_rowid = bool(re.search(r'\bWITHOUT\s+ROWID\b', self.sql, re.IGNORECASE))
+        self.virtual = self.sql.upper().startswith("CREATE VIRTUAL")
+
+    @property
+    def column_names(self):
+        return [col.name for col in self.columns]
+
+    @property
+    def primary_key(self):
+        """Primary key columns in key order (empty for rowid-only tables)."""
+        return [col for col in sorted(self.columns, key=lambda c: c.pk) if col.pk]
+
+    @property
+    def rowid_alias(self):
+        """Name of the INTEGER PRIMARY KEY column that aliases the rowid, or None."""
+        key = self.primary_key
+        if len(key) == 1 and (key[0].type or "").upper() == "INTEGER" and not self.without_rowid:
+            return key[0].name
+        return None
+
+    def index_for(self, column_name):
+        """Returns the first index whose leading column is ``column_name``, or None."""
+        for index in self.indexes:
+            if index.columns and index.columns[0] == column_name:
+                return index
+        return None
+
+
+class SchemaCatalog:
+    """Snapshot of the database schema, reloaded only when PRAGMA schema_version changes.
+
+    ``refresh()`` costs a single PRAGMA when nothing changed, so it can run after
+    every worker job. Readers on other threads see either the old or the new
+    snapshot, never a half-built one.
+    """
+    def __init__(self):
+        self.version = None
+        self.tables = {}
+        self.views = []
+        self.indexes = {}
+
+    def refresh(self, conn):
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        if version != self.version:
+            self._load(conn)
+            self.version = version
+        return self
+
+    def invalidate(self):
+        self.version = None
+
+    def table_names(self):
+        return list(self.tables)
+
+    def table(self, name):
+        return self.tables.get(name)
+
+    def _load(self, conn):
+        entries = conn.execute(
+            "SELECT type, name, tbl_name, sql FROM sqlite_master "
+            "WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+        ).fetchall()
+        table_sql = {name: sql for kind, name, _, sql in entries if kind == "table"}
+        columns = {name: [] for name in table_sql}
+        indexes = {name: [] for name in table_sql}
+        foreign_keys = {name: [] for name in table_sql}
 
-        col_index = int(column_id.replace('#', '')) - 1
-        col_name = self.tree["columns"][col_index]
+        try:
+            rows = conn.execute(
+                "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+                "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+                "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%' ORDER BY m.rowid, p.cid"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = self._per_table(conn, table_sql, "SELECT ?, * FROM pragma_table_info(?)")
+        for table, *info in rows:
+            columns[table].append(Column(*info))
+
+        index_columns = {}
+        try:
+            for index_name, column in conn.execute(
+                "SELECT il.name, ii.name FROM sqlite_master m "
+                "JOIN pragma_index_list(m.name) il JOIN pragma_index_info(il.name) ii "
+                "WHERE m.type = 'table' ORDER BY il.name, ii.seqno"
+            ):
+                index_columns.setdefault(index_name, []).append(column)
+            index_rows = conn.execute(
+                "SELECT m.name, il.name, il.\"unique\", il.origin, il.partial "
+                "FROM sqlite_master m JOIN pragma_index_list(m.name) il "
+                "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'"
+            ).fetchall()
+            fk_rows = conn.execute(
+                "SELECT m.name, fk.id, fk.\"table\", fk.\"from\", fk.\"to\" "
+                "FROM sqlite_master m JOIN pragma_foreign_key_list(m.name) fk "
+                "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%' ORDER BY m.name, fk.id, fk.seq"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            index_rows = [
+                (table, row[1], row[2], row[3], row[4])
+                for table in table_sql for row in self._safe(conn, "SELECT * FROM pragma_index_list(?)", table)
+            ]
+            for _, index_name, *_ in index_rows:
+                index_columns[index_name] = [row[2] for row in self._safe(conn, "SELECT * FROM pragma_index_info(?)", index_name)]
+            fk_rows = [
+                (table, row[0], row[2], row[3], row[4])
+                for table in table_sql for row in self._safe(conn, "SELECT * FROM pragma_foreign_key_list(?)", table)
+            ]
+
+        all_indexes = {}
+        for table, name, unique, origin, partial in index_rows:
+            index = Index(name, table, tuple(index_columns.get(name, ())), bool(unique), origin, bool(partial))
+            indexes[table].append(index)
+            all_indexes[name] = index
+
+        grouped = {}
+        for table, fk_id, to_table, from_col, to_col in fk_rows:
+            grouped.setdefault((table, fk_id, to_table), []).append((from_col, to_col))
+        for (table, fk_id, to_table), pairs in grouped.items():
+            foreign_keys[table].append(ForeignKey(
+                fk_id, table, tuple(p[0] for p in pairs), to_table, tuple(p[1] for p in pairs)
+            ))
+
+        self.tables = {
+            name: TableInfo(name, sql, columns[name], indexes[name], foreign_keys[name])
+            for name, sql in table_sql.items()
+        }
+        self.views = [name for kind, name, _, _ in entries if kind == "view"]
+        self.indexes = all_indexes
+
+    def _per_table(self, conn, query, tables):
+        rows = []
+        for table in tables:
+            rows.extend(self._safe(conn, query, table, table))
+        return rows
+
+    @staticmethod
+    def _safe(conn, query, *params):
+        """Virtual tables whose module is not loaded cannot be introspected; treat them as empty."""
+        try:
+            return conn.execute(query, params).fetchall()
+        except sqlite3.OperationalError:
+            return []
 
-        bbox = self.tree.bbox(item_id, column_id)
-        if not bbox: return
-        x, y, width, height = bbox
+def create_table(conn, table_name, columns_sql="id INTEGER PRIMARY KEY, name TEXT"):
+    execute_and_commit(conn, f"CREATE TABLE {quote_identifier(table_name)} ({columns_sql})")
+
+
+def rename_table(conn, old_name, new_name):
+    execute_and_commit(conn, f"ALTER TABLE {quote_identifier(old_name)} RENAME TO {quote_identifier(new_name)}")
+
+
+def rename_column(conn, table_name, old_name, new_name):
+    execute_and_commit(conn, f"ALTER TABLE {quote_identifier(table_name)} "
+                             f"RENAME COLUMN {quote_identifier(old_name)} TO {quote_identifier(new_name)}")
+
+
+def add_column(conn, table_name, column_name, column_type=""):
+    execute_and_commit(conn, f"ALTER TABLE {quote_identifier(table_name)} "
+                             f"ADD COLUMN {quote_identifier(column_name)} {column_type}".rstrip())
+
+
+REBUILD_CHUNK = 50000           # rows copied per INSERT ... SELECT while rebuilding a table
+NATIVE_DROP_COLUMN = sqlite3.sqlite_version_info >= (3, 35, 0)
+_DEFINITION_TOKENS = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|--[^\n]*|/\*.*?(?:\*/|$)|[(),]""",
+                                re.DOTALL)
+_NAME = re.compile(r"""\s*("(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|'(?:[^']|'')*'|[^\s(),]+)""")
+_TABLE_CONSTRAINTS = ("CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN")
+_COLUMN_CONSTRAINTS = ("CONSTRAINT", "PRIMARY", "NOT", "NULL", "UNIQUE", "CHECK", "DEFAULT", "COLLATE",
+                       "REFERENCES", "GENERATED", "AS")
+
+def _unquote(name):
+    if name[:1] in "\"'`[":
+        return name[1:-1].replace(name[0] * 2, name[0]) if name[0] != "[" else name[1:-1]
+    return name
+
+def split_definitions(sql):
+    """Splits a CREATE TABLE statement into (head, [column and table constraint definitions], tail)."""
+    depth, start, parts = 0, None, []
+    for token in _DEFINITION_TOKENS.finditer(sql):
+        text = token.group()
+        if text == "(":
+            depth += 1
+            if depth == 1:
+                start = head_end = token.end()
+        elif text == ")":
+            depth -= 1
+            if depth == 0:
+                parts.append(sql[start:token.start()].strip())
+                return sql[:head_end], parts, sql[token.end():]
+        elif text == "," and depth == 1:
+            parts.append(sql[start:token.start()].strip())
+            start = token.end()
+    raise ValueError("Could not parse the table definition")
+
+def mentions_column(sql, column):
+    """True when ``sql`` refers to ``column`` (quoted or bare), outside string literals."""
+    sql = re.sub(r"'(?:[^']|'')*'", "''", sql)
+    pattern = "|".join(re.escape(form) for form in (
+        quote_identifier(column), f"`{column}`", f"[{column}]"
+    )) + rf"|(?<![\w$]){re.escape(column)}(?![\w$])"
+    return re.search(pattern, sql, re.IGNORECASE) is not None
+
+def _retype(definition, new_type):
+    """Replaces the declared type of one column definition, keeping its constraints."""
+    name = _NAME.match(definition)
+    rest, pos = definition[name.end():], 0
+    while True:
+        word = re.match(r"\s*([A-Za-z_]\w*)(\s*\([^)]*\))?", rest[pos:])
+        if not word or word.group(1).upper() in _COLUMN_CONSTRAINTS:
+            break
+        pos += word.end()
+    return f"{name.group(1)} {new_type}".rstrip() + rest[pos:]
+
+def rebuild_table(conn, table_name, drop=(), types=None, chunk=REBUILD_CHUNK, progress=None):
+    """Recreates ``table_name`` without the ``drop`` columns and with ``types`` ({column: type}) applied.
+
+    Follows SQLite's recipe for schema changes ALTER TABLE cannot make: a new
+    table is created from the original definition, rows are copied over in
+    rowid-ranged chunks of ``chunk`` rows (keeping their rowids; declared types
+    convert values through column affinity), then the old table is dropped, the
+    new one renamed, and the indexes and triggers are created again, after the
+    copy. It all happens in one transaction, so the swap is atomic and a
+    cancelled or failed rebuild leaves the table untouched. Returns the names
+    of indexes and triggers that used a dropped column and were not recreated.
+    """
+    drop, types = set(drop), dict(types or {})
+    table = quote_identifier(table_name)
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)).fetchone()
+    if not row:
+        raise ValueError(f"No such table: {table_name}")
+    create_sql = row[0]
+    if create_sql.upper().startswith("CREATE VIRTUAL"):
+        raise ValueError(f"{table_name} is a virtual table; it cannot be rebuilt")
+    info = conn.execute(f"PRAGMA table_xinfo({table})").fetchall()
+    names = [col[1] for col in info]
+    missing = [name for name in list(drop) + list(types) if name not in names]
+    if missing:
+        raise ValueError(f"No such column in {table_name}: {', '.join(missing)}")
+    if len(drop) >= len(names):
+        raise ValueError("A table must keep at least one column")
+
+    head, definitions, tail = split_definitions(create_sql)
+    kept = []
+    for definition in definitions:
+        first = _NAME.match(definition).group(1)
+        if first.upper() in _TABLE_CONSTRAINTS:
+            used = [name for name in drop if mentions_column(definition, name)]
+            if used:
+                raise ValueError(f"Column {used[0]} is used by a table constraint: {definition}")
+            kept.append(definition)
+            continue
+        name = _unquote(first)
+        if name in drop:
+            continue
+        kept.append(_retype(definition, types[name]) if name in types else definition)
+
+    # Generated columns (hidden 2 and 3) are computed again; they cannot be inserted into.
+    copied = [quote_identifier(col[1]) for col in info if col[1] not in drop and col[6] not in (2, 3)]
+    without_rowid = bool(re.search(r'\bWITHOUT\s+ROWID\b', tail, re.IGNORECASE))
+    objects = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master "
+        "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL ORDER BY rowid", (table_name,)
+    ).fetchall()
+    skipped = [name for _, name, sql in objects if any(mentions_column(sql, column) for column in drop)]
+
+    temp_name = f"ease_rebuild_{table_name}"
+    temp = quote_identifier(temp_name)
+    head = re.sub(r"^(\s*CREATE\s+TABLE\s+)(?:IF\s+NOT\s+EXISTS\s+)?.*?\s*\($", lambda m: f"{m.group(1)}{temp} (",
+                  head, flags=re.IGNORECASE | re.DOTALL)
+
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    legacy = conn.execute("PRAGMA legacy_alter_table").fetchone()[0]
+    if conn.in_transaction:
+        conn.commit()  # foreign_keys cannot be changed inside a transaction
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys = OFF")
+    # Keeps RENAME from re-checking views and triggers elsewhere against the new columns.
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DROP TABLE IF EXISTS {temp}")
+            conn.execute(head + ", ".join(kept) + ")" + tail)
+            columns = ", ".join(copied)
+            total = conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            if without_rowid:
+                if progress: progress(0, total, f"Copying {total:,} rows")
+                conn.execute(f"INSERT INTO {temp} ({columns}) SELECT {columns} FROM {table}")
+            else:
+                insert = f"INSERT INTO {temp} (rowid, {columns}) SELECT rowid, {columns} FROM {table}"
+                low, done = None, 0
+                while True:
+                    if progress: progress(done, total, f"{done:,} of {total:,} rows copied")
+                    after = "" if low is None else " WHERE rowid > ?"
+                    params = () if low is None else (low,)
+                    high = conn.execute(f"SELECT rowid FROM {table}{after} ORDER BY rowid LIMIT 1 OFFSET ?",
+                                        params + (chunk - 1,)).fetchone()
+                    if high is None:
+                        conn.execute(insert + after, params)
+                        break
+                    bounds = ("rowid <= ?" if low is None else "rowid > ? AND rowid <= ?")
+                    conn.execute(f"{insert} WHERE {bounds}", params + (high[0],))
+                    low, done = high[0], done + chunk
+            if progress: progress(total, total, "Swapping tables")
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {temp} RENAME TO {table}")
+            if progress: progress(total, total, "Recreating indexes and triggers")
+            for _, name, sql in objects:
+                if name not in skipped:
+                    conn.execute(sql)
+            if foreign_keys:
+                violation = conn.execute(f"PRAGMA foreign_key_check({table})").fetchone()
+                if violation:
+                    raise ValueError(f"The rebuilt table violates a foreign key to {violation[2]}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        conn.execute(f"PRAGMA legacy_alter_table = {legacy}")
+        if foreign_keys:
+            conn.execute("PRAGMA foreign_keys = ON")
+    return skipped
+
+def drop_column(conn, table_name, column, progress=None):
+    """Drops a column, natively when SQLite supports it for this column, otherwise by rebuilding the table.
+
+    ALTER TABLE ... DROP COLUMN (SQLite 3.35+) refuses key, unique and indexed
+    columns and those used by constraints, views or triggers; those fall back to
+    ``rebuild_table``. Returns the indexes and triggers that were dropped with it.
+    """
+    if NATIVE_DROP_COLUMN:
+        try:
+            execute_and_commit(conn, f"ALTER TABLE {quote_identifier(table_name)} DROP COLUMN {quote_identifier(column)}")
+            return []
+        except sqlite3.OperationalError as e:
+            if "interrupt" in str(e):
+                raise
+    return rebuild_table(conn, table_name, drop=[column], progress=progress)
 
-        current_values = self.tree.item(item_id, 'values')
-        old_value = current_values[col_index]
+def change_column_type(conn, table_name, column, new_type, progress=None):
+    """Changes a column's declared type by rebuilding the table; stored values convert through the new affinity."""
+    if not re.fullmatch(r"[A-Za-z_][\w ]*(\(\s*[+-]?\d+\s*(,\s*[+-]?\d+\s*)?\))?", new_type.strip()):
+        raise ValueError(f"Invalid column type: {new_type!r}")
+    return rebuild_table(conn, table_name, types={column: new_type.strip()}, progress=progress)
 
-        pk_cursor = self.conn.execute(f"PRAGMA table_info({self.selected_table.get()});")
-        pk_info = [info for info in pk_cursor.fetchall() if info[5] == 1]
-        
-        if not pk_info:
-             messagebox.showerror("Error", "Cannot edit cell. Table must have a Primary Key.")
-             return
+# =========================================================================
+# 6. Index Advisor
+# =========================================================================
+MAX_COVERING_COLUMNS = 6
+
+Suggestion = namedtuple("Suggestion", "table columns covering sql queries rows_avoided plans")
+
+_CLAUSE_WORDS = ("WHERE", "JOIN", "ON", "USING", "INNER", "LEFT", "RIGHT", "FULL", "CROSS", "NATURAL", "OUTER",
+                 "GROUP", "ORDER", "LIMIT", "WINDOW", "UNION", "EXCEPT", "INTERSECT", "HAVING", "INDEXED", "NOT")
+
+
+def _table_aliases(query, tables):
+    """Maps the names a query uses for its tables (aliases included) to the table names."""
+    aliases = {}
+    pattern = r'\b(?:FROM|JOIN)\s+"?(\w+)"?(?:\s+(?:AS\s+)?"?(\w+)"?)?'
+    for match in re.finditer(pattern, query, re.IGNORECASE):
+        table, alias = match.group(1), match.group(2)
+        if table not in tables:
+            continue
+        aliases[table] = table
+        if alias and alias.upper() not in _CLAUSE_WORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _column_usage(query, alias, columns):
+    """Finds how ``query`` uses the columns of the table known as ``alias``.
+
+    A lightweight textual scan, not a parser: returns (equality columns, range
+    columns, ORDER/GROUP BY columns, every referenced column), each in order of
+    first appearance.
+    """
+    names = "|".join(re.escape(c) for c in sorted(columns, key=len, reverse=True))
+    ref = rf'(?:(?<![\w."]){re.escape(alias)}\s*\.\s*|(?<![\w."]))"?\b({names})\b"?(?!\s*\()'
+    qualified = rf'(?:(?<![\w."]){re.escape(alias)}\s*\.\s*)"?\b({names})\b"?'
+
+    def found(pattern, text):
+        result = []
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            column = next(c for c in columns if c.lower() == match.group(1).lower())
+            if column not in result:
+                result.append(column)
+        return result
+
+    equality = found(rf'{ref}\s*(?:==?|\bIN\b|\bIS\b(?!\s+NOT))', query) + \
+        found(rf'(?<![<>!])==?\s*{qualified}', query)
+    ranges = found(rf'{ref}\s*(?:[<>]=?|\bBETWEEN\b|\bLIKE\b|\bGLOB\b)', query) + \
+        found(rf'[<>]=?\s*{qualified}', query)
+    ordering = []
+    for clause in re.finditer(r'\b(?:ORDER|GROUP)\s+BY\s+(.*?)(?=\bLIMIT\b|\bHAVING\b|\bORDER\b|$)', query, re.IGNORECASE | re.DOTALL):
+        ordering += found(ref, clause.group(1))
+    referenced = found(ref, query)
+    dedup = lambda items: list(dict.fromkeys(items))
+    return dedup(equality), dedup(c for c in ranges if c not in equality), dedup(ordering), referenced
+
+
+def propose_index(query, alias, table_info):
+    """Returns (columns, covering) for an index that would turn a scan of ``alias`` into a search, or None."""
+    columns = table_info.column_names
+    if not columns:
+        return None
+    equality, ranges, ordering, referenced = _column_usage(query, alias, columns)
+    rowid_alias = table_info.rowid_alias
+    if rowid_alias:
+        # Already a rowid lookup, and stored in every index anyway.
+        equality = [c for c in equality if c != rowid_alias]
+        referenced = [c for c in referenced if c != rowid_alias]
+    key = equality + ranges[:1]
+    if not ranges:
+        key += [c for c in ordering if c not in key]
+    if not key:
+        return None
+    select_star = re.search(rf'\bSELECT\s+(?:DISTINCT\s+)?(?:[^;]*?,\s*)?(?:{re.escape(alias)}\s*\.\s*)?\*', query, re.IGNORECASE)
+    extra = [c for c in referenced if c not in key]
+    if not select_star and extra and len(key) + len(extra) <= MAX_COVERING_COLUMNS:
+        return tuple(key + extra), True
+    return tuple(key), not select_star and not extra
+
+
+def query_plan(conn, query):
+    return [(row[0], row[1], row[-1]) for row in conn.execute(f"EXPLAIN QUERY PLAN {query}")]
+
+
+def _scans(plan):
+    """The table names (or aliases) read with a full scan in an EXPLAIN QUERY PLAN."""
+    return [m.group(1) for m in (re.match(r'SCAN (?:TABLE )?(\w+)', detail) for _, _, detail in plan) if m]
+
+
+def scratch_schema(conn):
+    """An empty in-memory database with the schema (and planner statistics) of ``conn``."""
+    scratch = sqlite3.connect(":memory:")
+    entries = conn.execute(
+        "SELECT type, sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+        "AND type IN ('table', 'index', 'view') ORDER BY type = 'table' DESC, type = 'index' DESC, rowid"
+    ).fetchall()
+    for _, sql in entries:
+        try:
+            scratch.execute(sql)
+        except sqlite3.Error:
+            pass  # e.g. a virtual table whose module is not loaded here
+    try:
+        stats = conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1").fetchall()
+    except sqlite3.OperationalError:
+        stats = []
+    if stats:
+        scratch.execute("ANALYZE")
+        scratch.executemany("INSERT INTO sqlite_stat1 VALUES (?, ?, ?)", stats)
+        scratch.execute("ANALYZE sqlite_master")  # makes the planner reload the statistics
+    scratch.commit()
+    return scratch
+
+
+def estimate_rows(conn, table):
+    """A cheap row estimate: ANALYZE statistics if present, else max(rowid)."""
+    try:
+        row = conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table,)).fetchone()
+        if row and row[0]:
+            return int(row[0].split()[0])
+    except (sqlite3.OperationalError, ValueError):
+        pass
+    try:
+        return conn.execute(f"SELECT max(rowid) FROM {quote_identifier(table)}").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return None
+
+
+def index_sql(table, columns, name=None, unique=False):
+    name = name or "idx_" + "_".join(re.sub(r'\W', '', part) for part in (table,) + tuple(columns))
+    return (f"CREATE {'UNIQUE ' if unique else ''}INDEX {quote_identifier(name)} ON {quote_identifier(table)} "
+            f"({', '.join(quote_identifier(c) for c in columns)})")
+
+
+def advise_indexes(conn, queries, catalog, progress=None):
+    """Proposes indexes for the queries in a workload, best first.
+
+    Queries whose plan scans a table or sorts through a temp b-tree get one
+    candidate index per table they filter, join or sort on. Each candidate is
+    created in a scratch copy of the schema and the queries are planned again;
+    a candidate is kept when the planner uses it and the plan reads fewer rows
+    through full scans (estimated from table sizes) or needs fewer sorts.
+    """
+    catalog.refresh(conn)
+    scratch = scratch_schema(conn)
+    rows = {}
+    def rows_of(table):
+        if table is None:
+            return 0  # a subquery or CTE, not a table
+        if table not in rows:
+            rows[table] = estimate_rows(conn, table) or 0
+        return rows[table]
+    def cost(plan, aliases):
+        scanned = sum(rows_of(aliases.get(alias)) for alias in _scans(plan))
+        sorts = sum("USE TEMP B-TREE" in detail for _, _, detail in plan)
+        return scanned, sorts
+
+    try:
+        candidates = {}
+        plans = {}
+        for number, query in enumerate(queries):
+            if progress:
+                progress(number, 2 * len(queries), "Reading query plans")
+            try:
+                plan = query_plan(scratch, query)
+            except sqlite3.Error:
+                continue  # not plannable here (e.g. refers to a temp table); skip it
+            aliases = _table_aliases(query, catalog.tables)
+            plans[query] = (plan, aliases, cost(plan, aliases))
+            if plans[query][2] == (0, 0):
+                continue
+            for alias, table in aliases.items():
+                info = catalog.table(table)
+                if info is None or info.virtual:
+                    continue
+                proposal = propose_index(query, alias, info)
+                if proposal:
+                    # One candidate per index: it covers if any query it was proposed for is covered by it.
+                    columns, covering = proposal
+                    entry = candidates.setdefault((table, columns), [False, []])
+                    entry[0] = entry[0] or covering
+                    entry[1].append(query)
+
+        suggestions = []
+        for number, ((table, columns), (covering, wanted_by)) in enumerate(candidates.items()):
+            if progress:
+                progress(len(queries) + number * len(queries) // len(candidates), 2 * len(queries), "Trying hypothetical indexes")
+            name = "ease_advisor_candidate"
+            try:
+                scratch.execute(index_sql(table, columns, name))
+            except sqlite3.Error:
+                continue
+            helped, avoided, changes = [], 0, {}
+            for query in dict.fromkeys(wanted_by):
+                before, aliases, (scanned, sorts) = plans[query]
+                after = query_plan(scratch, query)
+                new_scanned, new_sorts = cost(after, aliases)
+                if any(name in detail for _, _, detail in after) and (new_scanned, new_sorts) < (scanned, sorts) \
+                        and new_scanned <= scanned and new_sorts <= sorts:
+                    helped.append(query)
+                    avoided += scanned - new_scanned
+                    changes[query] = (before, after)
+            scratch.execute(f"DROP INDEX {name}")
+            if helped:
+                suggestions.append(Suggestion(table, columns, covering, index_sql(table, columns), helped, avoided, changes))
+        suggestions.sort(key=lambda s: (-s.rows_avoided, -len(s.queries), len(s.columns)))
+        return suggestions
+    finally:
+        scratch.close()
+
+
+def run_analyze(conn, table=None, progress=None):
+    """ANALYZE one table, or all of them (one at a time when ``progress`` is given)."""
+    if table or progress is None:
+        conn.execute(f"ANALYZE {quote_identifier(table)}" if table else "ANALYZE")
+    else:
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        for done, name in enumerate(tables):
+            progress(done, len(tables), f"Analyzing {name}")
+            conn.execute(f"ANALYZE {quote_identifier(name)}")
+        progress(len(tables), len(tables), "Analyzed")
+    conn.commit()
 
-        pk_name = pk_info[0][1]
-        pk_index = pk_info[0][0]
-        pk_value = current_values[pk_index]
+# =========================================================================
+# 7. Edit Session
+# =========================================================================
+class Change:
+    """One pending edit.
+
+    Saved rows are addressed by ``pk_name = key``; rows inserted in this session
+    (not in the database yet) are addressed by ``insert_id`` instead.
+    """
+    def __init__(self, kind, table, pk_name=None, key=None, column=None, old=None, new=None,
+                 values=None, columns=None, insert_id=None):
+        self.kind = kind
+        self.table = table
+        self.pk_name = pk_name
+        self.key = key
+        self.column = column
+        self.old = old
+        self.new = new
+        self.values = values
+        self.columns = columns
+        self.insert_id = insert_id
+        self.group = None
+
+    def __repr__(self):
+        return f"Change({self.kind!r}, {self.table!r}, key={self.key!r}, insert_id={self.insert_id!r})"
+
+
+class EditSession:
+    """In-memory log of cell edits, inserts and deletes, applied in one transaction on save.
+
+    ``changes`` is the undo stack. Changes recorded together (e.g. deleting a
+    multi-row selection) share a group and are undone and redone as one step.
+    ``statements()`` folds the log into ``(sql, [params])`` batches for
+    ``apply_statements``; consecutive changes that share a statement become a
+    single ``executemany``.
+    """
+    def __init__(self):
+        self.changes = []
+        self._redo = []
+        self._next_insert = 0
+        self._next_group = 0
+        self._states = None
+
+    def __len__(self):
+        return len(self.changes)
+
+    def record(self, *changes):
+        self._next_group += 1
+        for change in changes:
+            change.group = self._next_group
+        self.changes.extend(changes)
+        self._redo.clear()
+        self._states = None
+        return changes
+
+    def update(self, table, pk_name, key, column, old, new, insert_id=None):
+        return self.record(Change("update", table, pk_name, key, column, old, new, insert_id=insert_id))[0]
+
+    def delete(self, table, pk_name, key, values=None, insert_id=None):
+        return self.record(Change("delete", table, pk_name, key, values=values, insert_id=insert_id))[0]
+
+    def delete_many(self, table, rows):
+        """Records one undo step deleting ``rows``: (pk_name, key, insert_id) tuples."""
+        return self.record(*[
+            Change("delete", table, pk_name, key, insert_id=insert_id) for pk_name, key, insert_id in rows
+        ])
+
+    def insert(self, table, columns, count=1):
+        changes = []
+        for _ in range(count):
+            self._next_insert += 1
+            changes.append(Change("insert", table, values=(None,) * len(columns), columns=list(columns),
+                                  insert_id=f"new-{self._next_insert}"))
+        return self.record(*changes)
+
+    def undo(self):
+        """Moves the last group of changes to the redo stack and returns it."""
+        if not self.changes:
+            return []
+        group = self.changes[-1].group
+        undone = []
+        while self.changes and self.changes[-1].group == group:
+            undone.append(self.changes.pop())
+        self._redo.append(undone[::-1])
+        self._states = None
+        return undone
+
+    def redo(self):
+        if not self._redo:
+            return []
+        changes = self._redo.pop()
+        self.changes.extend(changes)
+        self._states = None
+        return changes
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def mark_saved(self, count):
+        """Drops the first ``count`` changes once they are committed."""
+        del self.changes[:count]
+        self._redo.clear()
+        self._states = None
+
+    def discard(self):
+        self.changes.clear()
+        self._redo.clear()
+        self._states = None
+
+    def row_state(self, table, pk_name, key):
+        """Returns (state, {column: new value}) for a saved row; state is 'deleted', 'edited' or None."""
+        if self._states is None:
+            states = {}
+            for change in self.changes:
+                if change.insert_id is not None or change.kind == "insert":
+                    continue
+                state, edits = states.setdefault((change.table, change.pk_name, change.key), [None, {}])
+                if change.kind == "delete":
+                    states[(change.table, change.pk_name, change.key)][0] = "deleted"
+                elif state != "deleted":
+                    edits[change.column] = change.new
+                    states[(change.table, change.pk_name, change.key)][0] = "edited"
+            self._states = states
+        state, edits = self._states.get((table, pk_name, key), (None, {}))
+        return state, edits
+
+    def pending_inserts(self, table=None):
+        """Returns {insert_id: (columns, values)} for rows inserted (and not deleted) in this session."""
+        rows = {}
+        for change in self.changes:
+            if table is not None and change.table != table:
+                continue
+            if change.kind == "insert":
+                rows[change.insert_id] = (change.columns, list(change.values))
+            elif change.insert_id in rows:
+                if change.kind == "delete":
+                    del rows[change.insert_id]
+                elif change.kind == "update":
+                    columns, values = rows[change.insert_id]
+                    values[columns.index(change.column)] = change.new
+        return rows
+
+    def statements(self):
+        inserts = self.pending_inserts()
+        batches = []
+        for change in self.changes:
+            table = quote_identifier(change.table)
+            if change.insert_id is not None:
+                if change.kind != "insert" or change.insert_id not in inserts:
+                    continue  # folded into the insert, or inserted and deleted again
+                columns, values = inserts[change.insert_id]
+                sql = f"INSERT INTO {table} ({', '.join(map(quote_identifier, columns))}) VALUES ({', '.join('?' * len(columns))})"
+                params = tuple(values)
+            elif change.kind == "update":
+                sql = f"UPDATE {table} SET {quote_identifier(change.column)} = ? WHERE {quote_identifier(change.pk_name)} = ?"
+                params = (change.new, change.key)
+            elif change.kind == "delete":
+                sql = f"DELETE FROM {table} WHERE {quote_identifier(change.pk_name)} = ?"
+                params = (change.key,)
+            else:
+                continue
+            if batches and batches[-1][0] == sql:
+                batches[-1][1].append(params)
+            else:
+                batches.append((sql, [params]))
+        return batches
+
+
+def apply_statements(conn, statements):
+    """Runs ``(sql, [params])`` batches with executemany inside one transaction. Returns rows affected."""
+    affected = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for sql, params in statements:
+            affected += max(0, conn.executemany(sql, params).rowcount)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return affected
+
+def apply_changes(conn, statements, watch_table=None):
+    """Applies statements like ``apply_statements``; returns the rows they added to ``watch_table``
+    as (rowid, *values), so a grid showing that table can be patched without re-querying it."""
+    if not watch_table:
+        apply_statements(conn, statements)
+        return []
+    table = quote_identifier(watch_table)
+    before = conn.execute(f"SELECT max(rowid) FROM {table}").fetchone()[0]
+    apply_statements(conn, statements)
+    return conn.execute(f"SELECT rowid, * FROM {table} WHERE rowid > ? ORDER BY rowid", (before or 0,)).fetchall()
+
+
+BLOB_CHUNK = 1 << 20        # bytes per read/write when streaming a value to or from a file
+
+def _value_rowid(conn, table, key, key_column):
+    """The rowid of the row whose ``key_column`` is ``key`` (rows of a table browse are keyed by rowid)."""
+    if key_column == "rowid":
+        return key
+    row = conn.execute(f"SELECT rowid FROM {quote_identifier(table)} WHERE {quote_identifier(key_column)} = ?",
+                       (key,)).fetchone()
+    if row is None:
+        raise ValueError("The row no longer exists")
+    return row[0]
+
+def value_info(conn, table, column, key, key_column="rowid"):
+    """Returns (storage class, length) of one stored value; ``length()`` does not read a BLOB's content."""
+    rowid = _value_rowid(conn, table, key, key_column)
+    row = conn.execute(f"SELECT typeof({quote_identifier(column)}), length({quote_identifier(column)}) "
+                       f"FROM {quote_identifier(table)} WHERE rowid = ?", (rowid,)).fetchone()
+    if row is None:
+        raise ValueError("The row no longer exists")
+    return row
+
+def read_value(conn, table, column, key, key_column="rowid", limit=None):
+    """Reads one value, or only its first ``limit`` characters (bytes for a BLOB)."""
+    rowid = _value_rowid(conn, table, key, key_column)
+    expr = quote_identifier(column) if limit is None else f"substr({quote_identifier(column)}, 1, ?)"
+    row = conn.execute(f"SELECT {expr} FROM {quote_identifier(table)} WHERE rowid = ?",
+                       (rowid,) if limit is None else (limit, rowid)).fetchone()
+    if row is None:
+        raise ValueError("The row no longer exists")
+    return row[0]
+
+def export_value(conn, table, column, key, path, key_column="rowid", progress=None):
+    """Writes one TEXT or BLOB value to ``path`` in ``BLOB_CHUNK`` pieces through ``Connection.blobopen``.
+
+    TEXT is written in the database encoding. Without blobopen (Python < 3.11)
+    the value is read in one piece. Returns the number of bytes written.
+    """
+    rowid = _value_rowid(conn, table, key, key_column)
+    kind, _ = value_info(conn, table, column, rowid)
+    done = 0
+    with open(path, "wb") as out:
+        if kind in ("blob", "text") and hasattr(conn, "blobopen"):
+            with conn.blobopen(table, column, rowid, readonly=True) as blob:
+                total = len(blob)
+                while True:
+                    if progress: progress(done, total, f"{done:,} of {total:,} bytes")
+                    chunk = blob.read(BLOB_CHUNK)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    done += len(chunk)
+        else:
+            value = read_value(conn, table, column, rowid)
+            data = value if isinstance(value, bytes) else b"" if value is None else str(value).encode("utf-8")
+            out.write(data)
+            done = len(data)
+    return done
+
+def import_value(conn, table, column, key, path, key_column="rowid", progress=None):
+    """Replaces one value with the contents of ``path``, stored as a BLOB, in one transaction.
+
+    The row is first given a ``zeroblob()`` of the file's size, which is then
+    filled through ``Connection.blobopen`` in ``BLOB_CHUNK`` pieces, so the
+    file is never held in memory. Without blobopen (Python < 3.11) the file is
+    read in one piece. Returns the number of bytes stored.
+    """
+    rowid = _value_rowid(conn, table, key, key_column)
+    total = os.path.getsize(path)
+    update = f"UPDATE {quote_identifier(table)} SET {quote_identifier(column)} = ? WHERE rowid = ?"
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        with open(path, "rb") as f:
+            if hasattr(conn, "blobopen"):
+                if conn.execute(update.replace("= ?", "= zeroblob(?)", 1), (total, rowid)).rowcount != 1:
+                    raise ValueError("The row no longer exists")
+                done = 0
+                with conn.blobopen(table, column, rowid) as blob:
+                    while True:
+                        if progress: progress(done, total, f"{done:,} of {total:,} bytes")
+                        chunk = f.read(BLOB_CHUNK)
+                        if not chunk:
+                            break
+                        blob.write(chunk)
+                        done += len(chunk)
+            elif conn.execute(update, (f.read(), rowid)).rowcount != 1:
+                raise ValueError("The row no longer exists")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return total
 
-        entry = ttk.Entry(self.tree, justify='left', width=width)
-        entry.insert(0, old_value)
-        entry.focus()
-        entry.select_range(0, tk.END)
+# =========================================================================
+# 8. Export Engine
+# =========================================================================
+EXPORT_FORMATS = {"sql": ".sql", "csv": ".csv", "jsonl": ".jsonl"}
+EXPORT_BATCH = 5000         # rows per fetchmany() call
+EXPORT_BUFFER = 1 << 20     # bytes of write buffering per output file
+EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sqlite_uri(path, **params):
+    """Builds a ``file:`` URI for ``path`` with the given query parameters (e.g. mode='ro')."""
+    from pathlib import Path  # imported here to keep CLI startup fast
+    uri = Path(os.path.abspath(path)).as_uri()
+    if params:
+        uri += "?" + "&".join(f"{key}={value}" for key, value in params.items())
+    return uri
+
+
+def database_path(conn):
+    """Returns the file behind the main schema of ``conn``, or None for in-memory databases."""
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return path or None
+    return None
+
+
+def sql_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "X'" + bytes(value).hex() + "'"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, float) and value != value:
+        return "NULL"
+    return repr(value)
+
+
+def _json_value(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return value
+
+
+def open_export_file(path, compress=False):
+    """Opens a text output file with a large write buffer, gzip-compressed if asked."""
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    return open(path, "w", encoding="utf-8", newline="", buffering=EXPORT_BUFFER)
+
+
+def write_rows(out, fmt, name, columns, cursor, on_rows=None, stop=None, preformatted=False):
+    """Streams ``cursor`` into ``out`` in EXPORT_BATCH-row chunks. Returns the number of rows written.
+
+    With ``preformatted=True`` each row is a single, already rendered output line
+    (see ``_table_select``), so no per-value work is left for Python.
+    """
+    if preformatted:
+        def emit(rows):
+            out.write("\n".join([row[0] for row in rows]))
+            out.write("\n")
+    elif fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        emit = writer.writerows
+    elif fmt == "jsonl":
+        dumps = json.dumps
+        def emit(rows):
+            out.write("".join(dumps(dict(zip(columns, map(_json_value, row)))) + "\n" for row in rows))
+    elif fmt == "sql":
+        prefix = f"INSERT INTO {quote_identifier(name)} VALUES("
+        def emit(rows):
+            out.write("".join(prefix + ",".join(map(sql_literal, row)) + ");\n" for row in rows))
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    written = 0
+    while True:
+        if stop is not None and stop.is_set():
+            raise JobCancelled()
+        rows = cursor.fetchmany(EXPORT_BATCH)
+        if not rows:
+            return written
+        emit(rows)
+        written += len(rows)
+        if on_rows:
+            on_rows(written)
+
+
+def _export_objects(conn, tables=None):
+    """Splits sqlite_master into exportable tables and the objects created after the data."""
+    entries = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE sql NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+    ).fetchall()
+    virtual = [name for kind, name, sql in entries if kind == "table" and sql.upper().startswith("CREATE VIRTUAL")]
+    table_entries = [
+        (name, sql) for kind, name, sql in entries
+        if kind == "table"
+        and not any(name.startswith(vt + "_") for vt in virtual)   # shadow tables of virtual tables
+        and (tables is None or name in tables)
+    ]
+    exported = {name for name, _ in table_entries}
+    late = [sql for kind, name, sql in entries if kind != "table" and (kind == "view" or tables is None or
+            conn.execute("SELECT tbl_name FROM sqlite_master WHERE name = ?", (name,)).fetchone()[0] in exported)]
+    return table_entries, late
+
+
+def _has_json1(conn):
+    try:
+        conn.execute("SELECT json_object('a', 1)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _table_select(conn, fmt, name, columns):
+    """Returns (query, preformatted). SQL and JSON rows are rendered by SQLite itself."""
+    table = quote_identifier(name)
+    if fmt == "sql" and columns:
+        values = " || ',' || ".join(f"quote({quote_identifier(col)})" for col in columns)
+        prefix = sql_literal(f"INSERT INTO {table} VALUES(")
+        return f"SELECT {prefix} || {values} || ');' FROM {table}", True
+    if fmt == "jsonl" and columns and _has_json1(conn):
+        pairs = ", ".join(
+            f"{sql_literal(col)}, CASE WHEN typeof({quote_identifier(col)}) = 'blob' "
+            f"THEN lower(hex({quote_identifier(col)})) ELSE {quote_identifier(col)} END"
+            for col in columns
+        )
+        return f"SELECT json_object({pairs}) FROM {table}", True
+    return f"SELECT * FROM {table}", False
+
+
+def _snapshot_readers(conn, db_path, count):
+    """Opens ``count`` read-only connections whose read transactions all see the same committed state.
+
+    ``conn`` holds a RESERVED lock (BEGIN IMMEDIATE) while the readers start
+    their transactions, so no other connection can commit in between. Once
+    they have, writers go on in WAL mode (the readers keep their snapshot) or
+    wait for the export with a rollback journal. Returns None when ``conn``
+    cannot take the lock (read-only, already in a transaction, or busy).
+    """
+    if conn.in_transaction:
+        return None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+    except sqlite3.OperationalError:
+        return None
+    readers = []
+    try:
+        for _ in range(count):
+            reader = sqlite3.connect(sqlite_uri(db_path, mode="ro"), uri=True, check_same_thread=False,
+                                     isolation_level=None)
+            readers.append(reader)
+            reader.execute("BEGIN")
+            reader.execute("SELECT count(*) FROM sqlite_master").fetchone()  # starts the read transaction
+    except BaseException:
+        for reader in readers:
+            reader.close()
+        raise
+    finally:
+        conn.rollback()
+    return readers
+
+
+def _export_table(readers, name, create_sql, path, fmt, compress, on_rows, stop):
+    conn = readers.get()
+    try:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(name)})")]
+        query, preformatted = _table_select(conn, fmt, name, columns)
+        cursor = conn.execute(query)
+        with open_export_file(path, compress) as out:
+            if fmt == "sql":
+                out.write(f"{create_sql};\n")
+            return write_rows(out, fmt, name, columns, cursor, on_rows, stop, preformatted)
+    finally:
+        readers.put(conn)
+
+
+def export_database(conn, target, fmt="sql", tables=None, compress=False, workers=EXPORT_WORKERS, progress=None):
+    """Exports whole tables from one consistent snapshot of the database.
+
+    For a database file, up to ``workers`` read-only connections read tables in
+    parallel, all inside read transactions started at the same commit (see
+    ``_snapshot_readers``); otherwise, or when that lock cannot be taken, the
+    tables are read one after another inside a single read transaction on
+    ``conn``. Either way a concurrent writer cannot make tables disagree.
+
+    ``fmt='sql'`` writes a single dump file at ``target``: every table is dumped in
+    parallel to a part file which is then concatenated between the schema header
+    and the index/trigger/view footer (gzip members concatenate cleanly). CSV and
+    JSON Lines write one ``<table>.<ext>[.gz]`` file per table into the ``target``
+    directory. ``progress`` receives (finished tables, table count, summary).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    db_path = database_path(conn)
+    readers = _snapshot_readers(conn, db_path, max(1, workers)) if db_path else None
+    own_transaction = False
+    if readers is None:
+        # In-memory databases can only be read through their own connection; one transaction keeps it consistent.
+        readers, workers = [conn], 1
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+            own_transaction = True
+    idle = queue.Queue()   # connections not reading a table right now
+    for reader in readers:
+        idle.put(reader)
+    try:
+        return _export_snapshot(readers[0], idle, target, fmt, tables, compress, workers, progress)
+    finally:
+        if own_transaction:
+            conn.rollback()
+        for reader in readers:
+            if reader is not conn:
+                reader.close()
+
+
+def _export_snapshot(conn, readers, target, fmt, tables, compress, workers, progress):
+    """The body of ``export_database``: ``conn`` reads the schema, and each table takes a connection from ``readers``."""
+    table_entries, late = _export_objects(conn, tables)
+    suffix = EXPORT_FORMATS[fmt] + (".gz" if compress else "")
+
+    if fmt == "sql":
+        outputs = [f"{target}.part{i}" for i in range(len(table_entries))]
+    else:
+        os.makedirs(target, exist_ok=True)
+        outputs = [os.path.join(target, re.sub(r'[^\w.-]', '_', name) + suffix) for name, _ in table_entries]
+
+    rows_done = {name: 0 for name, _ in table_entries}
+    stop = threading.Event()
+    try:
+        # imported here to keep CLI startup fast
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [
+                pool.submit(_export_table, readers, name, sql, path, fmt, compress,
+                            lambda n, name=name: rows_done.__setitem__(name, n), stop)
+                for (name, sql), path in zip(table_entries, outputs)
+            ]
+            pending = set(futures)
+            while True:
+                finished = len(futures) - len(pending)
+                if progress:
+                    active = [
+                        f"{name}: {rows_done[name]:,}"
+                        for (name, _), future in zip(table_entries, futures)
+                        if future.running()
+                    ]
+                    summary = f"{finished}/{len(futures)} tables, {sum(rows_done.values()):,} rows"
+                    try:
+                        progress(finished, len(futures) or 1, "; ".join([summary] + active))
+                    except BaseException:
+                        stop.set()
+                        raise
+                if not pending:
+                    break
+                # Wakes up for each finished table and at least every REPORT_INTERVAL for progress.
+                _, pending = wait(pending, timeout=REPORT_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in futures:
+                future.result()
+
+        if fmt == "sql":
+            with open_export_file(target + ".head", compress) as out:
+                out.write("PRAGMA foreign_keys=OFF;\nBEGIN TRANSACTION;\n")
+            with open_export_file(target + ".tail", compress) as out:
+                if tables is None and conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'"
+                ).fetchone():
+                    out.write("DELETE FROM sqlite_sequence;\n")
+                    query, _ = _table_select(conn, "sql", "sqlite_sequence", ["name", "seq"])
+                    write_rows(out, "sql", "sqlite_sequence", None, conn.execute(query), preformatted=True)
+                out.writelines(f"{sql};\n" for sql in late)
+                out.write("COMMIT;\n")
+            with open(target, "wb") as dump:
+                for part in [target + ".head"] + outputs + [target + ".tail"]:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, dump, EXPORT_BUFFER)
+    except BaseException:
+        if fmt != "sql":
+            for path in outputs:
+                try: os.remove(path)
+                except OSError: pass
+        raise
+    finally:
+        if fmt == "sql":
+            for part in outputs + [target + ".head", target + ".tail"]:
+                try: os.remove(part)
+                except OSError: pass
+    return dict(rows_done)
+
+
+def export_query(conn, query, target, fmt="csv", compress=False, name="query_result", progress=None):
+    """Streams the result of one SELECT into a single file."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    cursor = conn.execute(query)
+    if cursor.description is None:
+        raise ValueError("The query does not return rows.")
+    columns = [desc[0] for desc in cursor.description]
+    on_rows = (lambda n: progress(n, None, f"{n:,} rows written")) if progress else None
+    try:
+        with open_export_file(target, compress) as out:
+            if fmt == "sql":
+                out.write(f"CREATE TABLE {quote_identifier(name)}({', '.join(map(quote_identifier, columns))});\n")
+            return write_rows(out, fmt, name, columns, cursor, on_rows)
+    except BaseException:
+        try: os.remove(target)
+        except OSError: pass
+        raise
 
-        def save_edit(event=None):
-            new_value = entry.get()
-            if new_value != str(old_value):
-                try:
-                    query = f"UPDATE {self.selected_table.get()} SET {col_name} = ? WHERE {pk_name} = ?;"
-                    self.conn.execute(query, (new_value, pk_value))
-                    self.conn.commit()
-                    
-                    new_values_list = list(current_values)
-                    new_values_list[col_index] = new_value
-                    self.tree.item(item_id, values=new_values_list)
-                    
-                except Exception as e:
-                    messagebox.showerror("Update Error", f"Failed to update cell: {e}")
-
-            entry.destroy()
-        
-        entry.bind('<Return>', save_edit)
-        entry.bind('<FocusOut>', save_edit)
-        
-        entry.place(x=x, y=y, anchor='nw', width=width, height=height)
-
-    def copy_data(self, scope):
-        data_to_copy = ""
-        
-        if scope == 'row':
-            selected_item = self.tree.focus()
-            if selected_item:
-                values = self.tree.item(selected_item, 'values')
-                if values:
-                    data_to_copy = '\t'.join(map(str, values))
-                    
-        elif scope == 'column':
-            col_name = simpledialog.askstring("Copy Column", "Enter the exact name of the column to copy:")
-            if col_name and col_name in self.tree["columns"]:
-                col_index = list(self.tree["columns"]).index(col_name)
-                all_rows = self.tree.get_children()
-                column_data = [self.tree.item(row, 'values')[col_index] for row in all_rows]
-                data_to_copy = '\n'.join(map(str, column_data))
-        
-        elif scope == 'cell':
-             selected_item = self.tree.focus()
-             if selected_item:
-                 values = self.tree.item(selected_item, 'values')
-                 if values:
-                     data_to_copy = str(values[0])
-
-        if data_to_copy:
-            self.root.clipboard_clear()
-            self.root.clipboard_append(data_to_copy)
-            messagebox.showinfo("Copied", f"Copied {scope} data to clipboard.")
+# =========================================================================
+# 9. Import Engine
+# =========================================================================
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_BATCH = 10000            # rows per executemany() call
+IMPORT_COMMIT_ROWS = 500000     # rows per transaction; each commit is a resume point
+IMPORT_SAMPLE = 1000            # rows read up front to infer column types
+
+ImportSource = namedtuple("ImportSource", "fmt columns types delimiter sample")
+
+
+class ImportFailed(Exception):
+    """An import stopped part way. ``rows_done`` rows were committed; pass it as ``skip_rows`` to resume."""
+    def __init__(self, message, rows_done):
+        super().__init__(message)
+        self.rows_done = rows_done
+
+
+def import_format(path):
+    name = path.lower()[:-3] if path.lower().endswith(".gz") else path.lower()
+    return "jsonl" if name.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def _open_import_file(path):
+    """Returns (raw binary file, text stream); the raw file's position drives progress reporting."""
+    raw = open(path, "rb")
+    stream = gzip.GzipFile(fileobj=raw) if path.lower().endswith(".gz") else raw
+    return raw, io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def _guess_delimiter(head):
+    """The candidate that splits the first lines into the most consistent, largest number of fields."""
+    lines = [line for line in head.splitlines()[:50] if line.strip()]
+    best, best_score = ",", 0
+    for delimiter in ",;\t|":
+        counts = [line.count(delimiter) for line in lines]
+        if counts and min(counts) > 0:
+            score = sum(count == counts[0] for count in counts) * 1000 + counts[0]
+            if score > best_score:
+                best, best_score = delimiter, score
+    return best
+
+
+def _csv_records(text, delimiter, header):
+    if delimiter is None:
+        head = text.read(1 << 13)
+        head += text.readline()  # finish the line the read stopped in
+        delimiter = _guess_delimiter(head)
+        text = itertools.chain(io.StringIO(head), text)
+    reader = csv.reader(text, delimiter=delimiter)
+    columns = next(reader, None) if header else None
+    return delimiter, columns, reader
+
+
+def _jsonl_records(text, columns):
+    """Yields rows as lists ordered like ``columns``; nested values are stored as JSON text."""
+    loads, dumps = json.loads, json.dumps
+    for line in text:
+        if not line.strip():
+            continue
+        record = loads(line)
+        yield [value if not isinstance(value, (dict, list)) else dumps(value)
+               for value in map(record.get, columns)]
+
+
+def _column_names(names, count):
+    """Makes header names usable as unique column names; missing ones become col1, col2..."""
+    result = []
+    for number in range(count):
+        name = (names[number].strip() if names and number < len(names) else "") or f"col{number + 1}"
+        base, suffix = name, 2
+        while name.lower() in (n.lower() for n in result):
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        result.append(name)
+    return result
+
+
+def infer_types(columns, sample):
+    """INTEGER, REAL or TEXT per column, from the non-empty values in ``sample``.
+
+    Integers with leading zeros (zip codes, ids) stay TEXT so they survive unchanged.
+    """
+    types = []
+    for index in range(len(columns)):
+        kind = None
+        for row in sample:
+            value = row[index] if index < len(row) else None
+            if value is None or value == "":
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)) or \
+                    (isinstance(value, str) and re.match(r'-?0\d', value)):
+                kind = "TEXT"
+            elif isinstance(value, int) or (isinstance(value, str) and re.fullmatch(r'-?(0|[1-9]\d{0,17})', value)):
+                kind = kind or "INTEGER"
+            elif isinstance(value, float) or re.fullmatch(r'-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?', value):
+                kind = "REAL" if kind in (None, "INTEGER", "REAL") else kind
+            else:
+                kind = "TEXT"
+            if kind == "TEXT":
+                break
+        types.append(kind or "TEXT")
+    return types
+
+
+def _read_source(text, fmt, delimiter=None, header=True):
+    """Reads the columns and a sample; returns (ImportSource, iterator over all rows, sample first)."""
+    if fmt == "jsonl":
+        sample_lines = list(itertools.islice((line for line in text if line.strip()), IMPORT_SAMPLE))
+        keys = {}
+        for line in sample_lines:
+            keys.update(dict.fromkeys(json.loads(line)))
+        columns = list(keys)
+        rows = _jsonl_records(itertools.chain(sample_lines, text), columns)
+        sample = list(itertools.islice(rows, IMPORT_SAMPLE))
+        return ImportSource(fmt, columns, infer_types(columns, sample), None, sample), itertools.chain(sample, rows)
+
+    delimiter, names, reader = _csv_records(text, delimiter, header)
+    sample = list(itertools.islice(reader, IMPORT_SAMPLE))
+    width = max([len(names or ())] + [len(row) for row in sample])
+    columns = _column_names(names, width)
+    return ImportSource(fmt, columns, infer_types(columns, sample), delimiter, sample), itertools.chain(sample, reader)
+
+
+def inspect_import(path, fmt=None, delimiter=None, header=True):
+    """Reads only the start of a file: its columns, inferred types, delimiter and a sample."""
+    raw, text = _open_import_file(path)
+    with raw, text:
+        return _read_source(text, fmt or import_format(path), delimiter, header)[0]
+
+
+def import_file(conn, path, table, fmt=None, delimiter=None, header=True, create=True, empty_as_null=True,
+                defer_indexes=True, skip_rows=0, checkpoint=None, progress=None):
+    """Streams a CSV or JSON Lines file into ``table``; returns the number of rows inserted.
+
+    Rows go in through ``executemany`` in IMPORT_BATCH chunks, committed every
+    IMPORT_COMMIT_ROWS rows. While loading, ``synchronous`` is OFF and the
+    table's plain (non-unique) indexes are dropped, then rebuilt once at the end.
+    Committed rows stay when a row fails or the job is cancelled: the count is
+    kept in ``checkpoint["rows"]`` (and in ImportFailed.rows_done), and passing
+    it back as ``skip_rows`` resumes after them.
+    """
+    checkpoint = {} if checkpoint is None else checkpoint
+    checkpoint["rows"] = skip_rows
+    raw, text = _open_import_file(path)
+    with raw, text:
+        source, rows = _read_source(text, fmt or import_format(path), delimiter, header)
+        info = SchemaCatalog().refresh(conn).table(table)
+        if info is None:
+            if not create:
+                raise ValueError(f"Table '{table}' does not exist.")
+            definition = ", ".join(f"{quote_identifier(c)} {t}" for c, t in zip(source.columns, source.types))
+            execute_and_commit(conn, f"CREATE TABLE {quote_identifier(table)} ({definition})")
+            target_columns = source.columns
         else:
-            messagebox.showwarning("Copy Error", f"Could not copy {scope}. Ensure data is loaded.")
-            
-    def populate_table_selector(self):
-        if not self.conn: return
+            by_name = {name.lower(): name for name in info.column_names}
+            missing = [c for c in source.columns if c.lower() not in by_name]
+            if missing:
+                raise ValueError(f"Table '{table}' has no column(s): {', '.join(missing)}")
+            target_columns = [by_name[c.lower()] for c in source.columns]
+
+        width = len(target_columns)
+        # Empty CSV fields become NULL inside SQLite, and the column affinity turns
+        # numeric text into numbers, so no per-value work is done in Python.
+        placeholder = "nullif(?, '')" if empty_as_null and source.fmt == "csv" else "?"
+        insert = (f"INSERT INTO {quote_identifier(table)} ({', '.join(map(quote_identifier, target_columns))}) "
+                  f"VALUES ({', '.join([placeholder] * width)})")
+        deferred = []
+        if defer_indexes and info is not None:
+            plain = {index.name for index in info.indexes if index.origin == "c" and not index.unique}
+            deferred = [(name, sql) for name, sql in conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql NOT NULL", (table,)
+            ) if name in plain]
+        total_bytes = os.path.getsize(path) or 1
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("PRAGMA synchronous = OFF")
+        committed, pending = skip_rows, 0
         try:
-            tables = self.get_table_list()
-            
-            self.table_selector['values'] = tables
-            if tables:
-                if self.selected_table.get() not in tables:
-                     self.table_selector.set(tables[0])
-            else:
-                 self.table_selector.set("")
-        except Exception as e:
-            messagebox.showerror("DB Error", f"Could not list tables: {str(e)}")
-
-    def select_table(self, event):
-        table_name = self.selected_table.get()
-        if table_name:
-            self.query_text.delete("1.0", tk.END)
-            self.query_text.insert("1.0", f"SELECT * FROM {table_name};")
-            self.run_query()
-
-    def run_query(self):
-        if not self.conn:
-            messagebox.showwarning("No DB", "Open a database file first.")
+            for name, _ in deferred:
+                conn.execute(f"DROP INDEX {quote_identifier(name)}")
+            conn.commit()
+            for skipped, _ in enumerate(itertools.islice(rows, skip_rows), 1):
+                if progress and skipped % IMPORT_BATCH == 0:
+                    progress(raw.tell(), total_bytes, f"Skipping {skipped:,} imported rows")
+
+            conn.execute("BEGIN")
+            while True:
+                batch = list(itertools.islice(rows, IMPORT_BATCH))
+                if not batch:
+                    break
+                if set(map(len, batch)) != {width}:
+                    batch = [(list(row) + [None] * width)[:width] for row in batch]
+                try:
+                    conn.executemany(insert, batch)
+                except sqlite3.Error as e:
+                    first = committed + pending + 1
+                    raise ImportFailed(f"Import stopped in rows {first:,}-{first + len(batch) - 1:,}: {e}. "
+                                       f"{committed:,} rows are committed.", committed) from e
+                pending += len(batch)
+                if pending >= IMPORT_COMMIT_ROWS:
+                    conn.commit()
+                    committed += pending
+                    checkpoint["rows"] = committed
+                    pending = 0
+                    conn.execute("BEGIN")
+                if progress:
+                    progress(raw.tell(), total_bytes, f"{committed + pending:,} rows imported")
+            conn.commit()
+            committed += pending
+            checkpoint["rows"] = committed
+        except JobCancelled:
+            conn.commit()  # keep everything read so far; resuming continues from here
+            committed += pending
+            checkpoint["rows"] = committed
+            raise
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.set_progress_handler(None, 0)  # a cancelled job must still get its indexes back
+            conn.execute(f"PRAGMA synchronous = {int(synchronous)}")
+            for name, sql in deferred:
+                conn.execute(sql)
+            conn.commit()
+        return committed - skip_rows
+
+# =========================================================================
+# 10. Full-Text Search
+# =========================================================================
+SEARCH_SCHEMA = "ease_search"   # schema name the index is attached under
+SEARCH_SUFFIX = ".fts"          # companion file next to the database
+SEARCH_BATCH = 50000            # rows indexed (and committed) per statement
+SEARCH_LIMIT = 200
+ROWID_BITS = 40                 # index rowid = table id << ROWID_BITS | row rowid
+ROWID_MASK = (1 << ROWID_BITS) - 1
+# The TEMP triggers name these without a schema, and SQLite looks unqualified names
+# up in temp, main and then the attached databases, so a table of the same name
+# anywhere before ease_search would capture their writes. attach() refuses that.
+SEARCH_DOCS = "_ease_search_docs"
+SEARCH_TABLES = "_ease_search_tables"
+SEARCH_STATE = "_ease_search_state"
+
+SearchHit = namedtuple("SearchHit", "table rowid snippet rank")
+
+
+def fts_query(text):
+    """Turns typed words into an FTS5 query in which every word must match as a prefix."""
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+
+def _text_columns(info):
+    """Columns with TEXT affinity, or no declared type (which may hold text too)."""
+    names = []
+    for col in info.columns:
+        kind = (col.type or "").upper()
+        if not kind or ("INT" not in kind and any(t in kind for t in ("CHAR", "CLOB", "TEXT"))):
+            names.append(col.name)
+    return names
+
+
+def file_fingerprint(path):
+    """What changes on disk with every commit to the database at ``path``, or None for in-memory databases.
+
+    That is the header's file change counter with the file's size and mtime,
+    plus the salts and size of the WAL file: in WAL mode commits are appended
+    to the WAL (or restart it with new salts), and checkpointing them writes
+    the file without necessarily touching the counter.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        f.seek(24)
+        counter = f"{f.read(4).hex()}:{stat.st_size}:{stat.st_mtime_ns}"
+    wal, size = "", 0
+    try:
+        size = os.path.getsize(path + "-wal")
+        if size:
+            with open(path + "-wal", "rb") as f:
+                f.seek(16)
+                wal = f.read(8).hex()
+    except OSError:
+        pass
+    return f"{counter}:{wal}:{size}"
+
+
+def _search_body(columns, prefix=""):
+    """SQL expression joining the text values of a row into one indexed document."""
+    parts = [f"CASE typeof({prefix}{quote_identifier(c)}) WHEN 'text' THEN {prefix}{quote_identifier(c)} ELSE '' END"
+             for c in columns]
+    return " || ' ' || ".join(parts)
+
+
+class SearchIndex:
+    """FTS5 side index over the text columns of every table, kept in a companion file.
+
+    The index lives in ``<database>.fts`` (in memory for in-memory databases)
+    and is attached to the connection as ``ease_search``. Writes made through
+    the connection are mirrored by TEMP triggers; writes by other processes
+    are noticed through ``PRAGMA data_version`` on the next search: a table
+    that only grew is indexed from its previous max rowid, anything else is
+    re-indexed. Updates by other processes that change neither the row count
+    nor the max rowid are only picked up by ``rebuild``, so ``stale`` is set
+    once another process has written and a table was taken as unchanged or
+    only grown. Writes made while no Ease-DB connection had the triggers
+    installed are found by comparing the database file's ``file_fingerprint``
+    with the one recorded at the last sync (and by ``close``); ``stale`` is
+    kept in the index file until a rebuild. WITHOUT ROWID and virtual tables,
+    and tables with rowids outside [0, 2**40), are skipped.
+
+    The index tables are named with the reserved ``_ease_search_`` prefix;
+    a database that has tables of those names cannot be searched.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.stale = False
+        self._synced = None
+
+    def invalidate(self):
+        """Forces a full check of every table on the next search."""
+        self._synced = None
+
+    def attach(self, conn):
+        attached = [row[1] for row in conn.execute("PRAGMA database_list")]
+        names = (SEARCH_DOCS, SEARCH_TABLES, SEARCH_STATE)
+        for schema in attached:
+            if schema == SEARCH_SCHEMA:
+                continue
+            master = "sqlite_temp_master" if schema == "temp" else f"{quote_identifier(schema)}.sqlite_master"
+            clash = conn.execute(f"SELECT name FROM {master} WHERE name IN (?, ?, ?)", names).fetchone()
+            if clash:
+                raise ValueError(f"Cannot search this database: the table {schema}.{clash[0]} has a name "
+                                 "reserved for the search index")
+        if SEARCH_SCHEMA in attached:
+            return
+        path = self.path
+        if path is None:
+            main = database_path(conn)
+            path = main + SEARCH_SUFFIX if main else ":memory:"
+        conn.execute(f"ATTACH DATABASE ? AS {SEARCH_SCHEMA}", (path,))
+        for old in ("search_docs", "search_tables"):  # index files written before the tables were renamed
+            conn.execute(f"DROP TABLE IF EXISTS {SEARCH_SCHEMA}.{old}")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {SEARCH_SCHEMA}.{SEARCH_TABLES} ("
+                     "id INTEGER PRIMARY KEY, name TEXT UNIQUE, columns TEXT, row_count INTEGER, max_rowid INTEGER)")
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_SCHEMA}.{SEARCH_DOCS} "
+                     "USING fts5(body, tokenize='unicode61 remove_diacritics 2')")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {SEARCH_SCHEMA}.{SEARCH_STATE} (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+        self._synced = None
+
+    def _state(self, conn, key):
+        row = conn.execute(f"SELECT value FROM {SEARCH_SCHEMA}.{SEARCH_STATE} WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn, key, value):
+        conn.execute(f"INSERT OR REPLACE INTO {SEARCH_SCHEMA}.{SEARCH_STATE} (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self, conn):
+        """Records the database file's fingerprint before ``conn`` closes, if the index is known to be current.
+
+        Writes made through ``conn`` since the last sync were mirrored by the
+        triggers, so only another program's commits (``data_version`` moved)
+        leave the old fingerprint in place for the next session to notice. In
+        WAL mode the log is checkpointed first, so the checkpoint that closing
+        the last connection runs does not change the fingerprint.
+        """
+        if self._synced is None or self._synced[0] is not conn or conn.in_transaction:
+            return
+        if conn.execute("PRAGMA data_version").fetchone()[0] != self._synced[1]:
             return
+        path = database_path(conn)
+        if conn.execute("PRAGMA main.journal_mode").fetchone()[0] == "wal":
+            conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE)").fetchall()
+        self._set_state(conn, "fingerprint", file_fingerprint(path))
+        conn.commit()
+
+    def sync(self, conn, catalog, progress=None, rebuild=False):
+        """Brings the index up to date with the database; returns the number of rows indexed.
+
+        Cheap when nothing changed since the last call: two PRAGMAs.
+        """
+        self.attach(conn)
+        catalog.refresh(conn)
+        versions = (conn, conn.execute("PRAGMA data_version").fetchone()[0], catalog.version)
+        if versions == self._synced and not rebuild:
+            return 0
+        state = {row[1]: row for row in conn.execute(
+            f"SELECT id, name, columns, row_count, max_rowid FROM {SEARCH_SCHEMA}.{SEARCH_TABLES}")}
+        path = database_path(conn)
+        if self._synced is not None and self._synced[0] is conn:
+            # data_version only moves for commits by other connections; ours are mirrored by the triggers.
+            external = self._synced[1] != versions[1]
+        else:
+            # First sync on this connection: anything may have been written since the index was last current.
+            external = bool(state) and path is not None and self._state(conn, "fingerprint") != file_fingerprint(path)
+            self.stale = self._state(conn, "stale") == "1"
+        if rebuild:
+            self.stale = False
+        work = []   # (id, table, columns, index rows after this rowid, rows to index)
+        for name in catalog.table_names():
+            info = catalog.table(name)
+            columns = _text_columns(info)
+            if info.virtual or info.without_rowid or not columns:
+                continue
+            if progress:
+                progress(0, None, f"Checking {name}")
+            table = quote_identifier(name)
+            low = conn.execute(f"SELECT min(rowid) FROM main.{table}").fetchone()[0]
+            high = conn.execute(f"SELECT max(rowid) FROM main.{table}").fetchone()[0]
+            if low is not None and (low < 0 or high > ROWID_MASK):
+                continue
+            high = -1 if high is None else high
+            count = conn.execute(f"SELECT count(*) FROM main.{table}").fetchone()[0]
+            entry = state.pop(name, None)
+            if entry is None:
+                table_id = conn.execute(f"INSERT INTO {SEARCH_SCHEMA}.{SEARCH_TABLES}(name, columns, row_count, max_rowid) "
+                                        "VALUES (?, ?, 0, -1)", (name, json.dumps(columns))).lastrowid
+                work.append((table_id, name, columns, -1, count))
+                continue
+            table_id, _, indexed_columns, indexed, indexed_max = entry
+            if not rebuild and indexed_columns == json.dumps(columns):
+                if count == indexed and high <= indexed_max:
+                    self.stale = self.stale or external
+                    continue  # unchanged, or kept current by the triggers
+                if high > indexed_max and count - indexed == conn.execute(
+                        f"SELECT count(*) FROM main.{table} WHERE rowid > ?", (indexed_max,)).fetchone()[0]:
+                    self.stale = self.stale or external
+                    work.append((table_id, name, columns, indexed_max, count - indexed))
+                    continue
+            self._clear(conn, table_id)
+            conn.execute(f"UPDATE {SEARCH_SCHEMA}.{SEARCH_TABLES} SET columns = ?, row_count = 0, max_rowid = -1 WHERE id = ?",
+                         (json.dumps(columns), table_id))
+            work.append((table_id, name, columns, -1, count))
+        for table_id, name, *_ in state.values():
+            self._clear(conn, table_id)
+            conn.execute(f"DELETE FROM {SEARCH_SCHEMA}.{SEARCH_TABLES} WHERE id = ?", (table_id,))
+        conn.commit()
+
+        total = sum(item[4] for item in work)
+        done = 0
+        for table_id, name, columns, after, _ in work:
+            done = self._index_rows(conn, table_id, name, columns, after, progress, done, total)
+        self._install_triggers(conn)
+        self._set_state(conn, "stale", "1" if self.stale else "0")
+        self._set_state(conn, "fingerprint", file_fingerprint(path))
+        conn.commit()
+        self._synced = (conn, conn.execute("PRAGMA data_version").fetchone()[0], catalog.version)
+        return done
+
+    def _clear(self, conn, table_id):
+        conn.execute(f"DELETE FROM {SEARCH_SCHEMA}.{SEARCH_DOCS} WHERE rowid BETWEEN ? AND ?",
+                     (table_id << ROWID_BITS, (table_id << ROWID_BITS) | ROWID_MASK))
+
+    def _index_rows(self, conn, table_id, name, columns, after, progress, done, total):
+        """Indexes the rows after rowid ``after`` in committed batches, so a cancelled build resumes."""
+        table = quote_identifier(name)
+        body = _search_body(columns)
+        while True:
+            last, rows = conn.execute(f"SELECT max(rowid), count(*) FROM (SELECT rowid FROM main.{table} "
+                                      "WHERE rowid > ? ORDER BY rowid LIMIT ?)", (after, SEARCH_BATCH)).fetchone()
+            if not rows:
+                return done
+            conn.execute(f"INSERT INTO {SEARCH_SCHEMA}.{SEARCH_DOCS}(rowid, body) SELECT ? | rowid, {body} "
+                         f"FROM main.{table} WHERE rowid > ? AND rowid <= ?", (table_id << ROWID_BITS, after, last))
+            conn.execute(f"UPDATE {SEARCH_SCHEMA}.{SEARCH_TABLES} SET row_count = row_count + ?, max_rowid = ? WHERE id = ?",
+                         (rows, last, table_id))
+            conn.commit()
+            after = last
+            done += rows
+            if progress:
+                progress(done, total, f"Indexing {name}")
+
+    def _install_triggers(self, conn):
+        """(Re)creates the TEMP triggers that mirror this connection's writes into the index."""
+        for (name,) in conn.execute("SELECT name FROM temp.sqlite_master WHERE type = 'trigger' "
+                                      "AND name LIKE 'ease\\_search\\_%' ESCAPE '\\'").fetchall():
+            conn.execute(f"DROP TRIGGER temp.{quote_identifier(name)}")
+        for table_id, name, columns in conn.execute(f"SELECT id, name, columns FROM {SEARCH_SCHEMA}.{SEARCH_TABLES}").fetchall():
+            table = quote_identifier(name)
+            columns = json.loads(columns)
+            # Statements inside triggers cannot name a schema; attach() made sure these resolve to ease_search.
+            docs, tables, base = SEARCH_DOCS, SEARCH_TABLES, table_id << ROWID_BITS
+            insert = (f"INSERT INTO {docs}(rowid, body) SELECT {base} | new.rowid, {_search_body(columns, 'new.')} "
+                      f"WHERE new.rowid BETWEEN 0 AND {ROWID_MASK};")
+            delete = f"DELETE FROM {docs} WHERE rowid = {base} | old.rowid AND old.rowid BETWEEN 0 AND {ROWID_MASK};"
+            conn.execute(f"CREATE TEMP TRIGGER ease_search_insert_{table_id} AFTER INSERT ON main.{table} BEGIN {insert} "
+                         f"UPDATE {tables} SET row_count = row_count + 1, max_rowid = max(max_rowid, new.rowid) "
+                         f"WHERE id = {table_id}; END")
+            conn.execute(f"CREATE TEMP TRIGGER ease_search_update_{table_id} AFTER UPDATE ON main.{table} BEGIN {delete} "
+                         f"{insert} UPDATE {tables} SET max_rowid = max(max_rowid, new.rowid) WHERE id = {table_id}; END")
+            conn.execute(f"CREATE TEMP TRIGGER ease_search_delete_{table_id} AFTER DELETE ON main.{table} BEGIN {delete} "
+                         f"UPDATE {tables} SET row_count = row_count - 1 WHERE id = {table_id}; END")
+
+    def search(self, conn, catalog, text, limit=SEARCH_LIMIT, progress=None):
+        """Returns the best-ranked SearchHits for ``text``, syncing the index first if needed."""
+        self.sync(conn, catalog, progress)
+        match = fts_query(text)
+        if not match:
+            return []
+        names = dict(conn.execute(f"SELECT id, name FROM {SEARCH_SCHEMA}.{SEARCH_TABLES}"))
+        return [SearchHit(names.get(docid >> ROWID_BITS), docid & ROWID_MASK, snippet, rank)
+                for docid, snippet, rank in conn.execute(
+                    f"SELECT rowid, snippet({SEARCH_DOCS}, 0, '[', ']', '...', 12), rank FROM {SEARCH_SCHEMA}.{SEARCH_DOCS} "
+                    f"WHERE {SEARCH_DOCS} MATCH ? ORDER BY rank LIMIT ?", (match, limit))]
 
-        query = self.query_text.get("1.0", tk.END).strip()
-        if not query: return
-            
+# =========================================================================
+# 11. Storage Statistics and Maintenance
+# =========================================================================
+INCREMENTAL_VACUUM_STEP = 1024  # pages released per incremental_vacuum call
+
+ObjectStats = namedtuple("ObjectStats", "name kind table rows pages bytes payload unused fragmentation")
+
+
+class StorageReport:
+    """Space usage of one database: file totals plus an ObjectStats per table and index."""
+    def __init__(self, page_size, page_count, freelist_count, auto_vacuum, objects, elapsed):
+        self.page_size = page_size
+        self.page_count = page_count
+        self.freelist_count = freelist_count
+        self.auto_vacuum = auto_vacuum
+        self.objects = objects
+        self.elapsed = elapsed
+
+    @property
+    def file_bytes(self):
+        return self.page_size * self.page_count
+
+    @property
+    def free_bytes(self):
+        return self.page_size * self.freelist_count
+
+
+def storage_report(conn, progress=None):
+    """Reads per-table and per-index space usage from the dbstat virtual table.
+
+    This visits every page of the database once, so it belongs on the worker.
+    Rows are the cells of a table's leaf pages (all cells for indexes and
+    WITHOUT ROWID tables); fragmentation is the share of leaf pages that do
+    not directly follow the previous leaf page in the file, which is what
+    makes a full scan seek.
+    """
+    started = time.perf_counter()
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    auto_vacuum = {0: "none", 1: "full", 2: "incremental"}.get(conn.execute("PRAGMA auto_vacuum").fetchone()[0])
+    owners = {"sqlite_schema": ("table", "sqlite_schema", False), "sqlite_master": ("table", "sqlite_master", False)}
+    for kind, name, table, sql in conn.execute(
+            "SELECT type, name, tbl_name, sql FROM sqlite_master WHERE type IN ('table', 'index')"):
+        keyed = kind == "index" or bool(re.search(r'\bWITHOUT\s+ROWID\b', sql or "", re.IGNORECASE))
+        owners[name] = (kind, table, keyed)
+
+    totals = {}   # name -> [rows, pages, bytes, payload, unused, leaves, jumps, last leaf]
+    done = 0
+    for name, pagetype, ncell, payload, unused, pgsize, pageno in conn.execute(
+            "SELECT name, pagetype, ncell, payload, unused, pgsize, pageno FROM dbstat"):
+        entry = totals.get(name)
+        if entry is None:
+            entry = totals[name] = [0, 0, 0, 0, 0, 0, 0, None]
+        entry[1] += 1
+        entry[2] += pgsize
+        entry[3] += payload
+        entry[4] += unused
+        if pagetype == "leaf":
+            entry[0] += ncell
+            entry[5] += 1
+            if entry[7] is not None and pageno != entry[7] + 1:
+                entry[6] += 1
+            entry[7] = pageno
+        elif pagetype == "internal" and owners.get(name, ("", "", False))[2]:
+            entry[0] += ncell
+        done += 1
+        if progress and not done % 5000:
+            progress(done, page_count - freelist, f"{done:,} of {page_count - freelist:,} pages")
+
+    objects = []
+    for name, (rows, pages, size, payload, unused, leaves, jumps, _) in totals.items():
+        kind, table, _ = owners.get(name, ("table", name, False))
+        objects.append(ObjectStats(name, kind, table, rows, pages, size, payload, unused,
+                                   jumps / (leaves - 1) if leaves > 1 else 0.0))
+    objects.sort(key=lambda o: o.bytes, reverse=True)
+    return StorageReport(page_size, page_count, freelist, auto_vacuum, objects, time.perf_counter() - started)
+
+
+class StorageCache:
+    """Keeps the last StorageReport until the database changes.
+
+    The version compares ``PRAGMA data_version`` (commits by other connections),
+    the connection's own change counter, the schema cookie and the page and
+    free-list counts (which VACUUM changes), so ``get()`` is a few PRAGMAs
+    when nothing changed.
+    """
+    def __init__(self):
+        self.version = None
+        self.report = None
+
+    def invalidate(self):
+        self.version = None
+
+    def _version(self, conn):
+        pragmas = ("data_version", "schema_version", "page_count", "freelist_count")
+        return (conn.total_changes,) + tuple(conn.execute(f"PRAGMA {p}").fetchone()[0] for p in pragmas)
+
+    def get(self, conn, progress=None, force=False):
+        version = self._version(conn)
+        if force or version != self.version or self.report is None:
+            self.report = storage_report(conn, progress)
+            self.version = version
+        return self.report
+
+
+def vacuum(conn, target=None, auto_vacuum=None, progress=None):
+    """Rebuilds the database in place, or into the new file ``target`` (VACUUM INTO).
+
+    ``auto_vacuum`` ("none", "full" or "incremental") changes that setting as
+    part of an in-place VACUUM. VACUUM INTO reports progress from the size of
+    the file being written; a partial file is removed if it fails.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    if target is None:
+        if auto_vacuum is not None:
+            conn.execute(f"PRAGMA auto_vacuum = {auto_vacuum.upper()}")
+        conn.execute("VACUUM")
+        return
+    if os.path.exists(target):
+        raise ValueError(f"{target} already exists.")
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    expected = page_size * (conn.execute("PRAGMA page_count").fetchone()[0]
+                            - conn.execute("PRAGMA freelist_count").fetchone()[0])
+
+    def on_step():
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(query)
-            
-            if query.upper().startswith("SELECT"): 
-                rows = cursor.fetchall()
-                headers = [desc[0] for desc in cursor.description] if cursor.description else []
-            
-                self.tree.delete(*self.tree.get_children())
-                self.tree["columns"] = headers
-                for col in headers:
-                    self.tree.heading(col, text=col)
-                    self.tree.column(col, width=100, anchor=tk.W)
-
-                for row in rows:
-                    self.tree.insert("", tk.END, values=row)
+            size = os.path.getsize(target) if os.path.exists(target) else 0
+            progress(min(size, expected), expected, f"{size / 1048576:,.1f} of {expected / 1048576:,.1f} MB")
+        except JobCancelled:
+            return 1
+        return 0
+
+    if progress:
+        conn.set_progress_handler(on_step, PROGRESS_STEPS)
+    try:
+        conn.execute("VACUUM INTO ?", (target,))
+    except BaseException:
+        if os.path.exists(target):
+            os.remove(target)
+        raise
+    finally:
+        if progress:
+            conn.set_progress_handler(None, 0)
+
+
+def incremental_vacuum(conn, pages=None, progress=None):
+    """Returns up to ``pages`` free pages (default: all) to the file system; returns the number freed."""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        raise ValueError("incremental_vacuum needs auto_vacuum=INCREMENTAL. Run VACUUM with that setting first.")
+    if conn.in_transaction:
+        conn.commit()
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    wanted = free if pages is None else min(pages, free)
+    freed = 0
+    while freed < wanted:
+        conn.execute(f"PRAGMA incremental_vacuum({min(INCREMENTAL_VACUUM_STEP, wanted - freed)})").fetchall()
+        left = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free - left <= freed:
+            break
+        freed = free - left
+        if progress:
+            progress(freed, wanted, f"{freed:,} of {wanted:,} pages freed")
+    return freed
+
+
+def optimize(conn):
+    """PRAGMA optimize: re-runs ANALYZE where the query planner would benefit from it."""
+    conn.execute("PRAGMA optimize").fetchall()
+    conn.commit()
+
+
+def integrity_check(conn, quick=False, max_errors=100):
+    """Returns the messages of PRAGMA integrity_check (or quick_check); ["ok"] when healthy."""
+    pragma = "quick_check" if quick else "integrity_check"
+    return [row[0] for row in conn.execute(f"PRAGMA {pragma}({int(max_errors)})")]
 
+# =========================================================================
+# 12. Column Profiles
+# =========================================================================
+PROFILE_SAMPLE_ROWS = 50000     # tables estimated above this are profiled on a sample of about this many rows
+PROFILE_SAMPLE_BLOCKS = 32      # contiguous rowid ranges the sample is read from
+PROFILE_TOP_VALUES = 5
+PROFILE_COUNTERS = 64           # Misra-Gries counters behind the top values (exact below this many distinct values)
+PROFILE_RESERVOIR = 2048        # values kept per column to draw the histogram from
+PROFILE_BINS = 10
+PROFILE_VALUE_CHARS = 48        # characters of a min/max/top value kept for display
+PROFILE_MAX_TERMS = 1800        # result columns per scan, below SQLite's default limit of 2000
+HLL_BITS = 12                   # 4096 HyperLogLog registers: about 1.6% error on distinct counts
+
+ColumnProfile = namedtuple("ColumnProfile", "name type nulls distinct minimum maximum average "
+                                            "min_length max_length avg_length top histogram")
+
+
+class TableProfile:
+    """Profiles of every column of one table, from ``scanned`` rows (a sample when ``sampled``)."""
+    def __init__(self, table, rows, scanned, sampled, columns, elapsed):
+        self.table = table
+        self.rows = rows
+        self.scanned = scanned
+        self.sampled = sampled
+        self.columns = columns
+        self.elapsed = elapsed
+
+
+def _profile_label(value):
+    """A short display form of a min/max/top value; numbers are kept as they are."""
+    if isinstance(value, bytes):
+        return f"x'{value[:16].hex()}{'...' if len(value) > 16 else ''}' ({len(value):,} bytes)"
+    if isinstance(value, str) and len(value) > PROFILE_VALUE_CHARS:
+        return value[:PROFILE_VALUE_CHARS - 1] + "…"
+    return value
+
+
+class ColumnSketch:
+    """SQLite aggregate that sketches one column in a single pass.
+
+    It keeps HyperLogLog registers for the distinct count, Misra-Gries counters
+    for the most frequent values and a reservoir sample of numbers and of
+    TEXT/BLOB lengths for the histogram, and returns them as JSON. Exact
+    counts, min, max and averages are left to SQLite's own aggregates.
+    """
+    def __init__(self):
+        self.registers = bytearray(1 << HLL_BITS)
+        self.counters = {}
+        self._random = random.Random(0)
+        self.numbers = self._reservoir()
+        self.lengths = self._reservoir()
+
+    def _reservoir(self):
+        """[sample, values seen, position of the next value to keep, W] for Algorithm L."""
+        w = math.exp(math.log(self._random.random()) / PROFILE_RESERVOIR)
+        return [[], 0, PROFILE_RESERVOIR + self._skip(w), w]
+
+    def _skip(self, w):
+        return int(math.log(self._random.random()) / math.log(1 - w)) + 1
+
+    def step(self, value):
+        if value is None:
+            return
+        # murmur3's 64-bit finalizer: Python hashes small ints to themselves
+        h = hash(value) & 0xFFFFFFFFFFFFFFFF
+        h = ((h ^ (h >> 33)) * 0xFF51AFD7ED558CCD) & 0xFFFFFFFFFFFFFFFF
+        h = ((h ^ (h >> 33)) * 0xC4CEB9FE1A85EC53) & 0xFFFFFFFFFFFFFFFF
+        h ^= h >> 33
+        index = h >> (64 - HLL_BITS)
+        rank = 64 - HLL_BITS - (h & ((1 << (64 - HLL_BITS)) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+        counters = self.counters
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < PROFILE_COUNTERS:
+            counters[value] = 1
+        else:
+            for key in list(counters):
+                if counters[key] == 1:
+                    del counters[key]
+                else:
+                    counters[key] -= 1
+
+        if isinstance(value, (int, float)):
+            self._sample(self.numbers, value)
+        else:
+            self._sample(self.lengths, len(value))
+
+    def _sample(self, reservoir, value):
+        reservoir[1] += 1
+        if reservoir[1] <= PROFILE_RESERVOIR:
+            reservoir[0].append(value)
+        elif reservoir[1] == reservoir[2]:
+            reservoir[0][self._random.randrange(PROFILE_RESERVOIR)] = value
+            reservoir[3] *= math.exp(math.log(self._random.random()) / PROFILE_RESERVOIR)
+            reservoir[2] += self._skip(reservoir[3])
+
+    def distinct(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)   # linear counting is more accurate for small counts
+        return int(round(estimate))
+
+    def histogram(self):
+        """("value" or "length", [(low, high, count)]) scaled to every value seen, from the larger reservoir."""
+        kind, (sample, seen, _, _) = ("value", self.numbers) if self.numbers[1] >= self.lengths[1] \
+            else ("length", self.lengths)
+        if not sample:
+            return kind, []
+        low, high = min(sample), max(sample)
+        integral = all(isinstance(v, int) for v in sample)
+        if integral and high - low < PROFILE_BINS:
+            edges = list(range(low, high + 2))
+        else:
+            width = (high - low) / PROFILE_BINS or 1
+            edges = [low + width * i for i in range(PROFILE_BINS)] + [high]
+        counts = [0] * (len(edges) - 1)
+        for value in sample:
+            for i in range(len(counts)):
+                if value < edges[i + 1] or i == len(counts) - 1:
+                    counts[i] += 1
+                    break
+        scale = seen / len(sample)
+        if integral and high - low < PROFILE_BINS:
+            return kind, [(edges[i], edges[i], round(c * scale)) for i, c in enumerate(counts)]
+        return kind, [(edges[i], edges[i + 1], round(c * scale)) for i, c in enumerate(counts)]
+
+    def finalize(self):
+        top = sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:PROFILE_TOP_VALUES]
+        kind, bins = self.histogram()
+        return json.dumps({
+            "distinct": self.distinct() if self.numbers[1] or self.lengths[1] else 0,
+            "top": [[_profile_label(value), count] for value, count in top],
+            "histogram": [kind, bins],
+        })
+
+
+def _sample_clause(conn, table, estimate, sample_rows):
+    """A WHERE clause reading about ``sample_rows`` rows: random rowid ranges, or a random filter without rowids."""
+    name = quote_identifier(table)
+    try:
+        low, high = conn.execute(f"SELECT min(rowid), max(rowid) FROM {name}").fetchone()
+    except sqlite3.OperationalError:
+        return "WHERE abs(random() % ?) = 0", (max(1, estimate // sample_rows),)
+    if low is None:
+        return "", ()
+    span = high - low + 1
+    width = max(1, int(span * sample_rows / max(estimate, 1) / PROFILE_SAMPLE_BLOCKS))
+    stratum = span // PROFILE_SAMPLE_BLOCKS
+    if stratum <= width:
+        return "", ()   # the sample would be most of the table anyway
+    rng = random.Random(table)
+    ranges = []
+    for block in range(PROFILE_SAMPLE_BLOCKS):
+        start = low + block * stratum + rng.randrange(max(1, stratum - width + 1))
+        ranges += [start, start + width - 1]
+    return "WHERE " + " OR ".join(["rowid BETWEEN ? AND ?"] * PROFILE_SAMPLE_BLOCKS), tuple(ranges)
+
+
+def profile_columns(conn, table, sample_rows=PROFILE_SAMPLE_ROWS, progress=None):
+    """Profiles every column of ``table`` with one generated aggregate query.
+
+    Per column it computes null count, approximate distinct count, min, max,
+    average of the numeric values, TEXT/BLOB lengths, the most frequent values
+    and a value (or length) histogram, all in the same scan. Tables estimated
+    above ``sample_rows`` rows are read from random rowid ranges instead
+    (``sample_rows`` of 0 or None reads everything); very wide tables take one
+    scan per ``PROFILE_MAX_TERMS`` result columns.
+    """
+    started = time.perf_counter()
+    name = quote_identifier(table)
+    columns = [(row[1], row[2]) for row in conn.execute(f"PRAGMA table_info({name})")]
+    if not columns:
+        raise ValueError(f"No such table: {table}")
+    estimate = estimate_rows(conn, table) or 0
+    where, params = "", ()
+    if sample_rows and estimate > sample_rows:
+        where, params = _sample_clause(conn, table, estimate, sample_rows)
+    if progress:
+        progress(0, None, f"Scanning {'a sample of ' if where else ''}~{min(estimate, sample_rows or estimate):,} rows")
+    conn.create_aggregate("ease_column_sketch", 1, ColumnSketch)
+
+    terms_per_column = 8
+    per_scan = max(1, (PROFILE_MAX_TERMS - 1) // terms_per_column)
+    profiles, scanned = [], 0
+    for first in range(0, len(columns), per_scan):
+        terms = ["count(*)"]
+        for column, _ in columns[first:first + per_scan]:
+            c = quote_identifier(column)
+            text = f"CASE WHEN typeof({c}) IN ('text', 'blob') THEN length({c}) END"
+            terms += [f"count({c})", f"min({c})", f"max({c})",
+                      f"avg(CASE WHEN typeof({c}) IN ('integer', 'real') THEN {c} END)",
+                      f"min({text})", f"max({text})", f"avg({text})", f"ease_column_sketch({c})"]
+        row = conn.execute(f"SELECT {', '.join(terms)} FROM {name} {where}", params).fetchone()
+        scanned = row[0]
+        for i, (column, declared) in enumerate(columns[first:first + per_scan]):
+            count, low, high, average, min_length, max_length, avg_length, sketch = \
+                row[1 + i * terms_per_column:1 + (i + 1) * terms_per_column]
+            sketch = json.loads(sketch)
+            kind, bins = sketch["histogram"]
+            profiles.append(ColumnProfile(
+                column, declared, scanned - count, sketch["distinct"], _profile_label(low), _profile_label(high),
+                average, min_length, max_length, avg_length, [tuple(item) for item in sketch["top"]],
+                (kind, [tuple(item) for item in bins])
+            ))
+    rows = scanned if not where else estimate
+    return TableProfile(table, rows, scanned, bool(where), profiles, time.perf_counter() - started)
+
+
+class ColumnProfileCache:
+    """Keeps each table's last TableProfile until the database changes.
+
+    Entries are checked against the connection's change counter, ``PRAGMA
+    data_version`` (commits by other connections) and the schema cookie, so
+    reopening a profile of an unchanged table costs three lookups.
+    """
+    def __init__(self):
+        self._entries = {}      # table -> (version, sample_rows, TableProfile)
+
+    def invalidate(self):
+        self._entries.clear()
+
+    def get(self, conn, table, sample_rows=PROFILE_SAMPLE_ROWS, progress=None, force=False):
+        version = ResultCache.version(conn)
+        entry = self._entries.get(table)
+        if force or entry is None or entry[:2] != (version, sample_rows):
+            entry = self._entries[table] = (version, sample_rows,
+                                             profile_columns(conn, table, sample_rows, progress))
+        return entry[2]
+
+# =========================================================================
+# 13. Operation Metrics
+# =========================================================================
+SLOW_QUERY_MS = 500             # default slow-query log threshold
+SLOW_LOG_FILE = os.path.join(CONFIG_DIR, "slow_queries.log")
+SLOW_LOG_BYTES = 1 << 20        # size at which the slow-query log is rotated
+SLOW_LOG_BACKUPS = 3
+METRIC_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)   # histogram bucket limits
+MAX_METRIC_KEYS = 2000          # distinct (operation, SQL) pairs tracked; later ones share one entry
+
+_SQL_LITERALS = re.compile(
+    r"""([xX]?'(?:[^']|'')*')|("(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])"""
+    r"""|(?<![\w.$:@?])(?:0[xX][0-9a-fA-F]+|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)(?![\w.])"""
+)
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_SQL_START = re.compile(r"\s*(?:SELECT|WITH|VALUES|INSERT|REPLACE|UPDATE|DELETE|PRAGMA|CREATE|ALTER|DROP|EXPLAIN|"
+                        r"ANALYZE|VACUUM|REINDEX|ATTACH|DETACH|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b",
+                        re.IGNORECASE)
+
+def parameterize_sql(query):
+    """normalize_sql with every string, blob and number literal replaced by ``?``.
+
+    Runs of placeholders in an ``IN (...)`` list collapse to ``IN (?, ...)``, so
+    statements that differ only in their values share one entry.
+    """
+    text = _SQL_LITERALS.sub(lambda m: m.group(2) or "?", normalize_sql(query))
+    return _IN_LISTS.sub("IN (?, ...)", text)
+
+
+def operation_name(func):
+    """``SQLViewer.add_row.job`` for a closure, ``TablePager.fetch_window`` for a bound method."""
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", None) or type(func).__name__
+    return name.replace("<locals>.", "")
+
+
+def job_sql(func, args):
+    """Best-effort SQL of a job: a pager's query, a SQL string argument, or the first of a list of statements."""
+    source = getattr(getattr(func, "__self__", None), "source", None)
+    if isinstance(source, str):
+        return source
+    for arg in args:
+        if isinstance(arg, str) and _SQL_START.match(arg):
+            return arg
+        if isinstance(arg, (list, tuple)) and arg and isinstance(arg[0], (list, tuple)) \
+                and arg[0] and isinstance(arg[0][0], str) and _SQL_START.match(arg[0][0]):
+            return arg[0][0] if len(arg) == 1 else f"{arg[0][0]} -- and {len(arg) - 1} more"
+    return None
+
+
+def result_rows(result):
+    """Rows a job returned: the length of a list, a row count, or a pager's total when known."""
+    if isinstance(result, bool) or result is None:
+        return None
+    if isinstance(result, int):
+        return result
+    if isinstance(result, list):
+        return len(result)
+    total = getattr(result, "total", None)
+    return total if isinstance(total, int) else None
+
+
+class MetricStats:
+    """Aggregates of one (operation, SQL) pair: counts, totals and duration histograms."""
+    __slots__ = ("operation", "sql", "count", "errors", "total", "max", "rows", "render_total", "render_max",
+                 "histogram", "render_histogram")
+
+    def __init__(self, operation, sql):
+        self.operation = operation
+        self.sql = sql
+        self.count = self.errors = self.rows = 0
+        self.total = self.max = self.render_total = self.render_max = 0.0
+        self.histogram = [0] * (len(METRIC_BOUNDS_MS) + 1)
+        self.render_histogram = [0] * (len(METRIC_BOUNDS_MS) + 1)
+
+    @staticmethod
+    def bucket(seconds):
+        ms = seconds * 1000
+        for i, bound in enumerate(METRIC_BOUNDS_MS):
+            if ms <= bound:
+                return i
+        return len(METRIC_BOUNDS_MS)
+
+    def add(self, elapsed, rows=None, render=None, failed=False):
+        self.count += 1
+        self.errors += bool(failed)
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.histogram[self.bucket(elapsed)] += 1
+        if rows:
+            self.rows += rows
+        if render is not None:
+            self.render_total += render
+            self.render_max = max(self.render_max, render)
+            self.render_histogram[self.bucket(render)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the histogram bucket holding the given fraction of calls; None past the last bound."""
+        wanted = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= wanted:
+                return METRIC_BOUNDS_MS[i] if i < len(METRIC_BOUNDS_MS) else None
+        return None
+
+    def to_dict(self):
+        return {
+            "operation": self.operation, "sql": self.sql, "count": self.count, "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3), "mean_ms": round(self.total * 1000 / self.count, 3),
+            "max_ms": round(self.max * 1000, 3), "p50_ms": self.percentile(0.5), "p95_ms": self.percentile(0.95),
+            "rows": self.rows, "render_total_ms": round(self.render_total * 1000, 3),
+            "render_max_ms": round(self.render_max * 1000, 3),
+            "histogram": self.histogram, "render_histogram": self.render_histogram,
+        }
+
+
+class OperationMetrics:
+    """Timings of every database operation, grouped by operation and parameterized SQL.
+
+    ``record()`` may be called from any thread. Calls at or above ``slow_ms``
+    (database plus render time) are also appended to a rotating slow-query
+    log; ``slow_ms`` of 0 or None turns the log off. Rendering is timed by the
+    UI between ``delivering()`` and ``delivered()`` through ``add_render()``.
+    """
+    def __init__(self, slow_ms=SLOW_QUERY_MS, log_path=SLOW_LOG_FILE, max_bytes=SLOW_LOG_BYTES,
+                 backups=SLOW_LOG_BACKUPS):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.started = time.time()
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._log = None
+        self._render = None
+
+    def record(self, operation, sql=None, elapsed=0.0, rows=None, render=None, failed=False, slow_ms=None):
+        """Adds one call; ``slow_ms`` overrides the threshold for it (e.g. per connection profile)."""
+        sql = parameterize_sql(sql) if sql else ""
+        with self._lock:
+            stats = self._stats.get((operation, sql))
+            if stats is None:
+                if len(self._stats) >= MAX_METRIC_KEYS:
+                    sql = "(other statements)"
+                    stats = self._stats.get((operation, sql))
+                if stats is None:
+                    stats = self._stats[(operation, sql)] = MetricStats(operation, sql)
+            stats.add(elapsed, rows, render, failed)
+        threshold = self.slow_ms if slow_ms is None else slow_ms
+        if threshold and (elapsed + (render or 0.0)) * 1000 >= threshold:
+            self._log_slow(operation, sql, elapsed, rows, render, failed)
+
+    def _log_slow(self, operation, sql, elapsed, rows, render, failed):
+        import logging.handlers  # imported here to keep CLI startup fast; only slow operations get here
+        line = (f"{time.strftime('%Y-%m-%d %H:%M:%S')}  {elapsed * 1000:.1f} ms"
+                f"{f' + render {render * 1000:.1f} ms' if render is not None else ''}"
+                f"{f'  rows={rows}' if rows is not None else ''}{'  FAILED' if failed else ''}"
+                f"  {operation}{f'  {sql}' if sql else ''}")
+        with self._lock:
+            try:
+                if self._log is None:
+                    os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                    self._log = logging.handlers.RotatingFileHandler(
+                        self.log_path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8")
+                self._log.handle(logging.makeLogRecord({"msg": line}))
+            except OSError:
+                pass    # a log that cannot be written must never break the operation it measures
+
+    def delivering(self):
+        self._render = 0.0
+
+    def add_render(self, seconds):
+        """Called by the UI for time spent drawing results; counted only while a result is being delivered."""
+        if self._render is not None:
+            self._render += seconds
+
+    def delivered(self):
+        """Render time since ``delivering()``; None when nothing was drawn."""
+        render, self._render = self._render, None
+        return render or None
+
+    def stats(self):
+        """Every MetricStats, slowest total time first."""
+        with self._lock:
+            return sorted(self._stats.values(), key=lambda stats: stats.total, reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+        self.started = time.time()
+
+    def to_dict(self):
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "exported": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sqlite_version": sqlite3.sqlite_version,
+            "slow_ms": self.slow_ms,
+            "bucket_bounds_ms": list(METRIC_BOUNDS_MS),
+            "operations": [stats.to_dict() for stats in self.stats()],
+        }
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+# =========================================================================
+# 14. Command-Line Interface
+# =========================================================================
+def _print_table(out, columns, cursor, width=40):
+    """Aligned text output of a cursor (or any iterable of rows); column widths come from the first batch."""
+    def cell(value):
+        text = "NULL" if value is None else f"<{len(value)} bytes>" if isinstance(value, bytes) else str(value)
+        text = text.replace("\n", " ")
+        return text if len(text) <= width else text[:width - 1] + "…"
+    cursor = iter(cursor)
+    rows = [[cell(v) for v in row] for row in itertools.islice(cursor, EXPORT_BATCH)]
+    widths = [max([len(c)] + [len(row[i]) for row in rows]) for i, c in enumerate(columns)]
+    line = lambda values: "  ".join(v.ljust(w) for v, w in zip(values, widths)).rstrip() + "\n"
+    out.write(line(columns))
+    out.write(line(["-" * w for w in widths]))
+    count = 0
+    while rows:
+        out.write("".join(line(row) for row in rows))
+        count += len(rows)
+        rows = [[cell(v) for v in row] for row in itertools.islice(cursor, EXPORT_BATCH)]
+    return count
+
+
+def _cli_progress(done, total=None, message=None):
+    sys.stderr.write(f"\r{message or done}".ljust(40))
+    sys.stderr.flush()
+
+
+def _cli_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="python -m ease_db",
+        description="Query, inspect and export SQLite databases without the GUI. Run without arguments to start the GUI."
+    )
+    parser.add_argument("database", help="path to the SQLite database file")
+    parser.add_argument("--profile", help="name of a saved connection profile (see the GUI's Connection Options)")
+    parser.add_argument("--read-only", action="store_true", help="open the file with mode=ro")
+    parser.add_argument("--attach", action="append", default=[], metavar="[NAME=]FILE",
+                        help="ATTACH another database so queries can use NAME.table (repeatable)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("tables", help="list tables and views with row counts")
+    schema = commands.add_parser("schema", help="print CREATE statements")
+    schema.add_argument("table", nargs="?")
+
+    query = commands.add_parser("query", help="run a query and print its rows")
+    query.add_argument("sql")
+    query.add_argument("--param", action="append", default=[], help="bound parameter value (repeatable)")
+    query.add_argument("--format", choices=("table", "csv", "jsonl"), default="table")
+
+    run = commands.add_parser("exec", help="run an SQL script in one transaction and commit it")
+    run.add_argument("sql", help="SQL text, or @FILE to read it from a file ('@-' for stdin)")
+
+    export = commands.add_parser("export", help="export tables (or a query result) to files")
+    export.add_argument("target", help="output file (SQL, or --query) or directory (CSV/JSONL tables)")
+    export.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="sql")
+    export.add_argument("--gzip", action="store_true")
+    export.add_argument("--table", action="append", dest="tables", help="table to export (repeatable; default: all)")
+    export.add_argument("--query", help="export the result of this SELECT instead of tables")
+
+    load = commands.add_parser("import", help="load a CSV or JSON Lines file (optionally .gz) into a table")
+    load.add_argument("file")
+    load.add_argument("--table", help="target table (default: the file name); created if missing")
+    load.add_argument("--format", choices=IMPORT_FORMATS, help="default: from the file extension")
+    load.add_argument("--delimiter", help="CSV delimiter (default: detected)")
+    load.add_argument("--no-header", action="store_true", help="the CSV has no header row")
+    load.add_argument("--no-create", action="store_true", help="fail instead of creating a missing table")
+    load.add_argument("--keep-indexes", action="store_true", help="do not drop and rebuild indexes around the load")
+    load.add_argument("--skip", type=int, default=0, help="skip rows already imported (to resume)")
+
+    profile = commands.add_parser("profile", help="run a statement (changes rolled back) and print its measurements")
+    profile.add_argument("sql")
+
+    advise = commands.add_parser("advise", help="suggest indexes for a workload of queries")
+    advise.add_argument("sql", help="queries separated by ';', or @FILE")
+
+    search = commands.add_parser("search", help="full-text search over all text columns (index kept in DATABASE.fts)")
+    search.add_argument("text")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--rebuild", action="store_true", help="re-index every table first")
+
+    commands.add_parser("stats", help="space used per table and index (from dbstat)")
+    describe = commands.add_parser("describe", help="profile a table's columns: nulls, distinct, range, top values")
+    describe.add_argument("table")
+    describe.add_argument("--full", action="store_true", help="scan every row instead of a sample of large tables")
+    maintain = commands.add_parser("maintain", help="run a maintenance operation")
+    maintain.add_argument("action", choices=("vacuum", "incremental-vacuum", "analyze", "optimize",
+                                             "integrity-check", "quick-check"))
+    maintain.add_argument("--into", help="vacuum: write a compacted copy to this new file instead")
+    maintain.add_argument("--auto-vacuum", choices=("none", "full", "incremental"), help="vacuum: change auto_vacuum")
+
+    alter = commands.add_parser("alter", help="drop a column or change its type (rebuilds the table when needed)")
+    alter.add_argument("table")
+    alter.add_argument("--drop-column", metavar="COLUMN")
+    alter.add_argument("--type", nargs=2, metavar=("COLUMN", "TYPE"), help="change the declared type of COLUMN")
+
+    value = commands.add_parser("value", help="stream one TEXT or BLOB value to or from a file")
+    value.add_argument("table")
+    value.add_argument("column")
+    value.add_argument("rowid", type=int)
+    direction = value.add_mutually_exclusive_group(required=True)
+    direction.add_argument("--save", metavar="FILE", help="write the value to FILE")
+    direction.add_argument("--load", metavar="FILE", help="replace the value with the contents of FILE (as a BLOB)")
+    return parser
+
+
+def _read_sql(text):
+    if text.startswith("@"):
+        if text == "@-":
+            return sys.stdin.read()
+        with open(text[1:], encoding="utf-8") as f:
+            return f.read()
+    return text
+
+
+def run_cli(argv):
+    """Entry point of the command-line interface. Returns the process exit code."""
+    args = _cli_parser().parse_args(argv)
+    profiles, active = load_profiles()
+    name = args.profile or active
+    profile = next((p for p in profiles if p.name == name), None)
+    if args.profile and profile is None:
+        sys.stderr.write(f"error: no connection profile named {args.profile!r}\n")
+        return 2
+    profile = profile or ConnectionProfile("SQLite defaults")
+    if args.read_only:
+        profile = ConnectionProfile.from_dict({**profile.to_dict(), "read_only": True})
+    if not os.path.exists(args.database) and args.command not in ("exec", "import"):
+        sys.stderr.write(f"error: {args.database}: no such file\n")
+        return 2
+
+    conn = profile.connect(args.database, create=args.command in ("exec", "import") and not args.read_only)
+    out = sys.stdout
+    try:
+        for spec in args.attach:
+            name, _, path = spec.rpartition("=")
+            attach_database(conn, path, name or None, read_only=args.read_only)
+        if args.command == "tables":
+            catalog = SchemaCatalog().refresh(conn)
+            for table in catalog.table_names():
+                count = conn.execute(f"SELECT count(*) FROM {quote_identifier(table)}").fetchone()[0]
+                out.write(f"{table}\t{count}\n")
+            for view in catalog.views:
+                out.write(f"{view}\tview\n")
+        elif args.command == "schema":
+            query = "SELECT sql FROM sqlite_master WHERE sql NOT NULL AND name NOT LIKE 'sqlite_%'"
+            params = ()
+            if args.table:
+                query += " AND tbl_name = ?"
+                params = (args.table,)
+            for (sql,) in conn.execute(query + " ORDER BY rowid", params):
+                out.write(sql + ";\n")
+        elif args.command == "query":
+            cursor = conn.execute(args.sql, args.param)
+            if cursor.description is None:
+                conn.commit()
+                sys.stderr.write(f"{max(cursor.rowcount, 0)} row(s) affected\n")
+                return 0
+            columns = [d[0] for d in cursor.description]
+            if args.format == "table":
+                count = _print_table(out, columns, cursor)
             else:
-                self.conn.commit()
-                messagebox.showinfo("Success", f"Query executed successfully. Rows affected: {cursor.rowcount}")
-                if query.upper().startswith(("CREATE", "DROP", "ALTER")):
-                    self.populate_table_selector()
-                self.select_table(None) 
-                
-        except Exception as e:
-            messagebox.showerror("Query Error", str(e))
+                count = write_rows(out, args.format, "query_result", columns, cursor)
+            sys.stderr.write(f"{count} row(s)\n")
+        elif args.command == "exec":
+            started = time.perf_counter()
+            try:
+                results = run_script(conn, _read_sql(args.sql))
+            except ScriptFailed as e:
+                sys.stderr.write(f"error: {e} (rolled back)\n")
+                return 1
+            sys.stderr.write(f"{len(results)} statement(s) executed in {time.perf_counter() - started:.2f}s\n")
+        elif args.command == "export":
+            progress = _cli_progress if sys.stderr.isatty() else None
+            if args.query:
+                count = export_query(conn, args.query, args.target, args.format, args.gzip, progress=progress)
+                summary = f"{count} row(s) exported to {args.target}"
+            else:
+                counts = export_database(conn, args.target, args.format, args.tables, args.gzip, progress=progress)
+                summary = f"{len(counts)} table(s), {sum(counts.values())} row(s) exported to {args.target}"
+            sys.stderr.write(("\n" if progress else "") + summary + "\n")
+        elif args.command == "import":
+            table = args.table or re.sub(r'\W', '_', os.path.basename(args.file).split('.')[0])
+            progress = _cli_progress if sys.stderr.isatty() else None
+            newline = "\n" if progress else ""  # ends the progress line
+            started = time.perf_counter()
+            try:
+                count = import_file(conn, args.file, table, args.format, args.delimiter, not args.no_header,
+                                    not args.no_create, defer_indexes=not args.keep_indexes, skip_rows=args.skip,
+                                    progress=progress)
+            except ImportFailed as e:
+                sys.stderr.write(f"{newline}error: {e}\nresume with: --skip {e.rows_done}\n")
+                return 1
+            elapsed = time.perf_counter() - started
+            sys.stderr.write(f"{newline}{count} row(s) imported into {table} "
+                             f"in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)\n")
+        elif args.command == "profile":
+            result = profile_query(conn, args.sql)
+            for label, _, text in result.metrics():
+                if text:
+                    out.write(f"{label:<20}{text}\n")
+            out.write("\n".join(result.plan_lines()) + "\n")
+        elif args.command == "advise":
+            suggestions = advise_indexes(conn, split_statements(_read_sql(args.sql)), SchemaCatalog())
+            for suggestion in suggestions:
+                out.write(f"{suggestion.sql};  -- ~{suggestion.rows_avoided:,} scan rows avoided, "
+                          f"{len(suggestion.queries)} query(s){', covering' if suggestion.covering else ''}\n")
+            if not suggestions:
+                sys.stderr.write("No index would improve these queries.\n")
+        elif args.command == "search":
+            index, catalog = SearchIndex(), SchemaCatalog()
+            progress = _cli_progress if sys.stderr.isatty() else None
+            newline = "\n" if progress else ""
+            indexed = index.sync(conn, catalog, progress=progress, rebuild=args.rebuild)
+            if indexed:
+                sys.stderr.write(f"{newline}{indexed} row(s) indexed\n")
+            for hit in index.search(conn, catalog, args.text, args.limit):
+                out.write(f"{hit.table}\t{hit.rowid}\t{hit.snippet}\n")
+            if index.stale:
+                sys.stderr.write("The database was changed by another program; run with --rebuild to pick up "
+                                 "rows updated in place.\n")
+            index.close(conn)
+        elif args.command == "stats":
+            progress = _cli_progress if sys.stderr.isatty() else None
+            report = storage_report(conn, progress)
+            if progress:
+                sys.stderr.write("\n")
+            out.write(f"{report.file_bytes:,} bytes in {report.page_count:,} pages of {report.page_size:,}; "
+                      f"{report.freelist_count:,} free pages; auto_vacuum={report.auto_vacuum}\n")
+            _print_table(out, ["name", "type", "table", "rows", "pages", "bytes", "unused", "fragmented"],
+                         [(o.name, o.kind, o.table, o.rows, o.pages, o.bytes,
+                           f"{o.unused / o.bytes:.0%}" if o.bytes else "", f"{o.fragmentation:.0%}")
+                          for o in report.objects])
+        elif args.command == "describe":
+            progress = _cli_progress if sys.stderr.isatty() else None
+            newline = "\n" if progress else ""
+            profile = profile_columns(conn, args.table, 0 if args.full else PROFILE_SAMPLE_ROWS, progress)
+            source = (f"a sample of {profile.scanned:,} of ~{profile.rows:,} rows" if profile.sampled
+                      else f"{profile.scanned:,} rows")
+            sys.stderr.write(f"{newline}{source} profiled in {profile.elapsed:.1f}s\n")
+            _print_table(out, ["column", "type", "nulls", "distinct", "min", "max", "avg", "top"],
+                         [(c.name, c.type, f"{c.nulls / (profile.scanned or 1):.0%}", f"~{c.distinct:,}",
+                           c.minimum, c.maximum, c.average if c.average is None else f"{c.average:.6g}",
+                           ", ".join(f"{value} ({count:,})" for value, count in c.top if count > 1))
+                          for c in profile.columns])
+        elif args.command == "maintain":
+            progress = _cli_progress if sys.stderr.isatty() else None
+            newline = "\n" if progress else ""
+            started = time.perf_counter()
+            summary = ""
+            if args.action == "vacuum":
+                vacuum(conn, args.into, args.auto_vacuum, progress=progress)
+            elif args.action == "incremental-vacuum":
+                summary = f"{incremental_vacuum(conn, progress=progress):,} page(s) freed; "
+            elif args.action == "analyze":
+                run_analyze(conn, progress=progress)
+            elif args.action == "optimize":
+                optimize(conn)
+            else:
+                messages = integrity_check(conn, quick=args.action == "quick-check")
+                out.write("\n".join(messages) + "\n")
+                if messages != ["ok"]:
+                    return 1
+            sys.stderr.write(f"{newline}{summary}{args.action} done in {time.perf_counter() - started:.1f}s\n")
+        elif args.command == "alter":
+            if not args.drop_column and not args.type:
+                raise ValueError("nothing to do: give --drop-column and/or --type")
+            progress = _cli_progress if sys.stderr.isatty() else None
+            newline = "\n" if progress else ""
+            started = time.perf_counter()
+            skipped = []
+            if args.drop_column:
+                skipped += drop_column(conn, args.table, args.drop_column, progress=progress)
+            if args.type:
+                skipped += change_column_type(conn, args.table, *args.type, progress=progress)
+            if skipped:
+                sys.stderr.write(f"{newline}dropped with the column: {', '.join(skipped)}\n")
+                newline = ""
+            sys.stderr.write(f"{newline}{args.table} altered in {time.perf_counter() - started:.1f}s\n")
+        elif args.command == "value":
+            progress = _cli_progress if sys.stderr.isatty() else None
+            newline = "\n" if progress else ""
+            if args.save:
+                size = export_value(conn, args.table, args.column, args.rowid, args.save, progress=progress)
+                sys.stderr.write(f"{newline}{size:,} bytes written to {args.save}\n")
+            else:
+                size = import_value(conn, args.table, args.column, args.rowid, args.load, progress=progress)
+                sys.stderr.write(f"{newline}{size:,} bytes stored in {args.table}.{args.column}\n")
+    except BrokenPipeError:
+        pass  # e.g. piped into head
+    except (sqlite3.Error, ValueError, OSError) as e:
+        if conn.in_transaction:
+            conn.rollback()
+        sys.stderr.write(f"error: {e}\n")
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+def main(argv=None):
+    """Runs the CLI when given arguments, otherwise starts the GUI."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run_cli(argv)
+    sys.modules.setdefault("ease_db", sys.modules[__name__])  # ease_gui imports this module, not a second copy
+    import ease_gui
+    ease_gui.main()
+    return 0
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = SQLViewer(root)
-    root.geometry("1000x700")
-    root.mainloop()
+    sys.exit(main())
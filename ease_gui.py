@@ -0,0 +1,3118 @@
+"""Ease-DB desktop GUI: a Tkinter front end over the ease_db core."""
+import difflib
+import os
+import re
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, simpledialog
+import webbrowser
+
+from ease_db import (
+    ChangeWatcher, ColumnProfileCache, ConnectionProfile, DatabaseWorker, EditSession, EXPORT_FORMATS, JobCancelled,
+    LargeValue, OperationMetrics, PREVIEW_CHARS, PROFILE_SAMPLE_ROWS, QueryPager, ResultCache, SchemaCatalog,
+    ScriptFailed, SearchIndex, StorageCache, TablePager, add_column, advise_indexes, apply_changes, attach_database,
+    attached_databases, backup_to_file, change_column_type, create_table, detach_database, drop_column,
+    execute_and_commit, export_database, export_query, export_value, import_file, import_value, incremental_vacuum,
+    index_sql, inspect_import, integrity_check, is_query, load_profiles, make_pager, open_memory_snapshot, optimize,
+    profile_query, quote_identifier, read_column, read_value, rename_column, rename_table, restore_from_file,
+    run_analyze, run_script, save_profiles, split_statements, vacuum, value_info
+)
+
+# =========================================================================
+# 1. Custom Dialog Classes
+# =========================================================================
+class AlterColumnDialog(simpledialog.Dialog):
+    """Custom dialog to get new column name and type preference."""
+    TYPES = ("TEXT", "INTEGER", "REAL", "NUMERIC", "BLOB")
+
+    def __init__(self, parent, column_name, column_type=""):
+        self.column_name = column_name
+        self.column_type = column_type
+        self.new_name = None
+        self.new_type = None
+        self.type_var = tk.StringVar(parent)
+        super().__init__(parent, title=f"Modify Column: {column_name}")
+
+    def body(self, master):
+        main_frame = ttk.Frame(master)
+        main_frame.pack(padx=10, pady=10)
+        
+        ttk.Label(main_frame, text=f"Modifying column: **{self.column_name}**", font=('TkDefaultFont', 10, 'bold')).grid(row=0, columnspan=2, pady=5)
+        
+        ttk.Label(main_frame, text="New Name:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.name_entry = ttk.Entry(main_frame, width=30)
+        self.name_entry.insert(0, self.column_name)
+        self.name_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+
+        ttk.Label(main_frame, text="New Type (Affinity):").grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        
+        type_frame = ttk.Frame(main_frame)
+        type_frame.grid(row=2, column=1, sticky="w", padx=5, pady=5)
+        
+        self.type_var.set(self.column_type)
+
+        types = self.TYPES if self.column_type.upper() in self.TYPES else (self.column_type or "(none)",) + self.TYPES
+        for type_name in types:
+            value = "" if type_name == "(none)" else type_name
+            ttk.Radiobutton(type_frame, text=type_name, variable=self.type_var, value=value).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(main_frame, text="(Changing the type rebuilds the table in the background)", foreground='gray').grid(row=3, columnspan=2)
+
+        return self.name_entry
+
+    def apply(self):
+        self.new_name = self.name_entry.get().strip()
+        self.new_type = self.type_var.get()
+
+class RenameTableDialog(simpledialog.Dialog):
+    def __init__(self, parent, table_list):
+        self.table_list = table_list
+        self.old_name = None
+        self.new_name = None
+        self.selected_table_var = tk.StringVar(parent)
+        super().__init__(parent, title="Rename Table")
+
+    def body(self, master):
+        main_frame = ttk.Frame(master)
+        main_frame.pack(padx=10, pady=10)
+
+        ttk.Label(main_frame, text="Select Table to Rename:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.table_selector = ttk.Combobox(
+            main_frame, 
+            textvariable=self.selected_table_var,
+            values=self.table_list,
+            state="readonly",
+            width=30
+        )
+        if self.table_list:
+             self.table_selector.set(self.table_list[0])
+        self.table_selector.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+
+        ttk.Label(main_frame, text="New Table Name:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.name_entry = ttk.Entry(main_frame, width=30)
+        self.name_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+
+        return self.table_selector
+
+    def apply(self):
+        self.old_name = self.selected_table_var.get()
+        self.new_name = self.name_entry.get().strip()
+
+class ImportDialog(simpledialog.Dialog):
+    """Shows the columns and types inferred from a file and asks where and how to import it."""
+    def __init__(self, parent, source, table_list, default_table):
+        self.source = source
+        self.table_list = table_list
+        self.table = None
+        self.table_var = tk.StringVar(parent, value=default_table)
+        self.header_var = tk.BooleanVar(parent, value=True)
+        self.create_var = tk.BooleanVar(parent, value=True)
+        self.null_var = tk.BooleanVar(parent, value=True)
+        self.defer_var = tk.BooleanVar(parent, value=True)
+        super().__init__(parent, title="Import Data")
+
+    def body(self, master):
+        main_frame = ttk.Frame(master)
+        main_frame.pack(padx=10, pady=10)
+
+        ttk.Label(main_frame, text="Into table:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        table_box = ttk.Combobox(main_frame, textvariable=self.table_var, values=self.table_list, width=28)
+        table_box.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+
+        delimiter = {"\t": "tab", None: "n/a"}.get(self.source.delimiter, self.source.delimiter)
+        ttk.Label(main_frame, text=f"Format: {self.source.fmt.upper()}   Delimiter: {delimiter}").grid(row=1, columnspan=2, sticky="w", padx=5)
+        columns = [f"{name} {kind}" for name, kind in zip(self.source.columns, self.source.types)]
+        preview = ", ".join(columns[:12]) + (f", ... ({len(columns)} columns)" if len(columns) > 12 else "")
+        ttk.Label(main_frame, text=f"Columns: {preview}", wraplength=360, foreground='gray').grid(row=2, columnspan=2, sticky="w", padx=5, pady=5)
+
+        row = 3
+        options = [("Create the table if it does not exist", self.create_var),
+                   ("Rebuild the table's indexes after loading (faster)", self.defer_var)]
+        if self.source.fmt == "csv":
+            options = [("First row is a header", self.header_var), ("Import empty fields as NULL", self.null_var)] + options
+        for text, var in options:
+            ttk.Checkbutton(main_frame, text=text, variable=var).grid(row=row, columnspan=2, sticky="w", padx=5)
+            row += 1
+        return table_box
+
+    def validate(self):
+        if not self.table_var.get().strip():
+            messagebox.showerror("Import", "Enter the name of the target table.", parent=self)
+            return False
+        return True
+
+    def apply(self):
+        self.table = self.table_var.get().strip()
+        self.header = self.header_var.get()
+        self.create = self.create_var.get()
+        self.empty_as_null = self.null_var.get()
+        self.defer_indexes = self.defer_var.get()
+
+class ExportDialog(simpledialog.Dialog):
+    """Asks for the export format, compression and (for whole-database exports) the tables."""
+    def __init__(self, parent, table_list=None, title="Export"):
+        self.table_list = table_list
+        self.fmt = None
+        self.compress = False
+        self.tables = None
+        self.format_var = tk.StringVar(parent, value="sql" if table_list is not None else "csv")
+        self.compress_var = tk.BooleanVar(parent, value=False)
+        super().__init__(parent, title=title)
+
+    def body(self, master):
+        main_frame = ttk.Frame(master)
+        main_frame.pack(padx=10, pady=10)
+
+        ttk.Label(main_frame, text="Format:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        format_frame = ttk.Frame(main_frame)
+        format_frame.grid(row=0, column=1, sticky="w", padx=5, pady=5)
+        for label, value in (("SQL", "sql"), ("CSV", "csv"), ("JSON Lines", "jsonl")):
+            ttk.Radiobutton(format_frame, text=label, variable=self.format_var, value=value).pack(side=tk.LEFT, padx=5)
+
+        ttk.Checkbutton(main_frame, text="Compress with gzip", variable=self.compress_var).grid(row=1, columnspan=2, sticky="w", padx=5, pady=5)
+
+        if self.table_list is not None:
+            ttk.Label(main_frame, text="Tables:").grid(row=2, column=0, sticky="nw", padx=5, pady=5)
+            self.table_box = tk.Listbox(main_frame, selectmode=tk.EXTENDED, height=min(10, max(3, len(self.table_list))), exportselection=False)
+            for name in self.table_list:
+                self.table_box.insert(tk.END, name)
+            self.table_box.select_set(0, tk.END)
+            self.table_box.grid(row=2, column=1, sticky="ew", padx=5, pady=5)
+            ttk.Label(main_frame, text="(Tables are exported in parallel)", foreground='gray').grid(row=3, columnspan=2)
+
+        return format_frame
+
+    def apply(self):
+        self.fmt = self.format_var.get()
+        self.compress = self.compress_var.get()
+        if self.table_list is not None:
+            self.tables = [self.table_list[i] for i in self.table_box.curselection()]
+
+class ConnectionOptionsDialog(simpledialog.Dialog):
+    """Edits connection profiles. Saving under a new name adds a profile; the chosen one becomes active."""
+    CHOICES = {
+        "journal_mode": ("", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+        "synchronous": ("", "OFF", "NORMAL", "FULL", "EXTRA"),
+        "temp_store": ("", "DEFAULT", "FILE", "MEMORY"),
+    }
+    NUMBERS = (("cache_size", "Cache Size (pages, or -KiB):"), ("mmap_size", "mmap Size (bytes):"),
+               ("busy_timeout", "Busy Timeout (ms):"), ("result_cache", "Result Cache (MiB, 0 = off):"),
+               ("slow_query", "Slow Query Log (ms, 0 = off):"))
+
+    def __init__(self, parent, profiles, active, can_reopen=False):
+        self.profiles = profiles
+        self.active = active
+        self.can_reopen = can_reopen
+        self.profile = None
+        self.reopen = False
+        self.name_var = tk.StringVar(parent, value=active)
+        self.vars = {field: tk.StringVar(parent) for field in ConnectionProfile.PRAGMAS + ("busy_timeout", "result_cache", "slow_query")}
+        self.read_only_var = tk.BooleanVar(parent)
+        self.immutable_var = tk.BooleanVar(parent)
+        self.reopen_var = tk.BooleanVar(parent, value=can_reopen)
+        super().__init__(parent, title="Connection Options")
+
+    def body(self, master):
+        main_frame = ttk.Frame(master)
+        main_frame.pack(padx=10, pady=10)
+
+        ttk.Label(main_frame, text="Profile:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.name_box = ttk.Combobox(main_frame, textvariable=self.name_var, values=[p.name for p in self.profiles], width=28)
+        self.name_box.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+        self.name_box.bind("<<ComboboxSelected>>", lambda e: self._load(self.name_var.get()))
+
+        row = 1
+        for field, values in self.CHOICES.items():
+            ttk.Label(main_frame, text=f"{field.replace('_', ' ').title()}:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
+            ttk.Combobox(main_frame, textvariable=self.vars[field], values=values, state="readonly", width=12).grid(row=row, column=1, sticky="w", padx=5, pady=2)
+            row += 1
+        for field, label in self.NUMBERS:
+            ttk.Label(main_frame, text=label).grid(row=row, column=0, sticky="w", padx=5, pady=2)
+            ttk.Entry(main_frame, textvariable=self.vars[field], width=14).grid(row=row, column=1, sticky="w", padx=5, pady=2)
+            row += 1
+
+        ttk.Checkbutton(main_frame, text="Read-only (mode=ro)", variable=self.read_only_var).grid(row=row, columnspan=2, sticky="w", padx=5)
+        ttk.Checkbutton(main_frame, text="Immutable (file never changes; no locking)", variable=self.immutable_var).grid(row=row + 1, columnspan=2, sticky="w", padx=5)
+        if self.can_reopen:
+            ttk.Checkbutton(main_frame, text="Reopen the current database now", variable=self.reopen_var).grid(row=row + 2, columnspan=2, sticky="w", padx=5)
+        ttk.Label(main_frame, text="(Blank fields keep SQLite's defaults)", foreground='gray').grid(row=row + 3, columnspan=2)
+
+        self._load(self.active)
+        return self.name_box
+
+    def _load(self, name):
+        profile = next((p for p in self.profiles if p.name == name), None)
+        if profile is None:
+            return
+        for field, var in self.vars.items():
+            value = getattr(profile, field)
+            var.set("" if value is None else str(value))
+        self.read_only_var.set(bool(profile.read_only))
+        self.immutable_var.set(bool(profile.immutable))
+
+    def validate(self):
+        if not self.name_var.get().strip():
+            messagebox.showerror("Invalid Profile", "Give the profile a name.", parent=self)
+            return False
+        for field, label in self.NUMBERS:
+            value = self.vars[field].get().strip()
+            if value and not re.fullmatch(r"-?\d+", value):
+                messagebox.showerror("Invalid Profile", f"{label.rstrip(':')} must be a whole number.", parent=self)
+                return False
+        return True
+
+    def apply(self):
+        values = {}
+        for field, var in self.vars.items():
+            value = var.get().strip()
+            values[field] = (int(value) if field in dict(self.NUMBERS) else value) if value else None
+        self.profile = ConnectionProfile(self.name_var.get().strip(), read_only=self.read_only_var.get(),
+                                         immutable=self.immutable_var.get(), **values)
+        self.reopen = self.can_reopen and self.reopen_var.get()
+
+class CreateIndexDialog(simpledialog.Dialog):
+    """Asks for the table, key columns, name and uniqueness of a new index."""
+    def __init__(self, parent, tables, table=None, columns=()):
+        self.tables = tables
+        self.sql = None
+        self.table_var = tk.StringVar(parent, value=table or (next(iter(tables), "")))
+        self.columns_var = tk.StringVar(parent, value=", ".join(columns))
+        self.name_var = tk.StringVar(parent)
+        self.unique_var = tk.BooleanVar(parent, value=False)
+        super().__init__(parent, title="New Index")
+
+    def body(self, master):
+        main_frame = ttk.Frame(master)
+        main_frame.pack(padx=10, pady=10)
+        ttk.Label(main_frame, text="Table:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        table_box = ttk.Combobox(main_frame, textvariable=self.table_var, values=list(self.tables), state="readonly", width=28)
+        table_box.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+        table_box.bind("<<ComboboxSelected>>", lambda e: self.hint.set(", ".join(self.tables[self.table_var.get()])))
+        ttk.Label(main_frame, text="Columns (key order):").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        columns_entry = ttk.Entry(main_frame, textvariable=self.columns_var, width=30)
+        columns_entry.grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+        self.hint = tk.StringVar(value=", ".join(self.tables.get(self.table_var.get(), ())))
+        ttk.Label(main_frame, textvariable=self.hint, foreground='gray', wraplength=260).grid(row=2, column=1, sticky="w", padx=5)
+        ttk.Label(main_frame, text="Name (optional):").grid(row=3, column=0, sticky="w", padx=5, pady=5)
+        ttk.Entry(main_frame, textvariable=self.name_var, width=30).grid(row=3, column=1, sticky="ew", padx=5, pady=5)
+        ttk.Checkbutton(main_frame, text="Unique", variable=self.unique_var).grid(row=4, columnspan=2, sticky="w", padx=5)
+        return columns_entry
+
+    def validate(self):
+        table = self.table_var.get()
+        columns = [c.strip() for c in self.columns_var.get().split(",") if c.strip()]
+        unknown = [c for c in columns if c not in self.tables.get(table, ())]
+        if not table or not columns or unknown:
+            message = f"Unknown column(s): {', '.join(unknown)}" if unknown else "Choose a table and at least one column."
+            messagebox.showerror("Invalid Index", message, parent=self)
+            return False
+        self.columns = columns
+        return True
+
+    def apply(self):
+        self.sql = index_sql(self.table_var.get(), self.columns, self.name_var.get().strip() or None, self.unique_var.get())
+
+
+# =========================================================================
+# 2. Result Grid
+# =========================================================================
+class ResultGrid(ttk.Frame):
+    """Treeview that only holds the rows currently on screen.
+
+    The vertical scrollbar is driven by the pager's row count rather than by the
+    Treeview's own items; scrolling re-renders the visible window from the pager.
+    ``decorate(key, values)`` may return replacement values and tags for a row, and
+    ``extra_rows()`` may return (iid, values, tags) rows shown after the last one.
+    Clicking a heading calls ``on_sort(column)``; pressing Return in the filter
+    row under the headings calls ``on_filter({column: text})``. ``on_render(seconds)``
+    is told how long each redraw took. ``close_pager(pager)`` releases a pager the
+    grid no longer shows; its cursor belongs to the worker thread, so it is closed there.
+    """
+    ROW_TAGS = {"edited": "#fff3b0", "deleted": "#f8c0c0", "inserted": "#c8f0c8"}
+    SORT_ARROWS = {False: " \u25b2", True: " \u25bc"}
+
+    def __init__(self, master, request_rows, decorate=None, extra_rows=None, request_keys=None,
+                 on_sort=None, on_filter=None, on_render=None, close_pager=None):
+        super().__init__(master)
+        self.on_render = on_render
+        self.close_pager = close_pager
+        self.request_rows = request_rows
+        self.request_keys = request_keys
+        self.decorate = decorate
+        self.extra_rows = extra_rows
+        self.on_sort = on_sort
+        self.on_filter = on_filter
+        self.sort = None            # (column, descending) shown as an arrow in the heading
+        self.filters = {}           # column -> StringVar of the filter row
+        self.pager = None
+        self.offset = 0
+        self.visible = 20
+        self._selected_keys = set()
+        self._rendering = False
+        self._pending = False
+        self._stale = False
+        self._shown = {}
+        self._anchor = None
+
+        self.notice = ttk.Label(self, foreground="#a06000", anchor=tk.W)
+        self.filter_bar = tk.Frame(self, height=24)
+        self.tree = ttk.Treeview(self, show="headings", selectmode="extended")
+        for tag, colour in self.ROW_TAGS.items():
+            self.tree.tag_configure(tag, background=colour)
+        self.vsb = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.hsb = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self._on_xscroll)
+
+        if self.on_filter:
+            self.filter_bar.grid(row=1, column=0, sticky="ew")
+        self.tree.grid(row=2, column=0, sticky="nsew")
+        self.vsb.grid(row=2, column=1, sticky="ns")
+        self.hsb.grid(row=3, column=0, sticky="ew")
+        self.rowconfigure(2, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.tree.bind("<Down>", self._on_key_down)
+        self.tree.bind("<Up>", self._on_key_up)
+        self.tree.bind("<Next>", lambda e: self.scroll_by(self.visible) or "break")
+        self.tree.bind("<Prior>", lambda e: self.scroll_by(-self.visible) or "break")
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Button-1>", self._on_click, add=True)
+        self.tree.bind("<Shift-Button-1>", self._on_shift_click)
+        self.tree.bind("<Control-a>", lambda e: self.select_all() or "break")
+        self.tree.bind("<ButtonRelease-1>", lambda e: self._layout_filters(), add=True)  # column resized
+
+    def load(self, pager, keep_view=False):
+        """Shows a new result set, starting at the top.
+
+        With ``keep_view`` (a re-sorted or re-filtered view of the same result)
+        column widths and filter texts are kept if the columns are unchanged.
+        """
+        if pager is not self.pager:
+            self._release_pager()
+        same_columns = keep_view and list(self.tree["columns"]) == list(pager.columns)
+        self.pager = pager
+        self.offset = 0
+        self._pending = self._stale = False
+        self._anchor = None
+        self._selected_keys.clear()
+        self.tree.delete(*self.tree.get_children())
+        if not same_columns:
+            self.tree["columns"] = pager.columns
+        for col in pager.columns:
+            arrow = self.SORT_ARROWS[self.sort[1]] if self.sort and self.sort[0] == col else ""
+            command = (lambda c=col: self.on_sort(c)) if self.on_sort else ""
+            self.tree.heading(col, text=col + arrow, command=command)
+            if not same_columns:
+                self.tree.column(col, width=100, anchor=tk.W)
+        if not same_columns:
+            self._build_filters(pager.columns)
+        self.refresh()
+
+    def show_notice(self, text):
+        """Shows a warning line above the grid; an empty text hides it."""
+        self.notice.configure(text=text)
+        if text:
+            self.notice.grid(row=0, column=0, columnspan=2, sticky="ew")
+        else:
+            self.notice.grid_remove()
+
+    def _build_filters(self, columns):
+        for child in self.filter_bar.winfo_children():
+            child.destroy()
+        self.filters = {}
+        if not self.on_filter:
+            return
+        for col in columns:
+            var = tk.StringVar()
+            entry = ttk.Entry(self.filter_bar, textvariable=var)
+            entry.bind("<Return>", lambda e: self._apply_filters())
+            entry.bind("<Escape>", lambda e, v=var: (v.set(""), self._apply_filters()))
+            self.filters[col] = var
+        self._layout_filters()
+
+    def _apply_filters(self):
+        self.on_filter({col: var.get() for col, var in self.filters.items() if var.get().strip()})
+
+    def _on_xscroll(self, first, last):
+        self.hsb.set(first, last)
+        self._layout_filters()
+
+    def _layout_filters(self):
+        """Lines the filter entries up under their column headings, following horizontal scrolling."""
+        entries = self.filter_bar.winfo_children()
+        if not entries:
+            return
+        widths = [int(self.tree.column(col, "width")) for col in self.tree["columns"]]
+        x = -int(float(self.tree.xview()[0]) * sum(widths))
+        for entry, width in zip(entries, widths):
+            entry.place(x=x, y=0, width=width, height=24)
+            x += width
+
+    def _release_pager(self):
+        if self.pager is not None and hasattr(self.pager, "close"):
+            if self.close_pager is not None:
+                self.close_pager(self.pager)
+            else:
+                self.pager.close()
+
+    def clear(self):
+        self._release_pager()
+        self.pager = None
+        self._pending = self._stale = False
+        self._shown = {}
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = []
+        self._build_filters([])
+        self.show_notice("")
+        self._update_scrollbar()
+
+    def detach(self):
+        """Empties the grid without closing its pager, which another database tab keeps. Returns (pager, offset)."""
+        pager, offset = self.pager, self.offset
+        self.pager = None
+        self.clear()
+        return pager, offset
+
+    def refresh(self):
+        """Re-renders the current window, fetching from the database if needed."""
+        if self.pager is None:
+            return
+        start, count = self.offset, self.visible + 1
+        rows = self.pager.cached_window(start, count)
+        if rows is not None:
+            self._render(self.pager, start, rows)
+        elif self._pending:
+            self._stale = True  # one fetch at a time; catch up with the latest offset afterwards
+        else:
+            self._pending = True
+            self.request_rows(self.pager, start, count, lambda rows, p=self.pager, s=start: self._fetched(p, s, rows))
+
+    def _fetched(self, pager, start, rows):
+        if pager is not self.pager:
+            return
+        self._pending = False
+        if rows is not None:
+            self._render(pager, start, rows)
+        if self._stale:
+            self._stale = False
+            self.refresh()
+
+    def _render(self, pager, start, rows):
+        if pager is not self.pager or start != self.offset:
+            return
+        started = time.perf_counter()
+        items = []
+        for key, values in rows:
+            tags = ()
+            if self.decorate:
+                values, tags = self.decorate(key, values)
+            items.append((str(key), values, tags))
+        wanted = self.visible + 1
+        if pager.total is not None and len(items) < wanted and self.extra_rows:
+            skip = max(0, start - pager.total)
+            items.extend(self.extra_rows()[skip:skip + wanted - len(items)])
+
+        # Patch the existing items instead of rebuilding them: rows that stay on
+        # screen keep their item, only changed values are re-set.
+        self._rendering = True
+        try:
+            wanted = {iid for iid, _, _ in items}
+            gone = [iid for iid in self.tree.get_children() if iid not in wanted]
+            if gone:
+                self.tree.delete(*gone)
+            shown = {}
+            for index, (iid, values, tags) in enumerate(items):
+                if iid in self._shown and self.tree.exists(iid):
+                    if self._shown[iid] != (values, tags):
+                        self.tree.item(iid, values=values, tags=tags)
+                    if self.tree.index(iid) != index:
+                        self.tree.move(iid, "", index)
+                else:
+                    self.tree.insert("", index, iid=iid, values=values, tags=tags)
+                shown[iid] = (values, tags)
+            self._shown = shown
+            on_screen = [iid for iid in shown if iid in self._selected_keys]
+            self.tree.selection_set(on_screen)
+        finally:
+            self._rendering = False
+        self._update_scrollbar()
+        if self.on_render:
+            self.on_render(time.perf_counter() - started)
+
+    def row_values(self, iid):
+        """Returns the (un-stringified) values shown for a visible row, or None."""
+        shown = self._shown.get(iid)
+        return shown[0] if shown else None
+
+    def selected_iids(self):
+        """Every selected row, including rows scrolled out of view."""
+        return list(self._selected_keys)
+
+    def deselect(self, iids):
+        self._selected_keys.difference_update(iids)
+
+    def select_all(self):
+        self._select_range(0, self.row_count() - 1)
+
+    def _index_of(self, iid):
+        children = self.tree.get_children()
+        return self.offset + children.index(iid) if iid in children else None
+
+    def _on_click(self, event):
+        if not event.state & 0x0004:  # plain click (no Ctrl) starts a new selection
+            self._selected_keys = set()
+        iid = self.tree.identify_row(event.y)
+        if iid:
+            self._anchor = self._index_of(iid)
+
+    def _on_shift_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if not iid or self._anchor is None:
+            return None
+        index = self._index_of(iid)
+        self._select_range(min(self._anchor, index), max(self._anchor, index))
+        return "break"
+
+    def _select_range(self, first, last):
+        """Selects rows [first, last] by position, fetching only their keys when they are off screen."""
+        if self.pager is None or last < first:
+            return
+        pager = self.pager
+        known = pager.known_rows() if pager.total is not None else None
+        extra = self.extra_rows() if (known is not None and self.extra_rows) else []
+
+        def select(keys):
+            if keys is None or pager is not self.pager:
+                return
+            chosen = {str(key) for key in keys}
+            if known is not None and last >= known:
+                chosen.update(iid for iid, _, _ in extra[max(0, first - known):last - known + 1])
+            self._selected_keys = chosen
+            self._rendering = True
+            try:
+                self.tree.selection_set([iid for iid in self.tree.get_children() if iid in chosen])
+            finally:
+                self._rendering = False
+
+        count = (min(last, known - 1) if known is not None else last) - first + 1
+        cached = pager.cached_window(first, count) if count > 0 else []
+        if cached is not None:
+            select(key for key, _ in cached)
+        elif self.request_keys:
+            self.request_keys(pager, first, count, select)
+
+    def row_count(self):
+        if self.pager is None:
+            return 0
+        total = self.pager.known_rows()
+        if self.pager.total is not None and self.extra_rows:
+            total += len(self.extra_rows())
+        return total
+
+    def _update_scrollbar(self):
+        total = self.row_count()
+        if total <= 0:
+            self.vsb.set(0.0, 1.0)
+            return
+        first = self.offset / total
+        last = min(1.0, (self.offset + self.visible) / total)
+        self.vsb.set(first, last)
+
+    def scroll_to(self, offset):
+        if self.pager is None:
+            return
+        total = self.row_count()
+        upper = max(0, total - self.visible) if self.pager.total is not None else max(0, total)
+        offset = max(0, min(int(offset), upper))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def reveal(self, offset, key):
+        """Scrolls row ``offset`` into view and selects it (``key`` is its pager key)."""
+        self._selected_keys = {str(key)}
+        self._anchor = offset
+        self.scroll_to(offset)
+        self.refresh()
+
+    def scroll_by(self, delta):
+        self.scroll_to(self.offset + delta)
+
+    def _on_scrollbar(self, action, *args):
+        if self.pager is None:
+            return
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * self.row_count())
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll_by(amount * (self.visible if unit == "pages" else 1))
+
+    def _on_mousewheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - rowheight) // rowheight)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+
+    def _on_key_down(self, event):
+        children = self.tree.get_children()
+        if children and self.tree.focus() == children[-1]:
+            self.scroll_by(1)
+            children = self.tree.get_children()
+            if children:
+                self.tree.focus(children[-1])
+                self.tree.selection_set(children[-1])
+            return "break"
+
+    def _on_key_up(self, event):
+        children = self.tree.get_children()
+        if children and self.tree.focus() == children[0] and self.offset > 0:
+            self.scroll_by(-1)
+            children = self.tree.get_children()
+            if children:
+                self.tree.focus(children[0])
+                self.tree.selection_set(children[0])
+            return "break"
+
+    def _on_select(self, event):
+        if self._rendering:
+            return
+        on_screen = set(self.tree.get_children())
+        self._selected_keys = (self._selected_keys - on_screen) | set(self.tree.selection())
+
+# =========================================================================
+# 3. Query Profiler Panel
+# =========================================================================
+PROFILE_HISTORY = 20
+
+class ProfilerPanel(ttk.Frame):
+    """Shows the last profiled runs; picking a second run puts the two side by side."""
+    def __init__(self, master, on_close=None):
+        super().__init__(master)
+        self.runs = []
+        self._numbers = 0
+        self.run_var = tk.StringVar()
+        self.compare_var = tk.StringVar()
+
+        bar = ttk.Frame(self)
+        bar.pack(fill=tk.X)
+        ttk.Label(bar, text="Run:").pack(side=tk.LEFT)
+        self.run_box = ttk.Combobox(bar, textvariable=self.run_var, state="readonly", width=18)
+        self.run_box.pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(bar, text="Compare with:").pack(side=tk.LEFT)
+        self.compare_box = ttk.Combobox(bar, textvariable=self.compare_var, state="readonly", width=18)
+        self.compare_box.pack(side=tk.LEFT, padx=2)
+        if on_close:
+            ttk.Button(bar, text="Close", width=6, command=on_close).pack(side=tk.RIGHT)
+        for box in (self.run_box, self.compare_box):
+            box.bind("<<ComboboxSelected>>", lambda e: self.show())
+
+        self.tree = ttk.Treeview(self, columns=("a", "b", "change"), height=10)
+        self.tree.heading("#0", text="")
+        self.tree.heading("a", text="Run A")
+        self.tree.heading("b", text="Run B")
+        self.tree.heading("change", text="Change")
+        self.tree.column("#0", width=130, stretch=False)
+        self.tree.column("a", width=220)
+        self.tree.column("b", width=220)
+        self.tree.column("change", width=70, stretch=False)
+        self.tree.tag_configure("differs", background="#fff2cc")
+        self.tree.tag_configure("section", font=('TkDefaultFont', 9, 'bold'))
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+    def add(self, profile):
+        """Records a run; it is compared with the previous run of the same query, if any."""
+        self._numbers += 1
+        profile.number = self._numbers
+        previous = next((run for run in reversed(self.runs) if run.query == profile.query), None)
+        self.runs = (self.runs + [profile])[-PROFILE_HISTORY:]
+        self._update_choices()
+        self.run_var.set(self._label(profile))
+        self.compare_var.set(self._label(previous) if previous else "")
+        self.show()
+
+    def update_run(self, profile):
+        if profile in self.runs:
+            self.show()
+
+    def _label(self, profile):
+        query = " ".join(profile.query.split())
+        return f"#{profile.number}: {query[:40]}"
+
+    def _update_choices(self):
+        labels = [self._label(run) for run in reversed(self.runs)]
+        self.run_box["values"] = labels
+        self.compare_box["values"] = [""] + labels
+
+    def _find(self, label):
+        return next((run for run in self.runs if self._label(run) == label), None)
+
+    def show(self):
+        run_a, run_b = self._find(self.run_var.get()), self._find(self.compare_var.get())
+        self.tree.delete(*self.tree.get_children())
+        if run_a is None:
+            return
+        self.tree.heading("a", text=f"Run #{run_a.number}")
+        self.tree.heading("b", text=f"Run #{run_b.number}" if run_b else "")
+
+        section = self.tree.insert("", tk.END, text="Timings", open=True, tags=("section",))
+        metrics_b = run_b.metrics() if run_b else [(None, None, "")] * len(run_a.metrics())
+        for (label, value_a, text_a), (_, value_b, text_b) in zip(run_a.metrics(), metrics_b):
+            change = ""
+            if value_a is not None and value_b:
+                change = f"{(value_a - value_b) / value_b:+.0%}"
+            self.tree.insert(section, tk.END, text=label, values=(text_a, text_b, change))
+
+        self._insert_lines("Query plan", run_a.plan_lines(), run_b.plan_lines() if run_b else None)
+        self._insert_lines("Trace", run_a.trace, run_b.trace if run_b else None)
+
+    def _insert_lines(self, title, lines_a, lines_b):
+        """Lists two texts side by side, aligned on their common lines; differing lines are highlighted."""
+        section = self.tree.insert("", tk.END, text=title, open=True, tags=("section",))
+        if lines_b is None:
+            for line in lines_a:
+                self.tree.insert(section, tk.END, values=(line, "", ""))
+            return
+        matcher = difflib.SequenceMatcher(a=lines_a, b=lines_b, autojunk=False)
+        for op, a1, a2, b1, b2 in matcher.get_opcodes():
+            for i in range(max(a2 - a1, b2 - b1)):
+                line_a = lines_a[a1 + i] if a1 + i < a2 else ""
+                line_b = lines_b[b1 + i] if b1 + i < b2 else ""
+                tags = () if op == "equal" else ("differs",)
+                self.tree.insert(section, tk.END, values=(line_a, line_b, ""), tags=tags)
+
+# =========================================================================
+# 4. Index Window
+# =========================================================================
+QUERY_HISTORY = 100
+
+class IndexWindow(tk.Toplevel):
+    """Lists the indexes, runs ANALYZE, and suggests new indexes for a query workload.
+
+    Every database operation goes through ``run_job`` so index builds run on the
+    worker in the background and can be cancelled from the main window.
+    """
+    def __init__(self, master, run_job, catalog, workload):
+        super().__init__(master)
+        self.title("Indexes")
+        self.geometry("820x560")
+        self.run_job = run_job
+        self.catalog = catalog
+        self.suggestions = []
+
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # --- Existing indexes ---
+        index_tab = ttk.Frame(notebook)
+        notebook.add(index_tab, text="Indexes")
+        buttons = ttk.Frame(index_tab)
+        buttons.pack(fill=tk.X, pady=(0, 5))
+        ttk.Button(buttons, text="New Index...", command=self.new_index).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Drop Index", command=self.drop_index).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="ANALYZE", command=self.analyze).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Refresh", command=self.refresh).pack(side=tk.RIGHT)
+        self.index_tree = ttk.Treeview(index_tab, columns=("table", "columns", "unique", "origin"), selectmode="browse")
+        for column, heading, width in (("#0", "Index", 200), ("table", "Table", 150), ("columns", "Columns", 250),
+                                       ("unique", "Unique", 60), ("origin", "Origin", 120)):
+            self.index_tree.heading(column, text=heading)
+            self.index_tree.column(column, width=width)
+        self.index_tree.pack(fill=tk.BOTH, expand=True)
+
+        # --- Advisor ---
+        advisor_tab = ttk.Frame(notebook)
+        notebook.add(advisor_tab, text="Advisor")
+        ttk.Label(advisor_tab, text="Workload (queries run in this session; paste more, separated by ';'):").pack(anchor="w")
+        self.workload_text = tk.Text(advisor_tab, height=6)
+        self.workload_text.insert("1.0", ";\n".join(q.rstrip(";") for q in workload) + (";" if workload else ""))
+        self.workload_text.pack(fill=tk.X)
+        buttons = ttk.Frame(advisor_tab)
+        buttons.pack(fill=tk.X, pady=5)
+        ttk.Button(buttons, text="Analyze Workload", command=self.advise).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Create Selected Index", command=self.create_suggestion).pack(side=tk.LEFT, padx=5)
+        self.suggestion_tree = ttk.Treeview(advisor_tab, columns=("rows", "queries", "covering"), height=6, selectmode="browse")
+        for column, heading, width in (("#0", "Suggested index", 440), ("rows", "Scan rows avoided", 120),
+                                       ("queries", "Queries helped", 100), ("covering", "Covering", 70)):
+            self.suggestion_tree.heading(column, text=heading)
+            self.suggestion_tree.column(column, width=width)
+        self.suggestion_tree.pack(fill=tk.X)
+        self.suggestion_tree.bind("<<TreeviewSelect>>", lambda e: self._show_plans())
+        self.plan_text = tk.Text(advisor_tab, height=10, state=tk.DISABLED)
+        self.plan_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+
+        self.refresh()
+
+    def refresh(self):
+        self.index_tree.delete(*self.index_tree.get_children())
+        origins = {"c": "CREATE INDEX", "u": "UNIQUE constraint", "pk": "PRIMARY KEY"}
+        for index in sorted(self.catalog.indexes.values(), key=lambda i: (i.table, i.name)):
+            self.index_tree.insert("", tk.END, iid=index.name, text=index.name, values=(
+                index.table, ", ".join(index.columns), "yes" if index.unique else "",
+                origins.get(index.origin, index.origin) + (" (partial)" if index.partial else "")
+            ))
+
+    def _changed(self, message=None):
+        if not self.winfo_exists():
+            return
+        self.refresh()
+        if message:
+            messagebox.showinfo("Indexes", message, parent=self)
+
+    def new_index(self, table=None, columns=()):
+        tables = {name: info.column_names for name, info in self.catalog.tables.items() if not info.virtual}
+        if not tables:
+            messagebox.showwarning("No Tables", "The database has no tables to index.", parent=self)
+            return
+        dialog = CreateIndexDialog(self, tables, table, columns)
+        if dialog.sql:
+            self.run_job(execute_and_commit, dialog.sql, on_done=lambda _: self._changed("Index created."),
+                         error_title="Index Error", error_prefix="Failed to create index", label="Building index")
+
+    def drop_index(self):
+        selection = self.index_tree.selection()
+        if not selection:
+            return
+        index = self.catalog.indexes.get(selection[0])
+        if index is None or index.origin != "c":
+            messagebox.showwarning("Drop Index", "Indexes created by PRIMARY KEY or UNIQUE constraints cannot be dropped.", parent=self)
+            return
+        if messagebox.askyesno("Confirm Drop", f"Drop index '{index.name}'?", parent=self):
+            self.run_job(execute_and_commit, f"DROP INDEX {quote_identifier(index.name)}", on_done=lambda _: self._changed(),
+                         error_title="Index Error", error_prefix="Failed to drop index", label="Dropping index")
+
+    def analyze(self):
+        self.run_job(run_analyze, on_done=lambda _: self._changed("Statistics updated."),
+                     error_title="ANALYZE Error", label="Running ANALYZE", progress=True)
+
+    def advise(self):
+        queries = split_statements(self.workload_text.get("1.0", tk.END))
+        if not queries:
+            messagebox.showwarning("No Workload", "Enter the queries to analyze.", parent=self)
+            return
+        self.run_job(advise_indexes, queries, self.catalog, on_done=self._show_suggestions,
+                     error_title="Advisor Error", label="Analyzing workload", progress=True)
+
+    def _show_suggestions(self, suggestions):
+        if not self.winfo_exists():
+            return
+        self.suggestions = suggestions
+        self.suggestion_tree.delete(*self.suggestion_tree.get_children())
+        for number, suggestion in enumerate(suggestions):
+            self.suggestion_tree.insert("", tk.END, iid=str(number), text=suggestion.sql, values=(
+                f"~{suggestion.rows_avoided:,}", len(suggestion.queries), "yes" if suggestion.covering else ""
+            ))
+        if suggestions:
+            self.suggestion_tree.selection_set("0")
+        else:
+            self._set_plan_text("No index would improve these queries.")
+
+    def _show_plans(self):
+        selection = self.suggestion_tree.selection()
+        if not selection:
+            return
+        suggestion = self.suggestions[int(selection[0])]
+        lines = []
+        for query, (before, after) in suggestion.plans.items():
+            lines.append(query)
+            lines += ["  before: " + detail for _, _, detail in before]
+            lines += ["  after:  " + detail.replace("ease_advisor_candidate", "<new index>") for _, _, detail in after]
+            lines.append("")
+        self._set_plan_text("\n".join(lines))
+
+    def _set_plan_text(self, text):
+        self.plan_text.configure(state=tk.NORMAL)
+        self.plan_text.delete("1.0", tk.END)
+        self.plan_text.insert("1.0", text)
+        self.plan_text.configure(state=tk.DISABLED)
+
+    def create_suggestion(self):
+        selection = self.suggestion_tree.selection()
+        if selection:
+            suggestion = self.suggestions[int(selection[0])]
+            self.new_index(suggestion.table, suggestion.columns)
+
+# =========================================================================
+# 5. Search Window
+# =========================================================================
+class SearchWindow(tk.Toplevel):
+    """Ranked full-text hits across every table; double-click a hit to open its row.
+
+    The first search builds the FTS5 side index (in the background, with
+    progress and Cancel in the main window); later searches only index what changed.
+    """
+    def __init__(self, master, run_job, search_index, catalog, on_open):
+        super().__init__(master)
+        self.title("Search Database")
+        self.geometry("760x460")
+        self.run_job = run_job
+        self.search_index = search_index
+        self.catalog = catalog
+        self.on_open = on_open
+        self.hits = []
+
+        bar = ttk.Frame(self)
+        bar.pack(fill=tk.X, padx=5, pady=5)
+        self.search_text = tk.StringVar()
+        entry = ttk.Entry(bar, textvariable=self.search_text)
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        entry.bind("<Return>", lambda e: self.search())
+        entry.focus_set()
+        ttk.Button(bar, text="Search", command=self.search).pack(side=tk.LEFT, padx=5)
+        ttk.Button(bar, text="Rebuild Index", command=self.rebuild).pack(side=tk.LEFT)
+        self.summary = ttk.Label(self, foreground="gray")
+        self.summary.pack(fill=tk.X, padx=5)
+        self.tree = ttk.Treeview(self, columns=("table", "rowid", "match"), show="headings", selectmode="browse")
+        for column, heading, width in (("table", "Table", 140), ("rowid", "Row", 80), ("match", "Match", 500)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "match")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.tree.bind("<Double-1>", lambda e: self.open_hit())
+        self.tree.bind("<Return>", lambda e: self.open_hit())
+
+    def search(self, text=None):
+        if text is not None:
+            self.search_text.set(text)
+        text = self.search_text.get().strip()
+        if not text:
+            return
+        started = time.perf_counter()
+        self.run_job(self.search_index.search, self.catalog, text,
+                     on_done=lambda hits: self._show(hits, time.perf_counter() - started),
+                     error_title="Search Error", label="Searching", progress=True)
+
+    def rebuild(self):
+        def job(conn, progress):
+            return self.search_index.sync(conn, self.catalog, progress, rebuild=True)
+        self.run_job(job, on_done=self._rebuilt, error_title="Search Error", label="Rebuilding search index",
+                     progress=True)
+
+    def _rebuilt(self, rows):
+        if self.winfo_exists():
+            self.summary.configure(text=f"Index rebuilt: {rows:,} rows.", foreground="gray")
+
+    def _show(self, hits, elapsed):
+        if not self.winfo_exists():
+            return
+        self.hits = hits
+        self.tree.delete(*self.tree.get_children())
+        for i, hit in enumerate(hits):
+            self.tree.insert("", tk.END, iid=str(i), values=(hit.table, hit.rowid, hit.snippet.replace("\n", " ")))
+        summary = f"{len(hits)} hit(s) in {elapsed * 1000:.0f} ms" if hits else "No matches."
+        if self.search_index.stale:
+            summary += " Another program changed the database; rows it updated in place are only found after Rebuild Index."
+        self.summary.configure(text=summary, foreground="darkorange" if self.search_index.stale else "gray")
+
+    def open_hit(self):
+        selection = self.tree.selection()
+        if selection:
+            hit = self.hits[int(selection[0])]
+            self.on_open(hit.table, hit.rowid)
+
+# =========================================================================
+# 6. Storage Window
+# =========================================================================
+def format_bytes(size):
+    for unit in ("bytes", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:,} {unit}" if unit == "bytes" else f"{size:,.1f} {unit}"
+        size /= 1024
+
+
+class StorageWindow(tk.Toplevel):
+    """Space used per table and index (from dbstat), plus VACUUM, ANALYZE and integrity checks.
+
+    The statistics are computed on the worker and cached until the database
+    changes, so reopening the window is instant. Maintenance runs in the
+    background with progress and Cancel in the main window.
+    """
+    COLUMNS = (("name", "Name", 180), ("kind", "Type", 60), ("table", "Table", 140), ("rows", "Rows", 90),
+               ("pages", "Pages", 70), ("size", "Size", 90), ("unused", "Unused", 70), ("fragmented", "Fragmented", 80))
+
+    def __init__(self, master, run_job, cache):
+        super().__init__(master)
+        self.title("Database Statistics")
+        self.geometry("860x560")
+        self.run_job = run_job
+        self.cache = cache
+
+        self.summary = ttk.Label(self, anchor=tk.W)
+        self.summary.pack(fill=tk.X, padx=5, pady=(5, 0))
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in self.COLUMNS], show="headings", selectmode="browse")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=tk.W if column in ("name", "kind", "table") else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        buttons = ttk.Frame(self)
+        buttons.pack(fill=tk.X, padx=5)
+        ttk.Button(buttons, text="Refresh", command=lambda: self.refresh(force=True)).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="VACUUM", command=self.vacuum).pack(side=tk.LEFT, padx=(10, 0))
+        self.auto_vacuum = tk.StringVar(value="unchanged")
+        ttk.Label(buttons, text="auto_vacuum:").pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Combobox(buttons, textvariable=self.auto_vacuum, state="readonly", width=11,
+                     values=("unchanged", "none", "full", "incremental")).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="VACUUM INTO...", command=self.vacuum_into).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Incremental Vacuum", command=self.incremental_vacuum).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="ANALYZE", command=self.analyze).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Button(buttons, text="Optimize", command=self.optimize).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Integrity Check", command=self.integrity_check).pack(side=tk.LEFT)
+        self.output = tk.Text(self, height=6, state=tk.DISABLED)
+        self.output.pack(fill=tk.X, padx=5, pady=5)
+
+        self.refresh()
+
+    def refresh(self, force=False):
+        def job(conn, progress):
+            return self.cache.get(conn, progress, force=force)
+        self.run_job(job, on_done=self._show, error_title="Statistics Error",
+                     label="Reading storage statistics", progress=True)
+
+    def _show(self, report):
+        if not self.winfo_exists():
+            return
+        self.summary.configure(text=(
+            f"{format_bytes(report.file_bytes)} in {report.page_count:,} pages of {report.page_size:,} bytes   "
+            f"Free: {report.freelist_count:,} pages ({format_bytes(report.free_bytes)})   "
+            f"auto_vacuum: {report.auto_vacuum}   (read in {report.elapsed:.2f}s)"))
+        self.tree.delete(*self.tree.get_children())
+        for o in report.objects:
+            self.tree.insert("", tk.END, values=(
+                o.name, o.kind, o.table, f"{o.rows:,}", f"{o.pages:,}", format_bytes(o.bytes),
+                f"{o.unused / o.bytes:.0%}" if o.bytes else "", f"{o.fragmentation:.0%}"))
+
+    def _log(self, text):
+        if not self.winfo_exists():
+            return
+        self.output.configure(state=tk.NORMAL)
+        self.output.insert(tk.END, text + "\n")
+        self.output.see(tk.END)
+        self.output.configure(state=tk.DISABLED)
+
+    def _done(self, text):
+        self._log(text)
+        if self.winfo_exists():
+            self.refresh()
+
+    def vacuum(self):
+        mode = self.auto_vacuum.get()
+        mode = None if mode == "unchanged" else mode
+        if not messagebox.askyesno("VACUUM", "Rebuild the whole database file? This needs free disk space about "
+                                   "the size of the database and blocks other writers while it runs.", parent=self):
+            return
+        self.run_job(vacuum, None, mode, on_done=lambda _: self._done("VACUUM finished."),
+                     error_title="VACUUM Error", label="Running VACUUM", progress=True)
+
+    def vacuum_into(self):
+        target = filedialog.asksaveasfilename(parent=self, title="VACUUM INTO", defaultextension=".db",
+                                              filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")])
+        if not target:
+            return
+        if os.path.exists(target):
+            os.remove(target)  # the dialog already asked before overwriting
+        self.run_job(vacuum, target, on_done=lambda _: self._log(f"Compacted copy written to {target}."),
+                     error_title="VACUUM Error", label="Running VACUUM INTO", progress=True)
+
+    def incremental_vacuum(self):
+        self.run_job(incremental_vacuum, on_done=lambda pages: self._done(f"incremental_vacuum freed {pages:,} pages."),
+                     error_title="Vacuum Error", label="Running incremental_vacuum", progress=True)
+
+    def analyze(self):
+        self.run_job(run_analyze, on_done=lambda _: self._done("ANALYZE finished."),
+                     error_title="ANALYZE Error", label="Running ANALYZE", progress=True)
+
+    def optimize(self):
+        self.run_job(optimize, on_done=lambda _: self._done("PRAGMA optimize finished."),
+                     error_title="Optimize Error", label="Running PRAGMA optimize")
+
+    def integrity_check(self):
+        self.run_job(integrity_check, on_done=lambda messages: self._log("integrity_check: " + "\n".join(messages)),
+                     error_title="Integrity Check Error", label="Running integrity_check")
+
+# =========================================================================
+# 7. Value Window
+# =========================================================================
+def hex_dump(data, width=16):
+    lines = []
+    for offset in range(0, len(data), width):
+        chunk = data[offset:offset + width]
+        text = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        lines.append(f"{offset:08x}  {chunk.hex(' '):<{width * 3}} {text}")
+    return "\n".join(lines)
+
+
+class ValueWindow(tk.Toplevel):
+    """Shows one TEXT or BLOB cell and saves it to, or replaces it from, a file.
+
+    Only the first ``VIEW_LIMIT`` characters (bytes) are loaded for display.
+    Saving and replacing stream the value through blob I/O on the worker, with
+    progress and Cancel in the main window; a replacement is committed at once.
+    """
+    VIEW_LIMIT = 65536
+
+    def __init__(self, master, run_job, table, column, key, key_column="rowid", on_replaced=None):
+        super().__init__(master)
+        self.title(f"{table}.{column}")
+        self.geometry("760x480")
+        self.run_job = run_job
+        self.table = table
+        self.column = column
+        self.key = key
+        self.key_column = key_column
+        self.on_replaced = on_replaced
+
+        self.summary = ttk.Label(self, anchor=tk.W)
+        self.summary.pack(fill=tk.X, padx=5, pady=(5, 0))
+        frame = ttk.Frame(self)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.text = tk.Text(frame, wrap=tk.CHAR, font="TkFixedFont", state=tk.DISABLED)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.text.yview)
+        self.text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        buttons = ttk.Frame(self)
+        buttons.pack(fill=tk.X, padx=5, pady=(0, 5))
+        ttk.Button(buttons, text="Save to File...", command=self.save).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Replace from File...", command=self.replace).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+
+        self.load()
+
+    def load(self):
+        def job(conn):
+            info = value_info(conn, self.table, self.column, self.key, self.key_column)
+            return info, read_value(conn, self.table, self.column, self.key, self.key_column, limit=self.VIEW_LIMIT)
+
+        self.run_job(job, on_done=self._show, error_title="Value Error", error_prefix="Failed to read value")
+
+    def _show(self, result):
+        if not self.winfo_exists():
+            return
+        (kind, size), value = result
+        if kind == "blob":
+            content, summary = hex_dump(value), f"BLOB, {format_bytes(size)}"
+        else:
+            content = "" if value is None else str(value)
+            summary = f"{kind.upper()}, {size:,} characters" if kind == "text" else kind.upper()
+        if kind in ("blob", "text") and size > self.VIEW_LIMIT:
+            summary += f"  (showing the first {self.VIEW_LIMIT:,}; save to a file for the whole value)"
+        self.summary.configure(text=summary)
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", content)
+        self.text.configure(state=tk.DISABLED)
+
+    def save(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Save Value", initialfile=self.column)
+        if not path:
+            return
+        self.run_job(export_value, self.table, self.column, self.key, path, self.key_column,
+                     on_done=lambda size: messagebox.showinfo("Saved", f"{size:,} bytes written to {path}", parent=self),
+                     error_title="Save Error", error_prefix="Failed to save value", label="Saving value", progress=True)
+
+    def replace(self):
+        path = filedialog.askopenfilename(parent=self, title="Replace Value From File")
+        if not path:
+            return
+        if not messagebox.askyesno("Replace Value", f"Replace this value with the contents of {os.path.basename(path)}? "
+                                   "The change is saved immediately.", parent=self):
+            return
+
+        def job(conn, progress):
+            size = import_value(conn, self.table, self.column, self.key, path, self.key_column, progress)
+            head = read_value(conn, self.table, self.column, self.key, self.key_column, limit=PREVIEW_CHARS)
+            return LargeValue(head, size) if size > PREVIEW_CHARS else head
+
+        def replaced(value):
+            if self.on_replaced:
+                self.on_replaced(value)
+            if self.winfo_exists():
+                self.load()
+
+        self.run_job(job, on_done=replaced, error_title="Replace Error", error_prefix="Failed to replace value",
+                     label="Replacing value", progress=True)
+
+# =========================================================================
+# 8. Attach Window
+# =========================================================================
+class AttachWindow(tk.Toplevel):
+    """Lists the databases ATTACHed to the open one and attaches or detaches files.
+
+    Attached tables are queried as ``schema.table``, so one statement can join
+    across files; ``other_files`` offers the files open in the other tabs.
+    """
+    def __init__(self, master, run_job, other_files=()):
+        super().__init__(master)
+        self.title("Attached Databases")
+        self.geometry("620x320")
+        self.run_job = run_job
+
+        self.tree = ttk.Treeview(self, columns=("name", "file"), show="headings", selectmode="browse")
+        for column, heading, width in (("name", "Schema", 120), ("file", "File", 460)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "file")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        options = ttk.Frame(self)
+        options.pack(fill=tk.X, padx=5)
+        ttk.Label(options, text="Schema name:").pack(side=tk.LEFT)
+        self.schema_name = tk.StringVar()
+        ttk.Entry(options, textvariable=self.schema_name, width=16).pack(side=tk.LEFT, padx=5)
+        self.read_only = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options, text="Read-only", variable=self.read_only).pack(side=tk.LEFT, padx=5)
+        ttk.Label(options, text="query attached tables as schema.table", foreground="gray").pack(side=tk.RIGHT)
+
+        bar = ttk.Frame(self)
+        bar.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(bar, text="Attach File...", command=self.attach_file).pack(side=tk.LEFT)
+        self.open_file = tk.StringVar()
+        if other_files:
+            ttk.Combobox(bar, textvariable=self.open_file, values=list(other_files), state="readonly",
+                         width=30).pack(side=tk.LEFT, padx=(10, 5))
+            ttk.Button(bar, text="Attach", command=lambda: self.attach(self.open_file.get())).pack(side=tk.LEFT)
+        ttk.Button(bar, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(bar, text="Detach", command=self.detach).pack(side=tk.RIGHT, padx=5)
+        self.load()
+
+    def load(self):
+        self.run_job(attached_databases, on_done=self._show, error_title="Attach Error")
+
+    def _show(self, databases):
+        if not self.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for name, path in databases:
+            self.tree.insert("", tk.END, iid=name, values=(name, path))
+
+    def attach_file(self):
+        path = filedialog.askopenfilename(
+            parent=self, filetypes=[("SQLite DB", "*.db *.sqlite"), ("All Files", "*.*")]
+        )
+        self.attach(path)
+
+    def attach(self, path):
+        if not path:
+            return
+        name = self.schema_name.get().strip() or None
+        self.run_job(attach_database, path, name, self.read_only.get(),
+                     on_done=lambda _: (self.schema_name.set(""), self.load()),
+                     error_title="Attach Error", error_prefix="Failed to attach database")
+
+    def detach(self):
+        selection = self.tree.selection()
+        if selection:
+            self.run_job(detach_database, selection[0], on_done=lambda _: self.load(),
+                         error_title="Attach Error", error_prefix="Failed to detach database")
+
+# =========================================================================
+# 9. Metrics Window
+# =========================================================================
+class MetricsWindow(tk.Toplevel):
+    """Aggregated timings of every database operation since start (or the last reset).
+
+    Rows are grouped by operation and parameterized SQL, slowest total first;
+    the histograms behind them are exported as JSON.
+    """
+    COLUMNS = (("operation", "Operation", 200), ("sql", "SQL", 320), ("count", "Calls", 60),
+               ("mean", "Mean ms", 70), ("p95", "p95 ms", 60), ("max", "Max ms", 70), ("rows", "Rows", 80),
+               ("render", "Render ms", 80))
+
+    def __init__(self, master, metrics):
+        super().__init__(master)
+        self.title("Operation Metrics")
+        self.geometry("1000x420")
+        self.metrics = metrics
+
+        self.summary = ttk.Label(self, foreground="gray")
+        self.summary.pack(fill=tk.X, padx=5, pady=(5, 0))
+        frame = ttk.Frame(self)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.tree = ttk.Treeview(frame, columns=[c[0] for c in self.COLUMNS], show="headings")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "sql",
+                             anchor=tk.W if column in ("operation", "sql") else tk.E)
+        vsb = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        bar = ttk.Frame(self)
+        bar.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(bar, text="Refresh", command=self.load).pack(side=tk.LEFT)
+        ttk.Button(bar, text="Export JSON...", command=self.export).pack(side=tk.LEFT, padx=5)
+        ttk.Button(bar, text="Open Slow-Query Log", command=self.open_log).pack(side=tk.LEFT)
+        ttk.Button(bar, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(bar, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+        self.load()
+
+    def load(self):
+        self.tree.delete(*self.tree.get_children())
+        stats = self.metrics.stats()
+        for i, entry in enumerate(stats):
+            p95 = entry.percentile(0.95)
+            render = f"{entry.render_total * 1000 / entry.count:,.1f}" if entry.render_max else ""
+            self.tree.insert("", tk.END, iid=str(i), values=(
+                entry.operation, entry.sql, f"{entry.count:,}", f"{entry.total * 1000 / entry.count:,.1f}",
+                "" if p95 is None else f"<={p95:,}", f"{entry.max * 1000:,.1f}", f"{entry.rows:,}", render
+            ))
+        calls = sum(entry.count for entry in stats)
+        self.summary.configure(text=f"{calls:,} call(s) in {len(stats)} group(s). Calls slower than the connection "
+                                    f"profile's threshold are logged to {self.metrics.log_path}")
+
+    def export(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json"), ("All Files", "*.*")])
+        if not path:
+            return
+        try:
+            self.metrics.export_json(path)
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export metrics: {e}", parent=self)
+
+    def open_log(self):
+        if not os.path.exists(self.metrics.log_path):
+            messagebox.showinfo("Slow-Query Log", "Nothing has been slow enough to be logged yet.", parent=self)
+            return
+        webbrowser.open_new("file://" + os.path.abspath(self.metrics.log_path))
+
+    def reset(self):
+        self.metrics.reset()
+        self.load()
+
+# =========================================================================
+# 10. Column Profile Window
+# =========================================================================
+def format_profile_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:,.6g}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value).replace("\n", " ")
+
+
+class ColumnProfileWindow(tk.Toplevel):
+    """Null share, distinct count, range, top values and a histogram for every column of one table.
+
+    All columns are computed by one aggregate scan on the worker (a sample of
+    large tables unless *Sample large tables* is cleared) and cached until the
+    database changes; select a column to draw its histogram.
+    """
+    COLUMNS = (("column", "Column", 130), ("type", "Type", 70), ("nulls", "Null %", 60), ("distinct", "Distinct", 80),
+               ("min", "Min", 120), ("max", "Max", 120), ("avg", "Avg", 80), ("length", "Length", 110),
+               ("top", "Top Values", 280))
+
+    def __init__(self, master, run_job, cache, table):
+        super().__init__(master)
+        self.title(f"Column Profile: {table}")
+        self.geometry("1080x520")
+        self.run_job = run_job
+        self.cache = cache
+        self.table = table
+        self.profile = None
+
+        bar = ttk.Frame(self)
+        bar.pack(fill=tk.X, padx=5, pady=5)
+        self.sample = tk.BooleanVar(value=True)
+        ttk.Checkbutton(bar, text=f"Sample large tables (~{PROFILE_SAMPLE_ROWS:,} rows)", variable=self.sample,
+                        command=self.load).pack(side=tk.LEFT)
+        ttk.Button(bar, text="Refresh", command=lambda: self.load(force=True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(bar, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+        self.summary = ttk.Label(self, foreground="gray")
+        self.summary.pack(fill=tk.X, padx=5)
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in self.COLUMNS], show="headings", selectmode="browse",
+                                 height=10)
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "top",
+                             anchor=tk.E if column in ("nulls", "distinct", "avg") else tk.W)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self._draw_histogram())
+        self.canvas = tk.Canvas(self, height=150, background="white", highlightthickness=0)
+        self.canvas.pack(fill=tk.X, padx=5, pady=(0, 5))
+        self.canvas.bind("<Configure>", lambda e: self._draw_histogram())
+        self.load()
+
+    def load(self, force=False):
+        sample_rows = PROFILE_SAMPLE_ROWS if self.sample.get() else 0
+
+        def job(conn, progress):
+            return self.cache.get(conn, self.table, sample_rows, progress, force=force)
+        self.run_job(job, on_done=self._show, error_title="Profile Error", error_prefix="Failed to profile columns",
+                     label="Profiling columns", progress=True)
+
+    def _show(self, profile):
+        if not self.winfo_exists():
+            return
+        self.profile = profile
+        self.tree.delete(*self.tree.get_children())
+        scanned = profile.scanned or 1
+        for i, column in enumerate(profile.columns):
+            length = ""
+            if column.max_length is not None:
+                length = f"{column.min_length:,}-{column.max_length:,}, avg {column.avg_length:,.1f}"
+            top = ", ".join(f"{format_profile_value(value)} ({count:,})" for value, count in column.top if count > 1)
+            self.tree.insert("", tk.END, iid=str(i), values=(
+                column.name, column.type, f"{column.nulls * 100 / scanned:.1f}", f"~{column.distinct:,}",
+                format_profile_value(column.minimum), format_profile_value(column.maximum),
+                format_profile_value(column.average), length, top
+            ))
+        source = (f"a sample of {profile.scanned:,} of ~{profile.rows:,} rows" if profile.sampled
+                  else f"all {profile.scanned:,} rows")
+        self.summary.configure(text=f"{len(profile.columns)} column(s) profiled from {source} in "
+                                    f"{profile.elapsed:.2f}s. Distinct counts are estimates.")
+        if profile.columns:
+            self.tree.selection_set("0")
+
+    def _draw_histogram(self):
+        self.canvas.delete("all")
+        selection = self.tree.selection()
+        if self.profile is None or not selection:
+            return
+        column = self.profile.columns[int(selection[0])]
+        kind, bins = column.histogram
+        width, height = self.canvas.winfo_width(), int(self.canvas["height"])
+        if not bins:
+            self.canvas.create_text(width // 2, height // 2, text="No values", fill="gray")
+            return
+        self.canvas.create_text(5, 3, anchor="nw", text=f"{kind.title()} histogram of {column.name}", fill="gray")
+        peak = max(count for _, _, count in bins) or 1
+        slot = (width - 10) / len(bins)
+        top, bottom = 20, height - 18
+        for i, (low, high, count) in enumerate(bins):
+            x0 = 5 + i * slot
+            y0 = bottom - (bottom - top) * count / peak
+            self.canvas.create_rectangle(x0 + 2, y0, x0 + slot - 2, bottom, fill="#7aa6d6", outline="")
+            self.canvas.create_text(x0 + slot / 2, y0 - 1, anchor="s", text=f"{count:,}", font=("TkDefaultFont", 7))
+            label = format_profile_value(low) if low == high else f"{format_profile_value(low)}-{format_profile_value(high)}"
+            self.canvas.create_text(x0 + slot / 2, bottom + 2, anchor="n", text=label, font=("TkDefaultFont", 7))
+
+# =========================================================================
+# 11. Main Viewer/Editor Class
+# =========================================================================
+class SQLViewer:
+    WATCH_INTERVAL = 1000       # ms between checks for commits by other programs
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Ease-DB")
+
+        # --- Variables ---
+        self._reset_tab_state()
+        self.tab_states = {}        # tab id -> stashed state of each database tab not on screen
+        self.metrics = OperationMetrics()   # shared by all tabs
+        self.metrics_window = None
+        self.selected_table = tk.StringVar()
+        self.status_text = tk.StringVar(value="No database open.")
+        self.pending_text = tk.StringVar()
+        self.buffer_edits = tk.BooleanVar(value=False)
+        self.settings_text = tk.StringVar()
+        self.rollback_on_error = tk.BooleanVar(value=True)
+        self.profiles, active = load_profiles()
+        self.profile = next((p for p in self.profiles if p.name == active), self.profiles[0])
+
+        # --- Menu Bar Setup ---
+        menubar = tk.Menu(root)
+        root.config(menu=menubar)
+        
+        # File Menu
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Open Database", command=self.open_file)
+        file_menu.add_command(label="Create New Database", command=self.create_db)
+        file_menu.add_command(label="Add New Table", command=self.add_table)
+        file_menu.add_command(label="Close Database", accelerator="Ctrl+W", command=self.close_database)
+        file_menu.add_separator()
+        file_menu.add_command(label="Save", command=lambda: self.save_file(False))
+        file_menu.add_command(label="Save As...", command=lambda: self.save_file(True))
+        file_menu.add_separator()
+        file_menu.add_command(label="Open Snapshot in Memory...", command=self.open_memory_snapshot)
+        file_menu.add_command(label="Restore From File...", command=self.restore_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Export Tables...", command=self.export_tables)
+        file_menu.add_command(label="Export Query Result...", command=self.export_query_result)
+        file_menu.add_command(label="Import CSV/JSONL...", command=self.import_data)
+        file_menu.add_separator()
+        file_menu.add_command(label="Connection Options...", command=self.connection_options)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.close)
+        
+        # Edit Menu (Main Menu)
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo_edit)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo_edit)
+        edit_menu.add_checkbutton(label="Buffer Edits Until Save", variable=self.buffer_edits, command=self._on_buffer_toggle)
+        edit_menu.add_command(label="Discard Pending Changes", command=self.discard_edits)
+        edit_menu.add_separator()
+        self._populate_edit_menu(edit_menu)
+
+        # Tools Menu
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        tools_menu.add_command(label="Indexes and Advisor...", command=self.show_indexes)
+        tools_menu.add_command(label="Search Database...", command=self.search_database)
+        tools_menu.add_command(label="Database Statistics and Maintenance...", command=self.show_storage)
+        tools_menu.add_command(label="Column Profile...", command=self.show_column_profile)
+        tools_menu.add_command(label="Attached Databases...", command=self.show_attached)
+        tools_menu.add_command(label="Operation Metrics...", command=self.show_metrics)
+
+        # Help Menu
+        help_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Help", menu=help_menu)
+        help_menu.add_command(label="About Ease-DB", command=self.show_about) # Updated method
+        help_menu.add_command(label="Documentation", command=self.open_docs)
+
+        # --- Database Tabs (one per open database; the widgets below show the selected one) ---
+        self.db_tabs = ttk.Notebook(root)
+        self.db_tabs.pack(fill=tk.X, padx=5, pady=(5, 0))
+        self.active_tab = self._new_tab()
+        self.db_tabs.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        root.bind("<Control-w>", lambda e: self.close_database())
+
+        # --- Control Frame ---
+        control_frame = ttk.Frame(root)
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        # Table Selector
+        ttk.Label(control_frame, text="Select Table:").pack(side=tk.LEFT, padx=(0, 5))
+        self.table_selector = ttk.Combobox(
+            control_frame, 
+            textvariable=self.selected_table,
+            state="readonly",
+            width=25
+        )
+        self.table_selector.pack(side=tk.LEFT, padx=(0, 10))
+        self.table_selector.bind("<<ComboboxSelected>>", self.select_table)
+
+        # Global search (full-text, across all tables)
+        self.search_text = tk.StringVar()
+        search_entry = ttk.Entry(control_frame, textvariable=self.search_text, width=30)
+        search_entry.pack(side=tk.RIGHT)
+        search_entry.bind("<Return>", lambda e: self.search_database())
+        ttk.Label(control_frame, text="Search database:").pack(side=tk.RIGHT, padx=(0, 5))
+
+        # Query Entry (the profiler panel opens to its right)
+        query_frame = ttk.Frame(root)
+        query_frame.pack(fill=tk.X, padx=5, pady=5)
+        self.profiler = ProfilerPanel(query_frame, on_close=lambda: self.profiler.pack_forget())
+        self.profiler.tree.configure(height=6)
+        self.query_text = tk.Text(query_frame, height=4)
+        self.query_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        button_frame = ttk.Frame(root)
+        button_frame.pack(pady=5)
+        run_button = tk.Button(button_frame, text="Run Query", command=self.run_query)
+        run_button.pack(side=tk.LEFT, padx=2)
+        tk.Button(button_frame, text="Profile Query", command=self.profile_query).pack(side=tk.LEFT, padx=2)
+        ttk.Checkbutton(button_frame, text="Roll back script on error",
+                        variable=self.rollback_on_error).pack(side=tk.LEFT, padx=(10, 2))
+
+        # --- Status Bar (packed before the grid so it keeps its space) ---
+        status_frame = ttk.Frame(root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=(0, 5))
+        ttk.Label(status_frame, textvariable=self.status_text, anchor=tk.W).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Label(status_frame, textvariable=self.pending_text, foreground="#a06000").pack(side=tk.LEFT, padx=5)
+        ttk.Label(status_frame, textvariable=self.settings_text, foreground="gray").pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT)
+        self.progress_bar = ttk.Progressbar(status_frame, length=160, mode="determinate")
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+
+        # --- Treeview Setup ---
+        # The first tab browses and edits; scripts add a tab per result set and a Messages tab.
+        self.results = ttk.Notebook(root)
+        self.results.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.result_grid = ResultGrid(self.results, self.fetch_rows, decorate=self._decorate_row,
+                                      extra_rows=self._pending_rows, request_keys=self.fetch_keys,
+                                      on_sort=self.sort_by, on_filter=self.filter_by, on_render=self.metrics.add_render,
+                                      close_pager=self._close_pager)
+        self.results.add(self.result_grid, text="Results")
+        self.script_log = tk.Text(self.results, state=tk.DISABLED, wrap=tk.NONE)
+        self.tree = self.result_grid.tree
+        self.tree.bind("<Double-1>", self.on_cell_double_click)
+        self.tree.bind("<Control-z>", lambda e: self.undo_edit())
+        self.tree.bind("<Control-y>", lambda e: self.redo_edit())
+        
+        # --- Right-Click Context Menu Setup ---
+        self.context_menu = tk.Menu(root, tearoff=0)
+        self._populate_edit_menu(self.context_menu)
+        self.tree.bind("<Button-3>", self.show_context_menu)
+
+        root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(50, self._poll_worker)
+        self.root.after(self.WATCH_INTERVAL, self._watch_changes)
+
+    def _populate_edit_menu(self, menu):
+        """Helper function to populate both the main Edit menu and the context menu."""
+        menu.add_command(label="Add Column", command=lambda: self.add_structural_element('column'))
+        menu.add_command(label="Modify Selected Column", command=self.show_alter_column_dialog)
+        menu.add_command(label="Modify Table Name", command=self.show_rename_table_dialog)
+        menu.add_separator()
+        menu.add_command(label="Add Row", command=self.add_row)
+        menu.add_command(label="Add Rows...", command=self.add_rows)
+        menu.add_command(label="Delete Selected Rows", command=self.delete_row)
+        menu.add_command(label="Delete Column (Warning)", command=lambda: self.delete_structural_element('column'))
+        menu.add_separator()
+        
+        menu.add_command(label="Copy Selected Cell", command=lambda: self.copy_data('cell'))
+        menu.add_command(label="Copy Selected Row", command=lambda: self.copy_data('row'))
+        menu.add_command(label="Copy Selected Column", command=lambda: self.copy_data('column'))
+
+    def show_context_menu(self, event):
+        """Displays the right-click menu at the cursor position."""
+        try:
+            self.context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            self.context_menu.grab_release()
+
+    # =====================================================================
+    # BACKGROUND JOBS
+    # =====================================================================
+    def run_job(self, func, *args, on_done=None, error_title="Error", error_prefix=None, label="", progress=False,
+                on_result=None, sql=None):
+        """Queues ``func(conn, *args)`` on the database worker; errors are shown in a messagebox.
+
+        ``sql`` names the statement a closure runs, for the operation metrics.
+        """
+        def on_error(e):
+            if isinstance(e, JobCancelled):
+                return
+            message = f"{error_prefix}: {e}" if error_prefix else str(e)
+            messagebox.showerror(error_title, message)
+        return self.worker.submit(func, *args, on_done=on_done, on_error=on_error, label=label, progress=progress,
+                                  on_result=on_result, sql=sql)
+
+    def cancel_job(self):
+        if self.worker:
+            self.worker.cancel()
+
+    def _close_pager(self, pager):
+        """Closes a replaced pager's cursor on the worker, after any fetch already queued for it."""
+        if self.worker:
+            self.worker.submit(lambda conn: pager.close())
+        else:
+            pager.close()
+
+    def _poll_worker(self):
+        # Only the tab on screen is polled. Background tabs keep running their jobs, but
+        # results wait in their worker's queue until the tab is shown again, so every
+        # callback finds its own database's state on self.
+        if self.worker:
+            self.worker.poll()
+        self.root.after(50, self._poll_worker)
+
+    def _watch_changes(self):
+        """Asks the idle worker whether another program committed to the database."""
+        if self.worker and self.change_watcher and not self.worker.busy:
+            self.worker.submit(self.change_watcher.check, on_done=self._external_change)
+        self.root.after(self.WATCH_INTERVAL, self._watch_changes)
+
+    def _external_change(self, result):
+        """Brings the view up to date after another program wrote, re-reading only the rows on screen.
+
+        The table selector is refreshed only when the schema changed; then the
+        view is re-run as a whole, since its columns may be different.
+        """
+        data_changed, schema_changed = result
+        if schema_changed:
+            self.populate_table_selector()
+            if self.view_query is not None:
+                self._reload_view()
+            return
+        grid = self.result_grid
+        pager = grid.pager
+        if not data_changed or self.view_query is None or not hasattr(pager, "refresh_window"):
+            return
+
+        def refreshed(result):
+            if pager is not grid.pager:
+                return
+            grid.refresh()  # from the re-read pages; only rows whose values differ are touched
+            self.status_text.set(f"Changed by another program; {len(result[1])} row(s) on screen updated.")
+            self.worker.submit(pager.count, on_done=lambda _: (grid.scroll_to(grid.offset), self._after_count(pager)))
+
+        self.worker.submit(pager.refresh_window, grid.offset, grid.visible + 1, on_done=refreshed)
+
+    def _on_worker_event(self, kind, job, payload):
+        """Mirrors the state of labelled (user-visible) jobs in the status bar."""
+        if not job.label:
+            return
+        if kind == "started":
+            self.status_text.set(f"{job.label}...")
+            self.progress_bar.configure(mode="indeterminate", value=0)
+            self.progress_bar.start(15)
+            self.cancel_button.configure(state=tk.NORMAL)
+        elif kind == "progress":
+            done, total, message = payload
+            if total:
+                self.progress_bar.stop()
+                self.progress_bar.configure(mode="determinate", maximum=total, value=done)
+            text = message or f"{job.vm_steps:,} VM steps"
+            self.status_text.set(f"{job.label}... {text}")
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate", value=0)
+            if not self.worker.busy:
+                self.cancel_button.configure(state=tk.DISABLED)
+            elapsed = time.monotonic() - job.started if job.started else 0.0
+            outcome = {"done": "done", "error": "failed", "cancelled": "cancelled"}[kind]
+            self.status_text.set(f"{job.label} {outcome} ({elapsed:.2f}s)")
+
+    def _open_worker(self, filepath, connect=None, create=False, new_tab=False):
+        """Connects the current tab's database worker to ``filepath``.
+
+        Files are opened with the active connection profile; ``connect`` overrides it
+        (in-memory snapshots), ``create`` ignores the profile's read-only flags. With
+        ``new_tab`` a database already open stays open in its own tab.
+        """
+        catalog = SchemaCatalog()
+        profile = self.profile
+        worker = DatabaseWorker(
+            connect or (lambda: profile.connect(filepath, create=create)),
+            on_event=self._on_worker_event,
+            after_job=catalog.refresh,
+            metrics=self.metrics,
+            slow_ms=profile.slow_query_ms
+        )
+        if new_tab and self.worker:
+            self.tab_states[self.active_tab] = self._stash_tab()
+            self.active_tab = self._new_tab()
+            self.db_tabs.select(self.active_tab)
+        else:
+            self._close_worker()
+        self.catalog = catalog
+        self.worker = worker
+        self.worker.call(self.catalog.refresh)
+        self.search_index = SearchIndex()
+        self.storage_cache = StorageCache()
+        self.column_profiles = ColumnProfileCache()
+        self.result_cache = ResultCache(profile.result_cache_bytes)
+        self.change_watcher = ChangeWatcher()
+        self.worker.call(self.change_watcher.check)
+        self.filepath = filepath
+        self.root.title("Ease-DB")
+        self.status_text.set(filepath or "In-memory database (unsaved)")
+        self.settings_text.set(self.worker.call(profile.describe) if connect is None else "")
+        self.table_selector["values"] = ()
+        self.selected_table.set("")
+        self._update_tab_title()
+
+    # =====================================================================
+    # DATABASE TABS
+    # =====================================================================
+    # State of the database on screen; _stash_tab and _restore_tab swap it per tab.
+    TAB_STATE = ("worker", "catalog", "edits", "filepath", "query_history", "view_query", "view_order", "view_filters",
+                 "script_tabs", "index_window", "search_index", "search_window", "storage_cache", "storage_window",
+                 "attach_window", "value_windows", "column_profiles", "column_profile_window", "result_cache",
+                 "change_watcher", "import_resume")
+
+    def _reset_tab_state(self):
+        self.worker = None
+        self.catalog = SchemaCatalog()
+        self.edits = EditSession()
+        self.filepath = None
+        self.query_history = []
+        self.view_query = None      # the SELECT that heading sorts and the filter row apply to
+        self.view_order = None      # (column, descending)
+        self.view_filters = {}
+        self.script_tabs = []
+        self.index_window = None
+        self.search_index = None
+        self.search_window = None
+        self.storage_cache = None
+        self.storage_window = None
+        self.attach_window = None
+        self.value_windows = []
+        self.column_profiles = None
+        self.column_profile_window = None
+        self.result_cache = None
+        self.change_watcher = None
+        self.import_resume = None   # (path, table, rows committed) of the last interrupted import
+
+    def _new_tab(self):
+        """Adds an empty tab header; the database widgets below it are shared by all tabs."""
+        header = ttk.Frame(self.db_tabs, height=1)
+        self.db_tabs.add(header, text="No database")
+        return str(header)
+
+    def _update_tab_title(self):
+        if self.filepath:
+            title = os.path.basename(self.filepath)
+        else:
+            title = "In-memory" if self.worker else "No database"
+        self.db_tabs.tab(self.active_tab, text=title)
+
+    def _tool_windows(self):
+        windows = [self.index_window, self.search_window, self.storage_window, self.attach_window,
+                   self.column_profile_window] + self.value_windows
+        return [window for window in windows if window is not None and window.winfo_exists()]
+
+    def _stash_tab(self):
+        """Takes the database on screen off the window and returns its state.
+
+        Its worker, connection, page caches and pager stay alive, so showing the
+        tab again needs no reconnect and no re-query.
+        """
+        state = {name: getattr(self, name) for name in self.TAB_STATE}
+        pager, offset = self.result_grid.detach()
+        shows_log = str(self.script_log) in self.results.tabs()
+        state.update(
+            pager=pager, offset=offset, sort=self.result_grid.sort,
+            table=self.selected_table.get(), tables=tuple(self.table_selector["values"]),
+            query=self.query_text.get("1.0", "end-1c"),
+            log=self.script_log.get("1.0", "end-1c") if shows_log else None,
+            status=self.status_text.get(), settings=self.settings_text.get(), title=self.root.title(),
+        )
+        for tab in self.script_tabs:
+            self.results.hide(tab)
+        if shows_log:
+            self.results.forget(self.script_log)
+            self.script_log.configure(state=tk.NORMAL)
+            self.script_log.delete("1.0", tk.END)
+            self.script_log.configure(state=tk.DISABLED)
+        for window in self._tool_windows():
+            window.withdraw()
+        self.progress_bar.stop()
+        self.progress_bar.configure(mode="determinate", value=0)
+        self.cancel_button.configure(state=tk.DISABLED)
+        self._reset_tab_state()
+        return state
+
+    def _restore_tab(self, state):
+        for name in self.TAB_STATE:
+            setattr(self, name, state[name])
+        self.table_selector["values"] = state["tables"]
+        self.selected_table.set(state["table"])
+        self.query_text.delete("1.0", tk.END)
+        self.query_text.insert("1.0", state["query"])
+        for tab in self.script_tabs:
+            self.results.add(tab)
+        if state["log"] is not None:
+            self.results.add(self.script_log, text="Messages")
+            self.script_log.configure(state=tk.NORMAL)
+            self.script_log.insert("1.0", state["log"])
+            self.script_log.configure(state=tk.DISABLED)
+        self.results.select(self.result_grid)
+        if state["pager"] is not None:
+            self.result_grid.sort = state["sort"]
+            self.result_grid.load(state["pager"])
+            for column, text in self.view_filters.items():
+                if column in self.result_grid.filters:
+                    self.result_grid.filters[column].set(text)
+            self.result_grid.show_notice(self._sort_notice(state["pager"]))
+            self.result_grid.scroll_to(state["offset"])
+        self.status_text.set(state["status"])
+        self.settings_text.set(state["settings"])
+        self.root.title(state["title"])
+        self._edits_changed(immediate=False)
+        for window in self._tool_windows():
+            window.deiconify()
+        if self.worker and self.worker.busy:
+            self.cancel_button.configure(state=tk.NORMAL)
+
+    def _on_tab_changed(self, event):
+        tab = self.db_tabs.select()
+        if tab == self.active_tab or tab not in self.tab_states:
+            return
+        self.tab_states[self.active_tab] = self._stash_tab()
+        self.active_tab = tab
+        self._restore_tab(self.tab_states.pop(tab))
+
+    def close_database(self):
+        """Closes the database in the current tab, and the tab itself while others are open."""
+        if self.worker:
+            if not self._confirm_discard():
+                return
+            if self.filepath is None and not messagebox.askyesno(
+                    "Unsaved Snapshot", "The in-memory database has not been saved. Close it anyway?"):
+                return
+        self._close_worker()
+        self._reset_tab_state()
+        self.table_selector["values"] = ()
+        self.selected_table.set("")
+        self.status_text.set("No database open.")
+        self.root.title("Ease-DB")
+        if not self.tab_states:
+            self._update_tab_title()
+            return
+        closing, self.active_tab = self.active_tab, next(iter(self.tab_states))
+        self._restore_tab(self.tab_states.pop(self.active_tab))
+        self.db_tabs.select(self.active_tab)
+        self.db_tabs.forget(closing)
+
+    def show_attached(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+        if self.attach_window is not None and self.attach_window.winfo_exists():
+            self.attach_window.lift()
+            return
+        other_files = [state["filepath"] for state in self.tab_states.values() if state["filepath"]]
+        self.attach_window = AttachWindow(self.root, self.run_job, other_files)
+
+    def show_metrics(self):
+        if self.metrics_window is not None and self.metrics_window.winfo_exists():
+            self.metrics_window.load()
+            self.metrics_window.lift()
+            return
+        self.metrics_window = MetricsWindow(self.root, self.metrics)
+
+    def _confirm_discard(self):
+        """Asks before throwing away buffered edits. Returns True when it is safe to continue."""
+        if not len(self.edits):
+            return True
+        if not messagebox.askyesno("Unsaved Changes", f"Discard {len(self.edits)} unsaved change(s)?"):
+            return False
+        self.discard_edits()
+        return True
+
+    @staticmethod
+    def _shutdown_worker(worker, search_index):
+        """Stops a database's jobs, lets the search index record that it is current, and closes the connection."""
+        try:
+            worker.cancel()
+            if search_index is not None:
+                worker.call(search_index.close)
+        except Exception:
+            pass
+        try: worker.close()
+        except Exception: pass
+
+    def _close_worker(self):
+        search_index = self.search_index
+        for window in self._tool_windows():
+            window.destroy()  # they work on this database's connection and catalog
+        self.index_window = self.search_window = self.storage_window = self.attach_window = None
+        self.column_profile_window = None
+        self.value_windows = []
+        self.search_index = None
+        self.storage_cache = None
+        self.column_profiles = None
+        self.result_cache = None
+        for tab in self.script_tabs:
+            tab.destroy()
+        self.script_tabs = []
+        if self.worker:
+            self.result_grid.clear()
+            self._shutdown_worker(self.worker, search_index)
+        self.worker = None
+        self.filepath = None
+        self.settings_text.set("")
+
+    def close(self):
+        tabs = [(self.worker, self.edits, self.filepath)] + [
+            (state["worker"], state["edits"], state["filepath"]) for state in self.tab_states.values()
+        ]
+        for worker, edits, filepath in tabs:
+            name = os.path.basename(filepath) if filepath else "the in-memory database"
+            if len(edits) and not messagebox.askyesno("Unsaved Changes", f"Discard {len(edits)} unsaved change(s) in {name}?"):
+                return
+            if worker and filepath is None:
+                if not messagebox.askyesno("Unsaved Snapshot", "The in-memory database has not been saved. Exit anyway?"):
+                    return
+        for state in self.tab_states.values():
+            if state["worker"]:
+                self._shutdown_worker(state["worker"], state["search_index"])
+        self._close_worker()
+        self.metrics.close()
+        self.root.quit()
+
+    # =====================================================================
+    # HELP OPERATIONS
+    # =====================================================================
+    def show_about(self):
+        """Displays the 'About' message box with project and author info."""
+        messagebox.showinfo(
+            "About Ease-DB",
+            "Ease-DB is an **open-source**, lightweight SQLite database editor built using Python's Tkinter.\n\n"
+            "It provides essential CRUD (Create, Read, Update, Delete) functionality through a user-friendly "
+            "graphical interface, making SQLite management accessible and efficient.\n\n"
+            "Creator: Zrng\n"
+            "GitHub: https://github.com/zrnge"
+        )
+
+    def open_docs(self):
+        """Opens the documentation URL in the default web browser."""
+        documentation_url = "https://github.com/zrnge/ease-db"
+        webbrowser.open_new(documentation_url)
+
+    # =====================================================================
+    # FILE OPERATIONS
+    # =====================================================================
+    def open_file(self):
+        filepath = filedialog.askopenfilename(
+            filetypes=[("SQLite DB", "*.db *.sqlite"), ("All Files", "*.*")]
+        )
+        
+        if filepath:
+            try:
+                self._open_worker(filepath, new_tab=True)
+                messagebox.showinfo("Success", f"Opened database: {filepath}")
+                self.populate_table_selector()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+    
+    def create_db(self):
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".db",
+            filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")]
+        )
+        if filepath:
+            try:
+                self._open_worker(filepath, create=True, new_tab=True)
+                messagebox.showinfo("Success", f"New database created: {filepath}")
+                self.populate_table_selector()
+                if messagebox.askyesno("Table Creation", "Do you want to create a default 'NewTable'?"):
+                    self.run_job(
+                        create_table, "NewTable", "id INTEGER PRIMARY KEY, name TEXT, value TEXT",
+                        on_done=lambda _: self.populate_table_selector()
+                    )
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                
+    def add_table(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open or create a database file first.")
+            return
+
+        table_name = simpledialog.askstring("Add Table", "Enter the name for the new table:")
+        
+        if table_name:
+            if not table_name.isidentifier():
+                messagebox.showerror("Error", "Invalid table name. Use alphanumeric characters and underscores.")
+                return
+
+            def created(_):
+                messagebox.showinfo("Success", f"Table '{table_name}' created successfully.")
+                self.populate_table_selector()
+                self.selected_table.set(table_name)
+                self.select_table(None)
+
+            self.run_job(create_table, table_name, on_done=created,
+                         error_title="Creation Error", error_prefix="Failed to create table")
+
+    def save_file(self, save_as=False):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open or create a database file first.")
+            return
+
+        if len(self.edits):
+            # Queued ahead of the copy/dump below, so the saved file includes the edits.
+            self.save_changes()
+            if not save_as and self.filepath:
+                return
+
+        target_path = self.filepath
+        
+        if save_as or not target_path:
+            target_path = filedialog.asksaveasfilename(
+                defaultextension=".db",
+                filetypes=[
+                    ("SQLite Database", "*.db"), 
+                    ("SQL Dump", "*.sql"),
+                    ("Compressed SQL Dump", "*.sql.gz"),
+                    ("All Files", "*.*")
+                ]
+            )
+        
+        if target_path:
+            if os.path.abspath(target_path) == os.path.abspath(self.filepath or ""):
+                self.run_job(lambda conn: conn.commit(),
+                             on_done=lambda _: messagebox.showinfo("Success", f"Database saved to: {target_path}"),
+                             error_title="Save Error", error_prefix="Failed to save DB file")
+            elif target_path.lower().endswith(('.sql', '.sql.gz')):
+                self.run_job(
+                    export_database, target_path, "sql", None, target_path.lower().endswith('.gz'),
+                    on_done=lambda _: messagebox.showinfo("Success", f"Database saved to SQL file: {target_path}"),
+                    error_title="Save Error", error_prefix="Failed to save SQL dump",
+                    label="Writing SQL dump", progress=True
+                )
+            else:
+                def saved(_):
+                    # Like any "Save As", keep working on the new copy.
+                    table_name = self.selected_table.get()
+                    self._open_worker(target_path)
+                    self.populate_table_selector()
+                    if table_name in self.table_selector['values']:
+                        self.selected_table.set(table_name)
+                        self.select_table(None)
+                    messagebox.showinfo("Success", f"Database saved to: {target_path}")
+                self.run_job(backup_to_file, target_path, on_done=saved,
+                             error_title="Save Error", error_prefix="Failed to save DB file",
+                             label="Copying database", progress=True)
+
+    def export_tables(self):
+        """Exports whole tables as one SQL dump, or as one CSV/JSONL file per table."""
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open or create a database file first.")
+            return
+        table_list = self.get_table_list()
+        if not table_list:
+            messagebox.showwarning("No Tables", "The current database contains no tables to export.")
+            return
+        dialog = ExportDialog(self.root, table_list, title="Export Tables")
+        if not dialog.fmt or not dialog.tables:
+            return
+
+        if dialog.fmt == "sql":
+            extension = ".sql.gz" if dialog.compress else ".sql"
+            target = filedialog.asksaveasfilename(defaultextension=extension, filetypes=[("SQL Dump", f"*{extension}")])
+        else:
+            target = filedialog.askdirectory(title="Choose a folder for the exported files")
+        if not target:
+            return
+
+        tables = None if len(dialog.tables) == len(table_list) else dialog.tables
+        def exported(rows):
+            messagebox.showinfo("Export Complete", f"Exported {len(rows)} table(s), {sum(rows.values()):,} rows, to: {target}")
+        self.run_job(export_database, target, dialog.fmt, tables, dialog.compress, on_done=exported,
+                     error_title="Export Error", error_prefix="Failed to export", label="Exporting", progress=True)
+
+    def export_query_result(self):
+        """Streams the result of the query in the query box into a file."""
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+        query = self.query_text.get("1.0", tk.END).strip()
+        if not query:
+            messagebox.showwarning("No Query", "Enter a SELECT query to export its result.")
+            return
+        dialog = ExportDialog(self.root, title="Export Query Result")
+        if not dialog.fmt:
+            return
+
+        extension = EXPORT_FORMATS[dialog.fmt] + (".gz" if dialog.compress else "")
+        target = filedialog.asksaveasfilename(defaultextension=extension, filetypes=[("Export File", f"*{extension}")])
+        if not target:
+            return
+        self.run_job(export_query, query, target, dialog.fmt, dialog.compress,
+                     on_done=lambda rows: messagebox.showinfo("Export Complete", f"Exported {rows:,} rows to: {target}"),
+                     error_title="Export Error", error_prefix="Failed to export", label="Exporting query", progress=True)
+
+    def open_memory_snapshot(self):
+        """Loads a copy of a database file into memory; nothing touches the file until Save As."""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("SQLite DB", "*.db *.sqlite"), ("All Files", "*.*")]
+        )
+        if filepath:
+            try:
+                self._open_worker(None, connect=lambda: open_memory_snapshot(filepath), new_tab=True)
+                self.populate_table_selector()
+                self.root.title(f"Ease-DB - snapshot of {os.path.basename(filepath)}")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def restore_file(self):
+        """Replaces the open database's contents with a backup file."""
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open or create a database file first.")
+            return
+        source_path = filedialog.askopenfilename(
+            filetypes=[("SQLite DB", "*.db *.sqlite"), ("All Files", "*.*")]
+        )
+        if not source_path:
+            return
+        if not messagebox.askyesno("Confirm Restore", f"Replace every table in the open database with the contents of {source_path}?"):
+            return
+
+        def restored(_):
+            self.search_index.invalidate()
+            self.result_grid.clear()
+            self.populate_table_selector()
+            self.select_table(None)
+            messagebox.showinfo("Success", f"Database restored from: {source_path}")
+        self.run_job(restore_from_file, source_path, on_done=restored,
+                     error_title="Restore Error", error_prefix="Failed to restore database",
+                     label="Restoring database", progress=True)
+
+    def import_data(self):
+        """Streams a CSV or JSON Lines file into a (possibly new) table in the background."""
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open or create a database file first.")
+            return
+        path = filedialog.askopenfilename(filetypes=[
+            ("CSV / JSON Lines", "*.csv *.tsv *.txt *.jsonl *.ndjson *.gz"), ("All Files", "*.*")
+        ])
+        if not path:
+            return
+        try:
+            source = inspect_import(path)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            messagebox.showerror("Import Error", f"Could not read {path}: {e}")
+            return
+        default_table = re.sub(r'\W', '_', os.path.basename(path).split('.')[0]) or "imported"
+        dialog = ImportDialog(self.root, source, self.get_table_list(), default_table)
+        if not dialog.table:
+            return
+        table = dialog.table
+
+        skip_rows = 0
+        if self.import_resume and self.import_resume[:2] == (path, table) and self.import_resume[2]:
+            rows = self.import_resume[2]
+            if messagebox.askyesno("Resume Import", f"{rows:,} rows of this file are already in '{table}'. Continue after them?"):
+                skip_rows = rows
+        checkpoint = {}
+
+        def imported(rows):
+            self.import_resume = None
+            self.populate_table_selector()
+            self.selected_table.set(table)
+            self.select_table(None)
+            messagebox.showinfo("Import Complete", f"Imported {rows:,} rows into '{table}'.")
+
+        def failed(e):
+            committed = checkpoint.get("rows", 0)
+            self.import_resume = (path, table, committed)
+            self.populate_table_selector()
+            if not isinstance(e, JobCancelled):
+                messagebox.showerror("Import Error", f"{e}\n\nImport the file into '{table}' again to resume after row {committed:,}.")
+
+        self.worker.submit(import_file, path, table, source.fmt, source.delimiter, dialog.header, dialog.create,
+                           dialog.empty_as_null, dialog.defer_indexes, skip_rows, checkpoint,
+                           on_done=imported, on_error=failed, label="Importing", progress=True)
+
+    def connection_options(self):
+        """Edits the connection profiles and optionally reopens the current file with the chosen one."""
+        can_reopen = bool(self.worker and self.filepath)
+        dialog = ConnectionOptionsDialog(self.root, self.profiles, self.profile.name, can_reopen)
+        if not dialog.profile:
+            return
+        self.profiles = [p for p in self.profiles if p.name != dialog.profile.name] + [dialog.profile]
+        self.profile = dialog.profile
+        try:
+            save_profiles(self.profiles, self.profile.name)
+        except OSError as e:
+            messagebox.showwarning("Profiles Not Saved", f"Could not save connection profiles: {e}")
+
+        if dialog.reopen and self._confirm_discard():
+            filepath, table_name = self.filepath, self.selected_table.get()
+            try:
+                self._open_worker(filepath)
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                self._close_worker()
+                return
+            self.populate_table_selector()
+            if table_name in self.table_selector['values']:
+                self.selected_table.set(table_name)
+                self.select_table(None)
+
+    # =====================================================================
+    # EDIT/STRUCTURE OPERATIONS
+    # =====================================================================
+
+    def get_table_list(self):
+        if not self.worker:
+            return []
+        return self.catalog.table_names()
+
+    def get_primary_key(self, table_name):
+        """Returns (pk_name, pk_index) for the first primary key column, or None."""
+        table = self.catalog.table(table_name)
+        if not table or not table.primary_key:
+            return None
+        pk = table.primary_key[0]
+        return pk.name, pk.cid
+
+    def show_rename_table_dialog(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+
+        table_list = self.get_table_list()
+        if not table_list:
+            messagebox.showwarning("No Tables", "The current database contains no tables to rename.")
+            return
+
+        dialog = RenameTableDialog(self.root, table_list)
+
+        if dialog.old_name and dialog.new_name:
+            if dialog.old_name == dialog.new_name:
+                messagebox.showinfo("No Change", "The new name is the same as the old name. No modification performed.")
+                return
+
+            if not dialog.new_name.isidentifier():
+                messagebox.showerror("Error", "Invalid new table name. Use alphanumeric characters and underscores.")
+                return
+                
+            self.rename_table(dialog.old_name, dialog.new_name)
+
+    def rename_table(self, old_name, new_name):
+        def renamed(_):
+            messagebox.showinfo("Success", f"Table '{old_name}' successfully renamed to '{new_name}'.")
+            
+            self.populate_table_selector() 
+            self.selected_table.set(new_name)
+            self.select_table(None)
+
+        self.run_job(rename_table, old_name, new_name, on_done=renamed,
+                     error_title="Rename Error", error_prefix="Failed to rename table")
+
+
+    def show_alter_column_dialog(self):
+        if not self.worker or not self.selected_table.get():
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+
+        current_cols = self.tree["columns"]
+        if not current_cols:
+            messagebox.showwarning("Warning", "The current table has no columns to modify.")
+            return
+
+        col_to_modify = simpledialog.askstring(
+            "Select Column", 
+            f"Enter the exact name of the column to modify (e.g., {current_cols[0]}):"
+        )
+
+        if not col_to_modify or col_to_modify not in current_cols:
+            messagebox.showwarning("Warning", "Invalid column name selected or cancelled.")
+            return
+            
+        table = self.catalog.table(self.selected_table.get())
+        column = next((col for col in table.columns if col.name == col_to_modify), None) if table else None
+        dialog = AlterColumnDialog(self.root, col_to_modify, (column.type or "") if column else "")
+
+        if dialog.new_name:
+            self.alter_column(col_to_modify, dialog.new_name, dialog.new_type, dialog.column_type)
+            
+    def alter_column(self, old_name, new_name, new_type, old_type=None):
+        """Renames a column and/or changes its type; a type change rebuilds the table in the background."""
+        table_name = self.selected_table.get()
+        retype = old_type is not None and new_type.upper() != old_type.upper()
+        if old_name == new_name and not retype:
+            return
+        if retype and not self._confirm_discard():
+            return
+
+        def alter(conn, progress=None):
+            if old_name != new_name:
+                rename_column(conn, table_name, old_name, new_name)
+            if retype:
+                change_column_type(conn, table_name, new_name, new_type, progress)
+
+        def altered(_):
+            changes = []
+            if old_name != new_name:
+                changes.append(f"renamed from '{old_name}' to '{new_name}'")
+            if retype:
+                changes.append(f"changed to type {new_type or '(none)'}")
+            messagebox.showinfo("Success", f"Column '{new_name}' {' and '.join(changes)}.")
+            self.select_table(None)
+
+        self.run_job(alter, on_done=altered, error_title="Modify Column Error", error_prefix="Failed to modify column",
+                     label=f"Rebuilding {table_name}" if retype else "", progress=retype)
+        
+    def add_structural_element(self, element_type='column'):
+        table_name = self.selected_table.get()
+        if not self.worker or not table_name:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+
+        if element_type == 'column':
+            new_col_name = simpledialog.askstring("Add Column", "Enter new column name (e.g., new_col):")
+            new_col_type = simpledialog.askstring("Add Column", "Enter column data type (e.g., TEXT, INTEGER):")
+            
+            if new_col_name and new_col_type:
+                new_col_name = new_col_name.strip()
+                new_col_type = new_col_type.strip().upper()
+
+                def added(_):
+                    messagebox.showinfo("Success", f"Column '{new_col_name}' added to {table_name}.")
+                    self.select_table(None)
+
+                self.run_job(add_column, table_name, new_col_name, new_col_type, on_done=added, error_prefix="Failed to add column")
+
+    def delete_structural_element(self, element_type='column'):
+        table_name = self.selected_table.get()
+        if not self.worker or not table_name:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+
+        if element_type == 'column':
+            table = self.catalog.table(table_name)
+            columns = table.column_names if table else []
+            if len(columns) < 2:
+                messagebox.showwarning("Warning", "A table must keep at least one column.")
+                return
+            column = simpledialog.askstring(
+                "Delete Column", f"Enter the exact name of the column to delete (e.g., {columns[-1]}):"
+            )
+            if not column:
+                return
+            if column not in columns:
+                messagebox.showwarning("Warning", f"Table {table_name} has no column named '{column}'.")
+                return
+            if not messagebox.askyesno("Confirm Delete", f"Delete column '{column}' and all its data from {table_name}?"):
+                return
+            if not self._confirm_discard():
+                return
+
+            def dropped(skipped):
+                message = f"Column '{column}' deleted from {table_name}."
+                if skipped:
+                    message += f"\n\nDropped with it (they used the column): {', '.join(skipped)}"
+                messagebox.showinfo("Success", message)
+                self.select_table(None)
+
+            self.run_job(drop_column, table_name, column, on_done=dropped, error_title="Delete Column Error",
+                         error_prefix="Failed to delete column", label=f"Dropping {column}", progress=True)
+        
+    def add_row(self, count=1):
+        table_name = self.selected_table.get()
+        if not self.worker or not table_name:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+
+        table = self.catalog.table(table_name)
+        if not table:
+            return
+
+        self.edits.insert(table_name, table.column_names, count)
+        self._edits_changed()
+        if self.buffer_edits.get():
+            self.result_grid.scroll_to(self.result_grid.row_count())
+
+    def add_rows(self):
+        count = simpledialog.askinteger("Add Rows", "How many empty rows should be added?", minvalue=1, maxvalue=1000000)
+        if count:
+            self.add_row(count)
+
+    def delete_row(self):
+        """Deletes every selected row (including rows scrolled out of view) as one change."""
+        table_name = self.selected_table.get()
+        selected_items = self.result_grid.selected_iids()
+        
+        if not self.worker or not table_name or not selected_items:
+            messagebox.showwarning("Warning", "Select a row and a table first.")
+            return
+
+        pending = self.edits.pending_inserts(table_name)
+        rows = []
+        for iid in selected_items:
+            identity = self._row_identity(iid, pending)
+            if identity is None:
+                messagebox.showerror("Error", "Table must have a Primary Key column to delete rows safely.")
+                return
+            rows.append(identity)
+
+        if len(rows) == 1:
+            pk_name, pk_value, insert_id = rows[0]
+            prompt = f"Are you sure you want to delete row with {pk_name} = {pk_value}?" if insert_id is None else None
+        else:
+            prompt = f"Are you sure you want to delete {len(rows):,} rows?"
+        
+        if prompt is None or messagebox.askyesno("Confirm Delete", prompt):
+            self.edits.delete_many(table_name, rows)
+            self.result_grid.deselect(selected_items)
+            self._edits_changed()
+
+    def _row_identity(self, iid, pending=None):
+        """Returns (pk_name, key, insert_id) addressing a grid row in UPDATE/DELETE statements, or None.
+
+        Rows of a table browse are addressed by rowid; other result sets need the
+        table's primary key column to be part of the result.
+        """
+        table_name = self.selected_table.get()
+        if pending is None:
+            pending = self.edits.pending_inserts(table_name)
+        if iid in pending:
+            return None, None, iid
+        pager = self.result_grid.pager
+        if isinstance(pager, TablePager) and pager.table_name == table_name:
+            return "rowid", int(iid), None
+        pk = self.get_primary_key(table_name)
+        if not pk or pager is None or pk[0] not in pager.columns:
+            return None
+        values = self.result_grid.row_values(iid)
+        if values is None:
+            values = next((row for key, row in pager.cached_rows() if str(key) == iid), None)
+        if values is None:
+            return None
+        return pk[0], values[pager.columns.index(pk[0])], None
+
+    # =====================================================================
+    # PENDING CHANGES
+    # =====================================================================
+
+    def save_changes(self, on_saved=None):
+        """Applies the buffered change log in a single transaction."""
+        statements = self.edits.statements()
+        count = len(self.edits)
+        if not statements:
+            self.edits.mark_saved(count)
+            self._edits_changed()
+            if on_saved: on_saved()
+            return
+
+        changes = self.edits.changes[:count]
+        pager = self.result_grid.pager
+        watch = pager.table_name if isinstance(pager, TablePager) and any(
+            change.kind == "insert" and change.table == pager.table_name for change in changes
+        ) else None
+
+        insert_prefix = f"INSERT INTO {quote_identifier(watch)} " if watch else None
+        expected_inserts = sum(len(params) for sql, params in statements if watch and sql.startswith(insert_prefix))
+
+        def saved(inserted):
+            self.edits.mark_saved(count)
+            self._apply_saved_changes(changes, pager, inserted, expected_inserts)
+            self._edits_changed(immediate=False)
+            if on_saved: on_saved()
+
+        self.run_job(apply_changes, statements, watch, on_done=saved,
+                     error_title="Save Error", error_prefix="Failed to save changes", label="Saving changes")
+
+    def _apply_saved_changes(self, changes, pager, inserted, expected_inserts):
+        """Patches the grid's cached rows with changes that were just committed; nothing is re-queried."""
+        if pager is None or pager is not self.result_grid.pager:
+            return
+        table_name = pager.table_name if isinstance(pager, TablePager) else self.selected_table.get()
+        changes = [change for change in changes if change.table == table_name and change.insert_id is None]
+
+        # Map (pk_name, key) back to the pager's own row keys.
+        by_identity = {}
+        if isinstance(pager, TablePager):
+            lookup = lambda pk_name, key: key if pk_name == "rowid" else by_identity.get((pk_name, key))
+        else:
+            lookup = lambda pk_name, key: by_identity.get((pk_name, key))
+        pk_names = {change.pk_name for change in changes if change.pk_name and change.pk_name != "rowid"}
+        for pk_name in pk_names:
+            if pk_name in pager.columns:
+                index = pager.columns.index(pk_name)
+                for key, values in pager.cached_rows():
+                    by_identity[(pk_name, values[index])] = key
+
+        updates, deleted = {}, []
+        for change in changes:
+            key = lookup(change.pk_name, change.key)
+            if change.kind == "delete":
+                deleted.append(key)
+            elif change.kind == "update" and key is not None:
+                updates.setdefault(key, {})[change.column] = change.new
+
+        cached = dict(pager.cached_rows())
+        for key, edits in updates.items():
+            if key in cached:
+                pager.patch(key, [edits.get(col, value) for col, value in zip(pager.columns, cached[key])])
+        if None in deleted:
+            self.run_query()  # a deleted row that is not in the cache: positions are unknown
+            return
+        pager.forget(deleted)
+        if expected_inserts:
+            if isinstance(pager, TablePager) and len(inserted) == expected_inserts:
+                pager.append(inserted)
+            else:
+                self.run_query()  # rowids were reused below the old maximum; positions are unknown
+
+    def undo_edit(self):
+        if self.edits.undo():
+            self._edits_changed(immediate=False)
+        return "break"
+
+    def redo_edit(self):
+        if self.edits.redo():
+            self._edits_changed(immediate=False)
+        return "break"
+
+    def discard_edits(self):
+        self.edits.discard()
+        self._edits_changed(immediate=False)
+
+    def _on_buffer_toggle(self):
+        if not self.buffer_edits.get() and len(self.edits):
+            self.save_changes()
+
+    def _edits_changed(self, immediate=True):
+        """Re-renders the grid with the change log applied; saves right away unless edits are buffered."""
+        count = len(self.edits)
+        self.pending_text.set(f"{count:,} pending change(s)" if count else "")
+        self.result_grid.refresh()
+        if immediate and count and not self.buffer_edits.get():
+            self.save_changes()
+
+    def _decorate_row(self, key, values):
+        if not len(self.edits):
+            return values, ()
+        table_name = self.selected_table.get()
+        pager = self.result_grid.pager
+        if isinstance(pager, TablePager) and pager.table_name == table_name:
+            state, edits = self.edits.row_state(table_name, "rowid", key)
+        else:
+            pk = self.get_primary_key(table_name)
+            if not pk or pager is None or pk[0] not in pager.columns:
+                return values, ()
+            state, edits = self.edits.row_state(table_name, pk[0], values[pager.columns.index(pk[0])])
+        if edits:
+            values = tuple(edits.get(col, value) for col, value in zip(pager.columns, values))
+        return values, ((state,) if state else ())
+
+    def _pending_rows(self):
+        pager = self.result_grid.pager
+        table_name = self.selected_table.get()
+        if pager is None or not isinstance(pager, TablePager) or pager.table_name != table_name:
+            return []
+        rows = []
+        for insert_id, (columns, values) in self.edits.pending_inserts(table_name).items():
+            by_name = dict(zip(columns, values))
+            rows.append((insert_id, tuple(by_name.get(col) for col in pager.columns), ("inserted",)))
+        return rows
+
+    # =====================================================================
+    # UI/UTILITY OPERATIONS
+    # =====================================================================
+
+    def on_cell_double_click(self, event):
+        if not self.worker or not self.selected_table.get(): return
+
+        item_id = self.tree.identify_row(event.y)
+        column_id = self.tree.identify_column(event.x)
+        if not item_id or not column_id: return
+
+        col_index = int(column_id.replace('#', '')) - 1
+        col_name = self.tree["columns"][col_index]
+
+        bbox = self.tree.bbox(item_id, column_id)
+        if not bbox: return
+        x, y, width, height = bbox
+
+        current_values = self.result_grid.row_values(item_id)
+        if current_values is None: return
+        old_value = current_values[col_index]
+        table_name = self.selected_table.get()
+
+        identity = self._row_identity(item_id)
+        if identity is None:
+             messagebox.showerror("Error", "Cannot edit cell. Table must have a Primary Key.")
+             return
+        pk_name, pk_value, insert_id = identity
+
+        if insert_id is None and isinstance(old_value, (LargeValue, bytes)):
+            self.show_value(table_name, col_name, pk_name, pk_value, item_id)
+            return
+
+        entry = ttk.Entry(self.tree, justify='left', width=width)
+        entry.insert(0, "" if old_value is None else old_value)
+        entry.focus()
+        entry.select_range(0, tk.END)
+
+        def save_edit(event=None):
+            if not entry.winfo_exists():
+                return
+            new_value = entry.get()
+            entry.destroy()
+            if new_value != ("" if old_value is None else str(old_value)):
+                self.edits.update(table_name, pk_name, pk_value, col_name, old_value, new_value, insert_id=insert_id)
+                self._edits_changed()
+
+        def cancel_edit(event=None):
+            entry.destroy()
+        
+        entry.bind('<Return>', save_edit)
+        entry.bind('<FocusOut>', save_edit)
+        entry.bind('<Escape>', cancel_edit)
+        
+        entry.place(x=x, y=y, anchor='nw', width=width, height=height)
+
+    def show_value(self, table_name, column, key_column, key, iid):
+        """Opens a long TEXT or BLOB cell in a ValueWindow; a replaced value is patched into the grid."""
+        pager = self.result_grid.pager
+
+        def replaced(value):
+            if pager is not self.result_grid.pager or column not in pager.columns:
+                return
+            cached = dict(pager.cached_rows())
+            row_key = int(iid)
+            if row_key in cached:
+                values = list(cached[row_key])
+                values[pager.columns.index(column)] = value
+                pager.patch(row_key, values)
+                self.result_grid.refresh()
+
+        self.value_windows.append(
+            ValueWindow(self.root, self.run_job, table_name, column, key, key_column, on_replaced=replaced)
+        )
+
+    def copy_data(self, scope):
+        data_to_copy = ""
+        
+        if scope in ('row', 'cell'):
+            selected_item = self.tree.focus()
+            shown = self.result_grid.row_values(selected_item) if selected_item else None
+            if shown and any(isinstance(value, LargeValue) for value in (shown if scope == 'row' else shown[:1])):
+                # The grid only holds previews of these; copying them would silently truncate.
+                messagebox.showwarning("Copy Error", f"The {scope} holds TEXT or BLOB values too long to copy from "
+                                                     "the grid. Double-click a value to open it and save it in full.")
+                return
+
+        if scope == 'row':
+            selected_item = self.tree.focus()
+            if selected_item:
+                values = self.tree.item(selected_item, 'values')
+                if values:
+                    data_to_copy = '\t'.join(map(str, values))
+                    
+        elif scope == 'column':
+            col_name = simpledialog.askstring("Copy Column", "Enter the exact name of the column to copy:")
+            pager = self.result_grid.pager
+            if col_name and pager and col_name in pager.columns:
+                self.copy_column(pager, col_name)
+                return
+        
+        elif scope == 'cell':
+             selected_item = self.tree.focus()
+             if selected_item:
+                 values = self.tree.item(selected_item, 'values')
+                 if values:
+                     data_to_copy = str(values[0])
+
+        if data_to_copy:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(data_to_copy)
+            messagebox.showinfo("Copied", f"Copied {scope} data to clipboard.")
+        else:
+            messagebox.showwarning("Copy Error", f"Could not copy {scope}. Ensure data is loaded.")
+            
+    def copy_column(self, pager, col_name):
+        """Reads one column on the worker (full values, up to COPY_COLUMN_ROWS) and puts it on the clipboard."""
+        def copied(result):
+            values, complete = result
+            self.root.clipboard_clear()
+            self.root.clipboard_append('\n'.join(map(str, values)))
+            if complete:
+                messagebox.showinfo("Copied", f"Copied {len(values):,} value(s) of {col_name} to clipboard.")
+            else:
+                messagebox.showwarning("Copied", f"Only the first {len(values):,} values of {col_name} were copied. "
+                                                 "Use File > Export Query Result to save the whole column.")
+        self.run_job(read_column, pager, pager.columns.index(col_name), on_done=copied,
+                     error_title="Copy Error", error_prefix="Failed to copy column",
+                     label=f"Copying column {col_name}", progress=True)
+
+    def populate_table_selector(self):
+        if not self.worker: return
+        try:
+            tables = self.get_table_list()
+            
+            self.table_selector['values'] = tables
+            if tables:
+                if self.selected_table.get() not in tables:
+                     self.table_selector.set(tables[0])
+            else:
+                 self.table_selector.set("")
+        except Exception as e:
+            messagebox.showerror("DB Error", f"Could not list tables: {str(e)}")
+
+    def select_table(self, event):
+        table_name = self.selected_table.get()
+        if table_name:
+            self.query_text.delete("1.0", tk.END)
+            self.query_text.insert("1.0", f"SELECT * FROM {table_name};")
+            self.run_query()
+
+    def fetch_rows(self, pager, start, count, callback):
+        """Called by the result grid when the rows it needs to show are not cached yet."""
+        def on_error(e):
+            callback(None)
+            if not isinstance(e, JobCancelled):
+                messagebox.showerror("Query Error", str(e))
+        self.worker.submit(pager.fetch_window, start, count, on_done=callback, on_error=on_error)
+
+    def fetch_keys(self, pager, start, count, callback):
+        """Resolves a positional range selection to row keys without fetching the rows."""
+        self.run_job(pager.keys, start, count, on_done=callback, error_title="Selection Error", label="Selecting rows")
+
+    def _show_pager(self, pager, keep_view=False):
+        self.result_grid.load(pager, keep_view=keep_view)
+        self.result_grid.show_notice(self._sort_notice(pager))
+        self.worker.submit(pager.count, on_done=lambda _: self._after_count(pager))
+
+    def _new_view(self, query):
+        """A freshly run query starts unsorted and unfiltered."""
+        self.view_query = query
+        self.view_order = None
+        self.view_filters = {}
+        self.result_grid.sort = None
+
+    def sort_by(self, column):
+        """Heading click: ascending, then descending, then back to the query's own order."""
+        if self.view_query is None: return
+        if not self.view_order or self.view_order[0] != column:
+            self.view_order = (column, False)
+        elif not self.view_order[1]:
+            self.view_order = (column, True)
+        else:
+            self.view_order = None
+        self._reload_view()
+
+    def filter_by(self, filters):
+        if self.view_query is None: return
+        self.view_filters = filters
+        self._reload_view()
+
+    def _reload_view(self):
+        """Re-runs the current query with ORDER BY / WHERE pushed down to SQLite."""
+        order = self.view_order
+        pager = self.result_grid.pager
+        if order and isinstance(pager, TablePager):
+            info = self.catalog.table(pager.table_name)
+            if info is not None and order[0] == info.rowid_alias:
+                order = (None, order[1])  # the rowid itself: plain keyset paging
+        self.result_grid.sort = self.view_order
+        self.run_job(make_pager, self.view_query, self.get_table_list(), order, self.view_filters, self.result_cache,
+                     on_done=lambda pager: self._show_pager(pager, keep_view=True),
+                     error_title="Query Error", label="Sorting and filtering")
+
+    def _sort_notice(self, pager):
+        """Warns when a table is sorted on a column that no index starts with."""
+        if not isinstance(pager, TablePager) or not pager.order:
+            return ""
+        column = pager.order[0]
+        info = self.catalog.table(pager.table_name)
+        if info is None or info.index_for(column):
+            return ""
+        return (f"'{column}' is not indexed: every page sorts the whole table. "
+                f"Create an index on it (Tools > Indexes and Advisor) for instant paging.")
+
+    def _after_count(self, pager):
+        if pager is self.result_grid.pager:
+            self.result_grid.refresh()
+
+    def profile_query(self):
+        """Runs the query to completion under the profiler, then shows its result and the measurements."""
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+        query = self.query_text.get("1.0", tk.END).strip()
+        if not query: return
+        self._remember_query(query)
+        tables = self.get_table_list()
+        count = self.result_grid.visible + 1
+
+        def job(conn, progress):
+            profile = profile_query(conn, query, progress=progress)
+            pager = None
+            if profile.columns is not None:
+                # Prefetch the first page so that the render timing below measures only Tk.
+                pager = make_pager(conn, query, tables)
+                pager.fetch_window(conn, 0, count)
+            return profile, pager
+
+        def profiled(result):
+            profile, pager = result
+            if pager is not None:
+                self._new_view(query)
+                start = time.perf_counter()
+                self._show_pager(pager)
+                self.result_grid.update_idletasks()
+                profile.render = time.perf_counter() - start
+            if not self.profiler.winfo_ismapped():
+                self.profiler.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
+            self.profiler.add(profile)
+
+        self.run_job(job, on_done=profiled, error_title="Profiler Error", label="Profiling query", progress=True,
+                     sql=query)
+
+    def _remember_query(self, query):
+        """Keeps the most recent distinct queries as the index advisor's default workload."""
+        if query in self.query_history:
+            self.query_history.remove(query)
+        self.query_history = (self.query_history + [query])[-QUERY_HISTORY:]
+
+    def show_indexes(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+        if self.index_window is not None and self.index_window.winfo_exists():
+            self.index_window.lift()
+            return
+        self.index_window = IndexWindow(self.root, self.run_job, self.catalog, self.query_history)
+
+    def show_storage(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+        if self.storage_window is not None and self.storage_window.winfo_exists():
+            self.storage_window.lift()
+            return
+        self.storage_window = StorageWindow(self.root, self.run_job, self.storage_cache)
+
+    def show_column_profile(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+        table_name = self.selected_table.get()
+        if not table_name:
+            messagebox.showwarning("No Table", "Select a table to profile.")
+            return
+        window = self.column_profile_window
+        if window is not None and window.winfo_exists():
+            if window.table == table_name:
+                window.lift()
+                return
+            window.destroy()
+        self.column_profile_window = ColumnProfileWindow(self.root, self.run_job, self.column_profiles, table_name)
+
+    def search_database(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+        if self.search_window is None or not self.search_window.winfo_exists():
+            self.search_window = SearchWindow(self.root, self.run_job, self.search_index, self.catalog, self.reveal_row)
+        self.search_window.lift()
+        if self.search_text.get().strip():
+            self.search_window.search(self.search_text.get())
+
+    def reveal_row(self, table_name, rowid):
+        """Opens ``table_name`` in the grid, scrolled to the row with ``rowid`` and with it selected."""
+        if table_name not in self.get_table_list():
+            messagebox.showwarning("Search", f"Table '{table_name}' no longer exists.")
+            return
+        query = f"SELECT * FROM {table_name};"
+        tables = self.get_table_list()
+        self.selected_table.set(table_name)
+        self.query_text.delete("1.0", tk.END)
+        self.query_text.insert("1.0", query)
+
+        def job(conn):
+            pager = make_pager(conn, query, tables, cache=self.result_cache)
+            position = conn.execute(f"SELECT count(*) FROM {quote_identifier(table_name)} WHERE rowid < ?",
+                                    (rowid,)).fetchone()[0]
+            return pager, position
+
+        def opened(result):
+            pager, position = result
+            self._new_view(query)
+            self._show_pager(pager)
+            self.result_grid.reveal(position, rowid)
+
+        self.run_job(job, on_done=opened, error_title="Search Error", label="Opening row")
+
+    def run_query(self):
+        if not self.worker:
+            messagebox.showwarning("No DB", "Open a database file first.")
+            return
+
+        query = self.query_text.get("1.0", tk.END).strip()
+        if not query: return
+        self._remember_query(query)
+        statements = split_statements(query)
+        if len(statements) > 1:
+            self.run_script(query)
+            return
+        if not statements: return
+        query = statements[0]
+
+        tables = self.get_table_list()
+        def job(conn):
+            # Decided from the compiled statement, so WITH ..., PRAGMA and VALUES page like SELECT.
+            if is_query(conn, query):
+                return make_pager(conn, query, tables, cache=self.result_cache)
+            return execute_and_commit(conn, query)
+
+        def done(result):
+            self.results.select(self.result_grid)
+            if isinstance(result, int):
+                messagebox.showinfo("Success", f"Query executed successfully. Rows affected: {result}")
+                self.populate_table_selector()
+                self.select_table(None)
+            else:
+                self._new_view(query)
+                self._show_pager(result)
+
+        self.run_job(job, on_done=done, error_title="Query Error", label="Running query", sql=query)
+
+    def run_script(self, script):
+        """Runs a multi-statement script in one transaction; every result set opens in its own tab."""
+        for tab in self.script_tabs:
+            tab.destroy()
+        self.script_tabs = []
+        self._write_log(None)
+        started = time.perf_counter()
+        delivered = []
+
+        def on_result(result):
+            delivered.append(result)
+            if result.columns is None:
+                return
+            grid = ResultGrid(self.results, self.fetch_rows, on_render=self.metrics.add_render)
+            self.results.add(grid, text=f"Result {result.number}")
+            grid.load(QueryPager.from_rows(result.sql, result.columns, result.rows))
+            if not self.script_tabs:
+                self.results.select(grid)
+            self.script_tabs.append(grid)
+
+        def finished(results):
+            self._write_log(results, f"{len(results)} statement(s) committed in {time.perf_counter() - started:.3f}s")
+            if not self.script_tabs:
+                self.results.select(self.script_log)
+            self._script_changed()
+
+        def failed(e):
+            if isinstance(e, JobCancelled):
+                outcome = "Cancelled; the script was rolled back."
+            elif isinstance(e, ScriptFailed):
+                done = "rolled back" if e.rolled_back else f"statements 1-{e.number - 1} committed"
+                outcome = f"{e} ({done})"
+            else:
+                outcome = f"Script failed: {e}"
+            self._write_log(delivered, outcome)
+            self.results.select(self.script_log)
+            self._script_changed()
+            if not isinstance(e, JobCancelled):
+                messagebox.showerror("Script Error", outcome)
+
+        self.worker.submit(run_script, script, self.rollback_on_error.get(), on_done=finished, on_error=failed,
+                           on_result=on_result, label="Running script", progress=True)
+
+    def _write_log(self, results, summary=""):
+        """Fills the Messages tab with one line per statement (``None`` clears it)."""
+        if str(self.script_log) not in self.results.tabs():
+            self.results.add(self.script_log, text="Messages")
+        lines = []
+        for result in results or ():
+            first_line = " ".join(result.sql.split())
+            first_line = first_line if len(first_line) <= 80 else first_line[:79] + "…"
+            if result.columns is not None:
+                outcome = f"{len(result.rows):,}{'+' if result.truncated else ''} row(s) returned"
+            elif result.rowcount is not None:
+                outcome = f"{result.rowcount:,} row(s) affected"
+            else:
+                outcome = "ok"
+            lines.append(f"[{result.number}] {first_line}  --  {outcome}, {result.elapsed * 1000:.1f} ms")
+        if summary:
+            lines.append(summary)
+        self.script_log.configure(state=tk.NORMAL)
+        self.script_log.delete("1.0", tk.END)
+        self.script_log.insert("1.0", "\n".join(lines))
+        self.script_log.configure(state=tk.DISABLED)
+
+    def _script_changed(self):
+        """A script may have changed the schema and the data shown in the Results tab."""
+        self.populate_table_selector()
+        if self.view_query is not None:
+            self._reload_view()
+
+
+def main():
+    root = tk.Tk()
+    app = SQLViewer(root)
+    root.geometry("1000x700")
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
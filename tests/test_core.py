@@ -0,0 +1,542 @@
+"""Tests for the headless core (ease_db) against temporary databases."""
+import gzip
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import ease_db
+from ease_db import (
+    ColumnProfileCache, JobCancelled, LargeValue, OperationMetrics, PREVIEW_CHARS, QueryPager, ResultCache,
+    SchemaCatalog, ScriptFailed, SearchIndex, StorageCache, TablePager, advise_indexes, backup_to_file,
+    export_database, import_file, incremental_vacuum, integrity_check, make_pager, parameterize_sql,
+    profile_columns, read_column, rebuild_table, run_analyze, run_script, split_statements, vacuum
+)
+
+
+def make_table(conn, rows=500, seed=7):
+    rng = random.Random(seed)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, grp INTEGER, name TEXT)")
+    conn.executemany("INSERT INTO items (grp, name) VALUES (?, ?)",
+                     [(rng.choice([None, 1, 2, 3, 4]), f"item {i}") for i in range(rows)])
+    conn.commit()
+
+
+def expected(conn, order_by, where=""):
+    return [(row[0], row[1:]) for row in conn.execute(f"SELECT rowid, * FROM items {where} ORDER BY {order_by}")]
+
+
+def read_all(conn, pager, step):
+    rows = []
+    while True:
+        window = pager.fetch_window(conn, len(rows), step)
+        if not window:
+            return rows
+        rows.extend(window)
+
+
+# =========================================================================
+# Paging
+# =========================================================================
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_paging_keeps_nulls_in_sqlite_order(conn, descending):
+    make_table(conn)
+    pager = TablePager("items", page_size=17, order=("grp", descending))
+    pager.open(conn)
+    direction = " DESC" if descending else ""
+    assert read_all(conn, pager, 17) == expected(conn, f"grp{direction}, rowid{direction}")
+    assert pager.count(conn) == 500
+
+
+def test_jumps_into_unread_pages_match_a_full_sort(conn):
+    make_table(conn)
+    full = expected(conn, "grp, rowid")
+    pager = TablePager("items", page_size=17, order=("grp", False))
+    pager.open(conn)
+    for start in (300, 40, 480, 0, 170):
+        assert pager.fetch_window(conn, start, 25) == full[start:start + 25]
+
+
+def test_filtered_paging(conn):
+    make_table(conn)
+    pager = TablePager("items", page_size=10, order=("grp", True), filters={"grp": "!NULL"})
+    pager.open(conn)
+    assert read_all(conn, pager, 10) == expected(conn, "grp DESC, rowid DESC", "WHERE grp IS NOT NULL")
+
+
+def test_forget_drops_deleted_rows_without_rereading(conn):
+    make_table(conn)
+    pager = TablePager("items", page_size=20)
+    pager.open(conn)
+    pager.fetch_window(conn, 0, 100)
+    pager.count(conn)
+    deleted = [5, 6, 41, 77]
+    conn.executemany("DELETE FROM items WHERE id = ?", [(key,) for key in deleted])
+    conn.commit()
+    pager.forget(deleted)
+    assert pager.count(conn) == 496
+    assert read_all(conn, pager, 20) == expected(conn, "rowid")
+
+
+def test_refresh_window_reports_rows_changed_by_another_connection(conn, db_path):
+    make_table(conn)
+    pager = TablePager("items", page_size=20)
+    pager.open(conn)
+    pager.fetch_window(conn, 40, 30)
+    other = sqlite3.connect(db_path)
+    other.execute("UPDATE items SET name = 'changed' WHERE id IN (45, 300)")
+    other.commit()
+    other.close()
+    rows, changed = pager.refresh_window(conn, 40, 30)
+    assert rows == expected(conn, "rowid")[40:70]
+    assert changed == {45}
+
+
+def test_large_values_arrive_as_previews(conn):
+    conn.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.execute("INSERT INTO docs (body) VALUES (?), ('short')", ("x" * (PREVIEW_CHARS * 4),))
+    pager = make_pager(conn, "SELECT * FROM docs", ["docs"])
+    (_, (_, body)), (_, (_, short)) = pager.fetch_window(conn, 0, 2)
+    assert isinstance(body, LargeValue) and body.size == PREVIEW_CHARS * 4 and len(body.preview) == PREVIEW_CHARS
+    assert short == "short"
+
+
+def test_read_column_returns_full_values(conn):
+    conn.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO docs (body) VALUES (?)", [("y" * 1000,), (None,), ("z",)])
+    pager = make_pager(conn, "SELECT * FROM docs", ["docs"], order=("id", True))
+    assert read_column(conn, pager, 1) == (["z", None, "y" * 1000], True)
+    assert read_column(conn, pager, 1, limit=2) == (["z", None], False)
+    query = make_pager(conn, "SELECT body FROM docs WHERE id = 1", ["docs"])
+    assert read_column(conn, query, 0) == (["y" * 1000], True)
+
+
+def test_read_column_refuses_statements_that_write(conn):
+    conn.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, body TEXT)")
+    pager = QueryPager.from_rows("INSERT INTO docs (body) VALUES ('x') RETURNING id", ["id"], [(1,)])
+    with pytest.raises(ValueError):
+        read_column(conn, pager, 0)
+    assert conn.execute("SELECT count(*) FROM docs").fetchone()[0] == 0
+
+
+def test_result_cache_releases_cursors_and_drops_results_another_connection_changed(conn, db_path):
+    make_table(conn)
+    cache = ResultCache()
+    query = "SELECT id, name FROM items WHERE grp IS NOT NULL"
+    fetch = lambda sql: make_pager(conn, sql, ["items"], cache=cache)
+    pager = fetch(query)
+    assert isinstance(pager, QueryPager) and pager.total is None
+    assert isinstance(fetch("SELECT * FROM items"), TablePager)
+    assert fetch(query) is pager and cache.hits == 1
+    assert read_all(conn, pager, 50) == [(i, row) for i, row in enumerate(conn.execute(query))]
+
+    query += " ORDER BY name"
+    pager = fetch(query)
+    assert pager.total is None
+    fetch("SELECT * FROM items")
+    other = sqlite3.connect(db_path, timeout=0)     # fails if a cached cursor still holds a read lock
+    other.execute("UPDATE items SET name = 'changed' WHERE grp IS NOT NULL")
+    other.commit()
+    other.close()
+    fresh = fetch(query)
+    assert fresh is not pager and (cache.hits, cache.misses) == (2, 4)
+    assert {row[1] for _, row in read_all(conn, fresh, 100)} == {"changed"}
+
+
+# =========================================================================
+# Scripts
+# =========================================================================
+@pytest.mark.parametrize("script, statements", [
+    ("SELECT 1", ["SELECT 1"]),
+    ("SELECT 1; SELECT 2;", ["SELECT 1;", "SELECT 2;"]),
+    ("SELECT * FROM big; -- note", ["SELECT * FROM big;"]),
+    ("-- only a comment", []),
+    ("SELECT 1; /* a; b */ ;; SELECT 2", ["SELECT 1;", "SELECT 2"]),
+    ("SELECT ';' AS a; SELECT \"x;y\" FROM t", ["SELECT ';' AS a;", "SELECT \"x;y\" FROM t"]),
+    ("CREATE TRIGGER tr AFTER INSERT ON t BEGIN UPDATE t SET a = 1; DELETE FROM u; END; SELECT 1",
+     ["CREATE TRIGGER tr AFTER INSERT ON t BEGIN UPDATE t SET a = 1; DELETE FROM u; END;", "SELECT 1"]),
+])
+def test_split_statements(script, statements):
+    assert split_statements(script) == statements
+
+
+def test_script_runs_in_one_transaction_and_creates_triggers(conn):
+    results = run_script(conn, """
+        CREATE TABLE t (a INTEGER);
+        CREATE TABLE log (a INTEGER);
+        CREATE TRIGGER t_log AFTER INSERT ON t BEGIN INSERT INTO log VALUES (new.a); END;
+        INSERT INTO t VALUES (1), (2); -- two rows
+        SELECT * FROM log ORDER BY a;
+    """)
+    assert len(results) == 5
+    assert results[3].rowcount == 2
+    assert results[4].columns == ["a"] and results[4].rows == [(1,), (2,)]
+    assert not conn.in_transaction
+
+
+def test_failed_script_rolls_back(conn):
+    conn.execute("CREATE TABLE t (a INTEGER UNIQUE)")
+    conn.commit()
+    with pytest.raises(ScriptFailed) as failed:
+        run_script(conn, "INSERT INTO t VALUES (1); INSERT INTO t VALUES (1);")
+    assert failed.value.number == 2 and failed.value.rolled_back
+    assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 0
+
+
+def test_failed_script_can_keep_earlier_statements(conn):
+    conn.execute("CREATE TABLE t (a INTEGER UNIQUE)")
+    conn.commit()
+    with pytest.raises(ScriptFailed):
+        run_script(conn, "INSERT INTO t VALUES (1); INSERT INTO t VALUES (1);", rollback_on_error=False)
+    assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 1
+
+
+# =========================================================================
+# Table rebuilds
+# =========================================================================
+def make_rebuild_table(conn):
+    conn.executescript("""
+        CREATE TABLE orders (id INTEGER PRIMARY KEY, customer TEXT, total TEXT, legacy INTEGER);
+        CREATE INDEX orders_customer ON orders (customer);
+        CREATE INDEX orders_legacy ON orders (legacy);
+        CREATE TABLE audit (order_id INTEGER);
+        CREATE TRIGGER orders_audit AFTER INSERT ON orders BEGIN INSERT INTO audit VALUES (new.id); END;
+    """)
+    conn.executemany("INSERT INTO orders (customer, total, legacy) VALUES (?, ?, ?)",
+                     [(f"c{i % 13}", str(i * 1.5), i % 2) for i in range(1000)])
+    conn.execute("DELETE FROM orders WHERE id % 7 = 0")
+    conn.commit()
+
+
+def schema(conn):
+    return conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name").fetchall()
+
+
+def test_rebuild_keeps_rows_indexes_and_triggers(conn):
+    make_rebuild_table(conn)
+    before = conn.execute("SELECT rowid, customer, total FROM orders ORDER BY rowid").fetchall()
+    skipped = rebuild_table(conn, "orders", drop=["legacy"], types={"total": "REAL"}, chunk=64)
+    assert skipped == ["orders_legacy"]
+    columns = [(row[1], row[2]) for row in conn.execute("PRAGMA table_info(orders)")]
+    assert columns == [("id", "INTEGER"), ("customer", "TEXT"), ("total", "REAL")]
+    after = conn.execute("SELECT rowid, customer, total FROM orders ORDER BY rowid").fetchall()
+    assert after == [(rowid, customer, float(total)) for rowid, customer, total in before]
+    names = {name for _, name, _ in schema(conn)}
+    assert {"orders_customer", "orders_audit"} <= names and "orders_legacy" not in names
+    assert not any(name.startswith("ease_rebuild_") for name in names)
+    audited = conn.execute("SELECT count(*) FROM audit").fetchone()[0]
+    assert audited == 1000  # only the original inserts; the copy ran before the trigger was recreated
+    conn.execute("INSERT INTO orders (customer, total) VALUES ('new', 1)")
+    assert conn.execute("SELECT count(*) FROM audit").fetchone()[0] == audited + 1
+    assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+
+def test_cancelled_rebuild_leaves_table_untouched(conn):
+    make_rebuild_table(conn)
+    before_schema = schema(conn)
+    before_rows = conn.execute("SELECT * FROM orders ORDER BY rowid").fetchall()
+
+    def progress(done, total, message=None):
+        if done >= 256:
+            raise JobCancelled()
+    with pytest.raises(JobCancelled):
+        rebuild_table(conn, "orders", drop=["legacy"], chunk=64, progress=progress)
+    assert not conn.in_transaction
+    assert schema(conn) == before_schema
+    assert conn.execute("SELECT * FROM orders ORDER BY rowid").fetchall() == before_rows
+
+
+# =========================================================================
+# Export
+# =========================================================================
+def test_parallel_export_readers_share_one_snapshot(db_path):
+    from ease_db import _snapshot_readers
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript("CREATE TABLE parents (id INTEGER PRIMARY KEY); CREATE TABLE children (parent INTEGER);"
+                       "INSERT INTO parents VALUES (1); INSERT INTO children VALUES (1);")
+    readers = _snapshot_readers(conn, db_path, 2)
+    assert not conn.in_transaction
+    other = sqlite3.connect(db_path)
+    other.executescript("INSERT INTO parents VALUES (2); INSERT INTO children VALUES (2);")  # commits meanwhile
+    other.close()
+    assert [r.execute("SELECT count(*) FROM parents").fetchone()[0] for r in readers] == [1, 1]
+    assert [r.execute("SELECT count(*) FROM children").fetchone()[0] for r in readers] == [1, 1]
+    for reader in readers:
+        reader.close()
+    conn.close()
+
+
+@pytest.mark.parametrize("fmt, compress", [("csv", True), ("jsonl", False), ("sql", True)])
+def test_export_then_import_round_trip(conn, tmp_path, fmt, compress):
+    make_table(conn)
+    target = str(tmp_path / ("dump.sql" if fmt == "sql" else "out"))
+    assert export_database(conn, target, fmt, compress=compress, workers=2) == {"items": 500}
+    copy = sqlite3.connect(str(tmp_path / "copy.db"))
+    if fmt == "sql":
+        with (gzip.open if compress else open)(target, "rt", encoding="utf-8") as f:
+            copy.executescript(f.read())
+    else:
+        path = os.path.join(target, "items" + ease_db.EXPORT_FORMATS[fmt] + (".gz" if compress else ""))
+        assert import_file(copy, path, "items") == 500
+    query = "SELECT id, grp, name FROM items ORDER BY id"
+    assert copy.execute(query).fetchall() == conn.execute(query).fetchall()
+    copy.close()
+
+
+def test_interrupted_import_resumes_after_its_committed_rows(conn, tmp_path, monkeypatch):
+    make_table(conn)
+    export_database(conn, str(tmp_path / "out"), "csv", compress=True)
+    path = str(tmp_path / "out" / "items.csv.gz")
+    monkeypatch.setattr(ease_db, "IMPORT_BATCH", 100)
+    copy = sqlite3.connect(str(tmp_path / "copy.db"))
+    calls = []
+
+    def progress(done, total, message=None):
+        calls.append(message)
+        if len(calls) == 3:
+            raise JobCancelled()
+    checkpoint = {}
+    with pytest.raises(JobCancelled):
+        import_file(copy, path, "items", checkpoint=checkpoint, progress=progress)
+    assert checkpoint["rows"] == 300
+    assert copy.execute("SELECT count(*) FROM items").fetchone()[0] == 300
+    assert import_file(copy, path, "items", skip_rows=checkpoint["rows"]) == 200
+    query = "SELECT id, grp, name FROM items ORDER BY id"
+    assert copy.execute(query).fetchall() == conn.execute(query).fetchall()
+    copy.close()
+
+
+# =========================================================================
+# Index advisor
+# =========================================================================
+def test_advisor_merges_covering_and_plain_proposals_for_the_same_columns(conn):
+    make_table(conn, rows=2000)
+    queries = ["SELECT name FROM items WHERE name = 'item 5'", "SELECT * FROM items WHERE name = 'item 7'",
+               "SELECT id, name FROM items WHERE grp = 3 ORDER BY name"]
+    suggestions = advise_indexes(conn, queries, SchemaCatalog())
+    statements = [s.sql for s in suggestions]
+    assert len(statements) == len(set(statements))
+    by_columns = {s.columns: s for s in suggestions}
+    assert by_columns[("name",)].covering and sorted(by_columns[("name",)].queries) == sorted(queries[:2])
+    assert all(s.rows_avoided > 0 for s in suggestions)
+
+
+# =========================================================================
+# Search
+# =========================================================================
+def test_search_index_flags_in_place_updates_by_other_programs(conn, db_path):
+    make_table(conn, rows=50)
+    index, catalog = SearchIndex(), SchemaCatalog()
+    assert index.sync(conn, catalog) == 50
+    conn.execute("UPDATE items SET name = 'zebra' WHERE id = 1")
+    conn.commit()
+    assert [hit.rowid for hit in index.search(conn, catalog, "zebra")] == [1] and not index.stale
+
+    other = sqlite3.connect(db_path)
+    other.execute("UPDATE items SET name = 'okapi' WHERE id = 2")
+    other.commit()
+    other.close()
+    assert index.search(conn, catalog, "okapi") == [] and index.stale
+    index.sync(conn, catalog, rebuild=True)
+    assert [hit.rowid for hit in index.search(conn, catalog, "okapi")] == [2] and not index.stale
+
+
+
+def search_session(db_path, text, close=True, rebuild=False):
+    """Opens a connection like a new Ease-DB session, searches and closes; returns (rowids, stale)."""
+    conn = sqlite3.connect(db_path)
+    index = SearchIndex()
+    if rebuild:
+        index.sync(conn, SchemaCatalog(), rebuild=True)
+    hits = [hit.rowid for hit in index.search(conn, SchemaCatalog(), text)]
+    if close:
+        index.close(conn)
+    conn.close()
+    return hits, index.stale
+
+
+@pytest.mark.parametrize("journal_mode", ["delete", "wal"])
+def test_search_index_notices_edits_made_between_sessions(conn, db_path, journal_mode):
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    make_table(conn, rows=50)
+    conn.close()
+    assert search_session(db_path, "item")[1] is False
+    assert search_session(db_path, "item")[1] is False    # a clean close leaves nothing to notice
+
+    other = sqlite3.connect(db_path)  # e.g. the CLI, or a session that never opened search
+    other.execute("UPDATE items SET name = 'okapi' WHERE id = 2")
+    other.commit()
+    other.close()
+    assert search_session(db_path, "okapi") == ([], True)
+    assert search_session(db_path, "okapi") == ([], True)  # stays stale until rebuilt
+    assert search_session(db_path, "okapi", rebuild=True) == ([2], False)
+    assert search_session(db_path, "okapi") == ([2], False)
+
+
+def test_search_index_refuses_tables_with_its_reserved_names(conn):
+    make_table(conn, rows=5)
+    conn.execute("CREATE TABLE _ease_search_docs (body TEXT)")
+    with pytest.raises(ValueError):
+        SearchIndex().sync(conn, SchemaCatalog())
+
+
+# =========================================================================
+# Backups
+# =========================================================================
+def test_cancelled_backup_keeps_the_existing_target(conn, tmp_path):
+    make_table(conn, rows=20000)
+    target = str(tmp_path / "target.db")
+    existing = sqlite3.connect(target)
+    existing.execute("CREATE TABLE keep (a)")
+    existing.commit()
+    existing.close()
+
+    def progress(done, total, message=None):
+        raise JobCancelled()
+    with pytest.raises(JobCancelled):
+        backup_to_file(conn, target, pages=1, progress=progress)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["target.db", "test.db"]
+    copy = sqlite3.connect(target)
+    assert copy.execute("SELECT name FROM sqlite_master").fetchall() == [("keep",)]
+    copy.close()
+
+    backup_to_file(conn, target)
+    copy = sqlite3.connect(target)
+    assert copy.execute("SELECT count(*) FROM items").fetchone()[0] == 20000
+    copy.close()
+
+
+# =========================================================================
+# Storage and maintenance
+# =========================================================================
+def test_storage_report_is_cached_until_the_database_changes(conn, db_path):
+    make_table(conn, rows=2000)
+    conn.execute("CREATE INDEX items_grp ON items (grp)")
+    conn.commit()
+    cache = StorageCache()
+    report = cache.get(conn)
+    stats = {o.name: o for o in report.objects}
+    assert (stats["items"].kind, stats["items"].rows) == ("table", 2000)
+    assert (stats["items_grp"].kind, stats["items_grp"].table, stats["items_grp"].rows) == ("index", "items", 2000)
+    assert report.file_bytes == os.path.getsize(db_path)
+    assert cache.get(conn) is report
+    other = sqlite3.connect(db_path)
+    other.execute("DELETE FROM items WHERE id > 1000")
+    other.commit()
+    other.close()
+    report = cache.get(conn)
+    assert {o.name: o.rows for o in report.objects}["items"] == 1000 and report.freelist_count > 0
+
+
+def test_maintenance_compacts_checks_and_analyzes(conn, tmp_path):
+    make_table(conn, rows=5000)
+    conn.execute("DELETE FROM items WHERE id % 2 = 0")
+    conn.commit()
+    target = str(tmp_path / "compact.db")
+    vacuum(conn, target)
+    with pytest.raises(ValueError):
+        vacuum(conn, target)
+    compact = sqlite3.connect(target)
+    assert compact.execute("SELECT count(*) FROM items").fetchone()[0] == 2500
+    assert compact.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert integrity_check(compact) == ["ok"]
+    compact.close()
+
+    with pytest.raises(ValueError):
+        incremental_vacuum(conn)
+    vacuum(conn, auto_vacuum="incremental")
+    conn.execute("DELETE FROM items WHERE id > 100")
+    conn.commit()
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    assert free > 0 and incremental_vacuum(conn) == free
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert integrity_check(conn, quick=True) == ["ok"]
+    run_analyze(conn, progress=lambda *args: None)
+    assert conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = 'items'").fetchone() is not None
+
+
+# =========================================================================
+# Column profiles
+# =========================================================================
+def test_column_profile_counts_nulls_distinct_values_and_top_values(conn):
+    conn.execute("CREATE TABLE t (n INTEGER, word TEXT, payload BLOB)")
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?)",
+                     [(i if i % 10 else None, "common" if i % 4 == 0 else f"w{i}", bytes(i % 7)) for i in range(4000)])
+    profile = profile_columns(conn, "t", sample_rows=0)
+    assert (profile.rows, profile.scanned, profile.sampled) == (4000, 4000, False)
+    n, word, payload = profile.columns
+    assert (n.nulls, n.minimum, n.maximum) == (400, 1, 3999)
+    assert abs(n.distinct - 3600) < 3600 * 0.05
+    kind, bins = n.histogram    # counts are scaled up from a reservoir sample, so rounded per bin
+    assert kind == "value" and abs(sum(count for _, _, count in bins) - 3600) <= len(bins)
+    (value, count), *_ = word.top   # Misra-Gries undercounts by at most rows / (counters + 1)
+    assert value == "common" and 1000 - 4000 / (ease_db.PROFILE_COUNTERS + 1) <= count <= 1000
+    assert abs(word.distinct - 3001) < 3001 * 0.05
+    assert (payload.distinct, payload.min_length, payload.max_length) == (7, 0, 6)
+    assert payload.histogram[0] == "length"
+
+
+def test_column_profile_samples_large_tables_and_is_cached_until_a_write(conn, db_path):
+    make_table(conn, rows=20000)
+    profile = profile_columns(conn, "items", sample_rows=2000)
+    assert profile.sampled and profile.rows == 20000 and 1000 < profile.scanned < 4000
+    cache = ColumnProfileCache()
+    profile = cache.get(conn, "items", sample_rows=0)
+    assert not profile.sampled and cache.get(conn, "items", sample_rows=0) is profile
+    other = sqlite3.connect(db_path)
+    other.execute("DELETE FROM items WHERE id > 10000")
+    other.commit()
+    other.close()
+    assert cache.get(conn, "items", sample_rows=0).scanned == 10000
+
+
+# =========================================================================
+# Operation metrics
+# =========================================================================
+@pytest.mark.parametrize("query, expected_sql", [
+    ("SELECT * FROM t WHERE a = 'x''y' AND b IN (1, 2, 3) AND c > 1.5e3",
+     "SELECT * FROM t WHERE a = ? AND b IN (?, ...) AND c > ?"),
+    ("SELECT \"col1\", x'ab' FROM t2 WHERE id = 0x1F", "SELECT \"col1\", ? FROM t2 WHERE id = ?"),
+    ("SELECT a FROM t LIMIT 10 OFFSET :n", "SELECT a FROM t LIMIT ? OFFSET :n"),
+])
+def test_parameterize_sql(query, expected_sql):
+    assert parameterize_sql(query) == expected_sql
+
+
+def test_operation_metrics_group_statements_and_log_slow_calls(tmp_path):
+    log_path = str(tmp_path / "logs" / "slow.log")
+    metrics = OperationMetrics(slow_ms=100, log_path=log_path)
+    metrics.record("query", "SELECT * FROM t WHERE id = 1", 0.004, rows=1)
+    metrics.record("query", "SELECT * FROM t WHERE id = 2", 0.250, rows=1)
+    metrics.record("query", "SELECT * FROM t WHERE id = 3", 0.002, failed=True)
+    metrics.record("query", "SELECT * FROM u", 0.150, slow_ms=0)
+    (slowest, other) = metrics.stats()
+    assert (slowest.sql, slowest.count, slowest.errors, slowest.rows) == ("SELECT * FROM t WHERE id = ?", 3, 1, 2)
+    assert (slowest.percentile(0.5), slowest.percentile(1.0)) == (5, 500)
+    assert other.sql == "SELECT * FROM u"
+    metrics.close()
+    with open(log_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 1 and "250.0 ms" in lines[0] and lines[0].endswith("query  SELECT * FROM t WHERE id = ?")
+
+    export = str(tmp_path / "metrics.json")
+    metrics.export_json(export)
+    with open(export, encoding="utf-8") as f:
+        data = json.load(f)
+    assert [(op["sql"], op["count"]) for op in data["operations"]] == [
+        ("SELECT * FROM t WHERE id = ?", 3), ("SELECT * FROM u", 1)]
+
+
+# =========================================================================
+# Startup
+# =========================================================================
+def test_core_import_leaves_optional_modules_unloaded():
+    code = "import sys, ease_db; print(sorted({'tkinter', 'logging', 'argparse', 'concurrent.futures'} & set(sys.modules)))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"